@@ -0,0 +1,97 @@
+"""
+Per-request cost of returning typed Pydantic output.
+
+Compares FastAPI's default path (route returns a model and declares
+response_model, so the output is validated again, run through
+jsonable_encoder and dumped with stdlib json) with returning
+FastJSONResponse(model) directly.
+
+    PYTHONPATH=src python benchmarks/response_serialization.py
+"""
+
+import time
+from typing import Callable
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.databases.dynamoDB.models import StudentTeacherRelationship
+from common.responses import FastJSONResponse
+from health.schemas import HealthCheckResponse
+from relationships.schemas import RelationshipSearchResponse
+from common.databases.dynamoDB import SearchExplain
+
+REQUESTS = {"small": 3000, "1k items": 200}
+
+
+def _relationships(count: int) -> RelationshipSearchResponse:
+    items = [
+        StudentTeacherRelationship(
+            StudentId=f"S{i % 50:04d}",
+            CreatedAt=f"2024-01-01T00:00:{i % 60:02d}+00:00",
+            TeacherId=f"T{i % 8:03d}",
+            Subject="Mathematics",
+            StudentName=f"Student {i}",
+            TeacherName="Mr. John Smith",
+        )
+        for i in range(count)
+    ]
+    return RelationshipSearchResponse(
+        items=items, explain=SearchExplain(plans=[], estimated_read_units=0)
+    )
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    small = HealthCheckResponse(status="OK")
+    large = _relationships(1000)
+
+    @app.get("/default/small", response_model=HealthCheckResponse)
+    def default_small():
+        return small
+
+    @app.get("/fast/small", response_model=HealthCheckResponse)
+    def fast_small():
+        return FastJSONResponse(small)
+
+    @app.get("/default/large", response_model=RelationshipSearchResponse)
+    def default_large():
+        return large
+
+    @app.get("/fast/large", response_model=RelationshipSearchResponse)
+    def fast_large():
+        return FastJSONResponse(large)
+
+    return app
+
+
+def _per_request_us(call: Callable[[], object], requests: int) -> float:
+    for _ in range(min(requests, 50)):
+        call()
+    started = time.perf_counter()
+    for _ in range(requests):
+        call()
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main() -> None:
+    client = TestClient(build_app())
+    print(
+        f"{'payload':<10} {'default us':>12} {'fast us':>12} {'saved us':>12} {'saved %':>8}"
+    )
+    for label, path in (("small", "small"), ("1k items", "large")):
+        requests = REQUESTS[label]
+        default = _per_request_us(lambda: client.get(f"/default/{path}"), requests)
+        fast = _per_request_us(lambda: client.get(f"/fast/{path}"), requests)
+        assert (
+            client.get(f"/default/{path}").json() == client.get(f"/fast/{path}").json()
+        )
+        saved = default - fast
+        print(
+            f"{label:<10} {default:>12.1f} {fast:>12.1f} {saved:>12.1f} "
+            f"{saved / default * 100:>7.1f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
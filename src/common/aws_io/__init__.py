@@ -0,0 +1,19 @@
+from .executor import (
+    AwsIoExecutor,
+    AwsIoExecutorStats,
+    aws_io_executor,
+    health_io_executor,
+)
+from .blocking_detector import (
+    install_blocking_call_detector,
+    uninstall_blocking_call_detector,
+)
+
+__all__ = [
+    "AwsIoExecutor",
+    "AwsIoExecutorStats",
+    "aws_io_executor",
+    "health_io_executor",
+    "install_blocking_call_detector",
+    "uninstall_blocking_call_detector",
+]
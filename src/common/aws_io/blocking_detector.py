@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import traceback
+from typing import Any, Optional
+
+from botocore.client import BaseClient
+
+from common.loggers import logger
+
+_original_make_api_call: Optional[Any] = None
+_lock = threading.Lock()
+blocking_calls = 0
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _checked_make_api_call(
+    self: BaseClient, operation_name: str, api_params: Any
+) -> Any:
+    global blocking_calls
+    if _on_event_loop():
+        with _lock:
+            blocking_calls += 1
+        caller = "".join(traceback.format_stack(limit=8)[:-1])
+        logger.warning(
+            f"Blocking AWS call {self.meta.service_model.service_name}.{operation_name} "
+            f"made on the event loop; await it through aws_io_executor instead\n{caller}"
+        )
+    return _original_make_api_call(self, operation_name, api_params)  # type: ignore[misc]
+
+
+def install_blocking_call_detector(
+    loop: asyncio.AbstractEventLoop, slow_callback_seconds: float
+) -> None:
+    """
+    Flag blocking work on the event loop. Debug use only.
+
+    Every botocore API call made from a thread that is running an event loop
+    is logged with its call site, and asyncio debug mode reports any
+    callback that holds the loop longer than slow_callback_seconds.
+    """
+    global _original_make_api_call
+    with _lock:
+        if _original_make_api_call is None:
+            _original_make_api_call = BaseClient._make_api_call
+            BaseClient._make_api_call = _checked_make_api_call  # type: ignore[method-assign]
+    loop.set_debug(True)
+    loop.slow_callback_duration = slow_callback_seconds
+    logger.info("Event loop blocking call detector installed")
+
+
+def uninstall_blocking_call_detector() -> None:
+    global _original_make_api_call
+    with _lock:
+        if _original_make_api_call is not None:
+            BaseClient._make_api_call = _original_make_api_call  # type: ignore[method-assign]
+            _original_make_api_call = None
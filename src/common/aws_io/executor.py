@@ -0,0 +1,119 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from common.config import settings
+from common.resilience import LatencyTracker
+
+T = TypeVar("T")
+
+
+class AwsIoExecutorStats(BaseModel):
+    max_workers: int
+    active: int
+    queue_depth: int
+    submitted: int
+    completed: int
+    wait_ms_mean: float
+    wait_ms_p95: Optional[float] = None
+    wait_ms_max: float
+
+
+class AwsIoExecutor:
+    """
+    Sized thread pool dedicated to blocking boto3 calls.
+
+    Coroutines await ``run`` instead of calling boto3 directly, so a slow AWS
+    call occupies one pool thread rather than the event loop, and AWS work
+    cannot starve Starlette's default threadpool. Tracks queue depth and the
+    time each call waits for a free thread.
+    """
+
+    def __init__(self, max_workers: int = 32, thread_name_prefix: str = "aws-io"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._wait = LatencyTracker(percentile=95, min_samples=20)
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self.thread_name_prefix,
+                    )
+        return self._executor
+
+    def _wrap(self, fn: Callable[..., T], args: Any, kwargs: Any) -> Callable[[], T]:
+        # run_in_executor does not carry contextvars (deadlines, trace ids) over
+        context = contextvars.copy_context()
+        submitted = time.monotonic()
+
+        def task() -> T:
+            waited = time.monotonic() - submitted
+            with self._lock:
+                self._started += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            self._wait.record(waited)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._completed += 1
+
+        with self._lock:
+            self._submitted += 1
+        return task
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable on the AWS I/O pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), self._wrap(fn, args, kwargs))
+
+    def stats(self) -> AwsIoExecutorStats:
+        with self._lock:
+            submitted, started, completed = (
+                self._submitted,
+                self._started,
+                self._completed,
+            )
+            wait_total, wait_max = self._wait_total, self._wait_max
+        p95 = self._wait.threshold()
+        return AwsIoExecutorStats(
+            max_workers=self.max_workers,
+            active=started - completed,
+            queue_depth=submitted - started,
+            submitted=submitted,
+            completed=completed,
+            wait_ms_mean=round(wait_total / started * 1000, 3) if started else 0.0,
+            wait_ms_p95=None if p95 is None else round(p95 * 1000, 3),
+            wait_ms_max=round(wait_max * 1000, 3),
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Module-level singleton instance
+aws_io_executor = AwsIoExecutor(max_workers=settings.AWS_IO_MAX_WORKERS)
+
+# Module-level singleton for the health probe, so it still answers while
+# request traffic saturates aws_io_executor
+health_io_executor = AwsIoExecutor(
+    max_workers=settings.HEALTH_IO_MAX_WORKERS, thread_name_prefix="health-io"
+)
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+from common.resilience import remaining, reset_deadline, set_deadline
+from common.databases.dynamoDB import AsyncDynamoDBClientService
+from common.s3 import AsyncS3Service
+from ..blocking_detector import (
+    install_blocking_call_detector,
+    uninstall_blocking_call_detector,
+)
+from .. import blocking_detector
+
+
+@pytest.mark.asyncio
+async def test_run_uses_dedicated_threads(aws_io_executor):
+    """Test calls run off the event loop thread on the aws-io pool"""
+    name = await aws_io_executor.run(lambda: threading.current_thread().name)
+
+    assert name.startswith("aws-io")
+    stats = aws_io_executor.stats()
+    assert stats.submitted == stats.completed == 1
+    assert stats.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_run_carries_context(aws_io_executor):
+    """Test the request deadline is visible inside the pool thread"""
+    token = set_deadline(5)
+    try:
+        left = await aws_io_executor.run(remaining)
+    finally:
+        reset_deadline(token)
+
+    assert 0 < left <= 5
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_counts_waiting_calls(aws_io_executor):
+    """Test calls beyond max_workers are reported as queued"""
+    release = threading.Event()
+    tasks = [asyncio.ensure_future(aws_io_executor.run(release.wait)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+
+    stats = aws_io_executor.stats()
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert stats.active == 2
+    assert stats.queue_depth == 1
+
+
+@pytest.mark.asyncio
+async def test_async_dynamodb_list_tables(aws_io_executor):
+    """Test the DynamoDB facade forwards to the wrapped client"""
+    service = MagicMock()
+    service.get_client.return_value.meta.client.list_tables.return_value = {
+        "TableNames": []
+    }
+
+    response = await AsyncDynamoDBClientService(service, aws_io_executor).list_tables(
+        Limit=1
+    )
+
+    assert response == {"TableNames": []}
+    service.get_client.return_value.meta.client.list_tables.assert_called_once_with(
+        Limit=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_s3_read_file(aws_io_executor):
+    """Test the S3 facade forwards to the wrapped service"""
+    s3_service = MagicMock()
+    s3_service.read_file_from_s3.return_value = b"data"
+
+    result = await AsyncS3Service(s3_service, aws_io_executor).read_file_from_s3(
+        "b", "f"
+    )
+
+    assert result == b"data"
+    s3_service.read_file_from_s3.assert_called_once_with("b", "f")
+
+
+@pytest.mark.asyncio
+async def test_blocking_detector_flags_event_loop_calls(aws_io_executor):
+    """Test botocore calls on the loop are counted but calls on the pool are not"""
+    import boto3
+
+    client = boto3.client(
+        "dynamodb",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        endpoint_url="http://127.0.0.1:9",
+    )
+    client.meta.events.register(
+        "before-send",
+        lambda **kwargs: MagicMock(status_code=200, content=b"{}", headers={}),
+    )
+    loop = asyncio.get_running_loop()
+    debug = loop.get_debug()
+    before = blocking_detector.blocking_calls
+    install_blocking_call_detector(loop, 0.1)
+    try:
+        await aws_io_executor.run(client.list_tables)
+        assert blocking_detector.blocking_calls == before
+        client.list_tables()
+        assert blocking_detector.blocking_calls == before + 1
+    finally:
+        uninstall_blocking_call_detector()
+        loop.set_debug(debug)
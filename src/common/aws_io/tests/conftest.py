@@ -0,0 +1,15 @@
+"""
+Test configuration for the AWS I/O executor
+"""
+
+import pytest
+
+from ..executor import AwsIoExecutor
+
+
+@pytest.fixture
+def aws_io_executor():
+    """Fixture for a small dedicated AWS I/O executor."""
+    executor = AwsIoExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
@@ -0,0 +1,17 @@
+from .encoders import available_encoders, negotiate, parse_accept_encoding
+from .middleware import (
+    CompressionExecutor,
+    CompressionMiddleware,
+    CompressionStats,
+    compression_executor,
+)
+
+__all__ = [
+    "available_encoders",
+    "negotiate",
+    "parse_accept_encoding",
+    "CompressionExecutor",
+    "CompressionMiddleware",
+    "CompressionStats",
+    "compression_executor",
+]
@@ -0,0 +1,145 @@
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:  # Optional: pip install brotli
+    import brotli
+except ImportError:
+    brotli = None
+
+try:  # Python 3.14+ ships zstd in the standard library
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:  # Optional: pip install zstandard
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Encoder:
+    """
+    Incremental compressor for one response body.
+
+    compress() returns whatever output is ready for the chunk; when flush is
+    True the output is made decodable up to this point so streamed chunks
+    reach the client without waiting for the rest of the body. finish()
+    ends the stream.
+    """
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        raise NotImplementedError
+
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+
+class GzipEncoder(Encoder):
+    def __init__(self, level: int):
+        # wbits=31 writes the gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        output = self._compressor.compress(data)
+        if flush:
+            output += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return output
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder(Encoder):
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        output = self._compressor.process(data)
+        if flush:
+            output += self._compressor.flush()
+        return output
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class StdlibZstdEncoder(Encoder):
+    def __init__(self, level: int):
+        self._compressor = zstd.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        mode = (
+            zstd.ZstdCompressor.FLUSH_BLOCK if flush else zstd.ZstdCompressor.CONTINUE
+        )
+        return self._compressor.compress(data, mode)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstd.ZstdCompressor.FLUSH_FRAME)
+
+
+class ZstandardEncoder(Encoder):
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        output = self._compressor.compress(data)
+        if flush:
+            output += self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return output
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encoders() -> Dict[str, Callable[[int], Encoder]]:
+    """Content-codings this process can produce, keyed by their token."""
+    encoders: Dict[str, Callable[[int], Encoder]] = {"gzip": GzipEncoder}
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    if zstd is not None:
+        encoders["zstd"] = StdlibZstdEncoder
+    elif zstandard is not None:
+        encoders["zstd"] = ZstandardEncoder
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    accepted: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate(header: Optional[str], preference: List[str]) -> Optional[str]:
+    """
+    Pick the coding to use for a request, or None for identity.
+
+    The client's highest q-value wins; ties go to the earlier entry in
+    preference. A wildcard covers codings the client did not list.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best: Optional[Tuple[float, int, str]] = None
+    for rank, coding in enumerate(preference):
+        quality = accepted.get(coding, wildcard)
+        if quality <= 0:
+            continue
+        candidate = (quality, -rank, coding)
+        if best is None or candidate > best:
+            best = candidate
+    return None if best is None else best[2]
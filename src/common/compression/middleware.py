@@ -0,0 +1,304 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+
+from common.config import settings
+from .encoders import Encoder, available_encoders, negotiate
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+}
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionStats(BaseModel):
+    max_workers: int
+    active: int
+    compressed: Dict[str, int]
+    streamed: int
+    skipped_small: int
+    skipped_busy: int
+    bytes_in: int
+    bytes_out: int
+    ratio: float
+
+
+class CompressionExecutor:
+    """
+    Bounds the CPU each worker process spends compressing responses.
+
+    Chunks up to inline_bytes are compressed on the event loop; larger ones
+    run on a pool of max_workers threads (zlib, brotli and zstd release the
+    GIL). A complete body that arrives while every thread is busy is sent
+    uncompressed rather than queued, so compression never adds queueing
+    latency under load.
+    """
+
+    def __init__(self, max_workers: int = 2, inline_bytes: int = 65536):
+        self.max_workers = max_workers
+        self.inline_bytes = inline_bytes
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._compressed: Dict[str, int] = {}
+        self._streamed = 0
+        self._skipped_small = 0
+        self._skipped_busy = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="compression"
+                    )
+        return self._executor
+
+    def busy(self) -> bool:
+        return self._active >= self.max_workers
+
+    async def run(self, fn: Callable[[], bytes], size: int) -> bytes:
+        """Run a compression step, off the event loop when the input is large."""
+        if size <= self.inline_bytes:
+            return fn()
+        with self._lock:
+            self._active += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool(), fn)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def record(
+        self, encoding: str, bytes_in: int, bytes_out: int, streamed: bool
+    ) -> None:
+        with self._lock:
+            self._compressed[encoding] = self._compressed.get(encoding, 0) + 1
+            self._streamed += streamed
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+
+    def record_skipped(self, busy: bool) -> None:
+        with self._lock:
+            if busy:
+                self._skipped_busy += 1
+            else:
+                self._skipped_small += 1
+
+    def stats(self) -> CompressionStats:
+        with self._lock:
+            return CompressionStats(
+                max_workers=self.max_workers,
+                active=self._active,
+                compressed=dict(self._compressed),
+                streamed=self._streamed,
+                skipped_small=self._skipped_small,
+                skipped_busy=self._skipped_busy,
+                bytes_in=self._bytes_in,
+                bytes_out=self._bytes_out,
+                ratio=round(self._bytes_out / self._bytes_in, 4)
+                if self._bytes_in
+                else 0.0,
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Module-level singleton instance shared by every CompressionMiddleware
+compression_executor = CompressionExecutor(
+    max_workers=settings.COMPRESSION_MAX_WORKERS,
+    inline_bytes=settings.COMPRESSION_INLINE_BYTES,
+)
+
+
+def _default_levels() -> Dict[str, int]:
+    return {
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_QUALITY,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    }
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with gzip, brotli or zstd.
+
+    The coding is negotiated from Accept-Encoding; only codings listed in
+    encodings and importable in this process are offered. Complete bodies
+    smaller than minimum_size are sent as is. Streaming responses (for
+    example NDJSON) are compressed chunk by chunk and flushed after every
+    chunk, so the client sees each record as soon as it is produced.
+    Responses that already carry a Content-Encoding, are not text-like or
+    ask for Cache-Control: no-transform pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        encodings: Optional[List[str]] = None,
+        levels: Optional[Dict[str, int]] = None,
+        executor: Optional[CompressionExecutor] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        factories = available_encoders()
+        preference = encodings or [
+            coding.strip() for coding in settings.COMPRESSION_ENCODINGS.split(",")
+        ]
+        self.preference = [coding for coding in preference if coding in factories]
+        self.factories = factories
+        self.levels = {**_default_levels(), **(levels or {})}
+        self.executor = executor or compression_executor
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding"), self.preference
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def encoder(self, encoding: str) -> Encoder:
+        return self.factories[encoding](self.levels[encoding])
+
+
+class _CompressionResponder:
+    """Per-request send wrapper; decides on the first body message."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Any):
+        self.middleware = middleware
+        self.executor = middleware.executor
+        self.encoding = encoding
+        self.send_downstream = send
+        self.start: Optional[Dict[str, Any]] = None
+        self.encoder: Optional[Encoder] = None
+        self.passthrough = False
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        status = self.start["status"]
+        return (
+            200 <= status < 300
+            and status != 204
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type", ""))
+            and "no-transform" not in headers.get("cache-control", "").lower()
+        )
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows the response shape
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send_downstream(message)
+            return
+        if self.passthrough:
+            await self.send_downstream(message)
+        elif self.encoder is not None:
+            await self._send_chunk(message)
+        else:
+            await self._send_first(message)
+
+    async def _send_first(self, message: Dict[str, Any]) -> None:
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._eligible(headers):
+            await self._pass(message)
+            return
+        if not more_body and len(body) < self.middleware.minimum_size:
+            self.executor.record_skipped(busy=False)
+            await self._pass(message)
+            return
+        if self.executor.busy() and len(body) > self.executor.inline_bytes:
+            self.executor.record_skipped(busy=True)
+            await self._pass(message)
+            return
+
+        self.encoder = self.middleware.encoder(self.encoding)
+        self._mark_encoded(headers)
+        if more_body:
+            # Length is unknown until the stream ends; fall back to chunked encoding
+            del headers["content-length"]
+            await self.send_downstream(self.start)
+            await self._send_chunk(message)
+            return
+
+        encoder = self.encoder
+        compressed = await self.executor.run(
+            lambda: encoder.compress(body) + encoder.finish(), len(body)
+        )
+        headers["Content-Length"] = str(len(compressed))
+        self.executor.record(self.encoding, len(body), len(compressed), streamed=False)
+        await self.send_downstream(self.start)
+        await self.send_downstream(
+            {"type": "http.response.body", "body": compressed, "more_body": False}
+        )
+
+    async def _send_chunk(self, message: Dict[str, Any]) -> None:
+        encoder = self.encoder
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if more_body:
+            compressed = await self.executor.run(
+                lambda: encoder.compress(body, flush=True), len(body)
+            )
+        else:
+            compressed = await self.executor.run(
+                lambda: encoder.compress(body) + encoder.finish(), len(body)
+            )
+        self.bytes_in += len(body)
+        self.bytes_out += len(compressed)
+        if not more_body:
+            self.executor.record(
+                self.encoding, self.bytes_in, self.bytes_out, streamed=True
+            )
+        if compressed or not more_body:
+            await self.send_downstream(
+                {
+                    "type": "http.response.body",
+                    "body": compressed,
+                    "more_body": more_body,
+                }
+            )
+
+    async def _pass(self, message: Dict[str, Any]) -> None:
+        self.passthrough = True
+        await self.send_downstream(self.start)
+        await self.send_downstream(message)
@@ -0,0 +1,167 @@
+import gzip
+import json
+import zlib
+
+import pytest
+
+from ..encoders import GzipEncoder, negotiate, parse_accept_encoding
+from ..middleware import CompressionMiddleware, is_compressible
+from .conftest import RECORD
+
+
+def test_parse_accept_encoding_q_values():
+    """Test q-values are parsed and default to 1"""
+    accepted = parse_accept_encoding("gzip;q=0.5, br, zstd;q=0")
+
+    assert accepted == {"gzip": 0.5, "br": 1.0, "zstd": 0.0}
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, br, zstd", "zstd"),
+        ("gzip;q=1.0, zstd;q=0.5", "gzip"),
+        ("zstd;q=0, gzip", "gzip"),
+        ("*", "zstd"),
+        ("*, zstd;q=0", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(header, expected):
+    """Test the client's preference wins and ties follow server order"""
+    assert negotiate(header, ["zstd", "br", "gzip"]) == expected
+
+
+def test_is_compressible():
+    """Test only text-like media types are compressed"""
+    assert is_compressible("application/json")
+    assert is_compressible("application/x-ndjson; charset=utf-8")
+    assert is_compressible("application/problem+json")
+    assert not is_compressible("image/png")
+    assert not is_compressible("")
+
+
+def test_large_response_is_compressed(compressed_client, compression_executor):
+    """Test a body over the threshold is gzipped with Vary and an exact length"""
+    response = compressed_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == [RECORD] * 500
+    assert (
+        int(response.headers["content-length"]) < len(json.dumps([RECORD] * 500)) / 10
+    )
+    assert compression_executor.stats().compressed == {"gzip": 1}
+
+
+def test_small_response_is_not_compressed(compressed_client, compression_executor):
+    """Test a body under the threshold is sent as is"""
+    response = compressed_client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == RECORD
+    assert compression_executor.stats().skipped_small == 1
+
+
+def test_identity_when_not_accepted(compressed_client):
+    """Test clients that do not accept gzip get an uncompressed body"""
+    response = compressed_client.get("/large", headers={"Accept-Encoding": "br"})
+
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_chunked(compressed_client, compression_executor):
+    """Test an NDJSON stream is compressed without a Content-Length"""
+    response = compressed_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text.splitlines() == [json.dumps(RECORD)] * 50
+    assert compression_executor.stats().streamed == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_chunks_are_flushed(compression_executor):
+    """Test each streamed chunk is decodable as soon as it is sent"""
+    lines = [json.dumps({**RECORD, "n": n}).encode() + b"\n" for n in range(3)]
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = CompressionMiddleware(
+        app, encodings=["gzip"], executor=compression_executor
+    )
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await middleware(scope, None, send)
+
+    decoder = zlib.decompressobj(31)
+    bodies = [m["body"] for m in sent if m["type"] == "http.response.body"]
+    for line, body in zip(lines, bodies):
+        assert decoder.decompress(body) == line
+    assert gzip.decompress(b"".join(bodies)) == b"".join(lines)
+
+
+@pytest.mark.asyncio
+async def test_busy_executor_skips_large_bodies(compression_executor):
+    """Test a large complete body is sent uncompressed when every thread is busy"""
+    body = json.dumps([RECORD] * 500).encode()
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    compression_executor._active = compression_executor.max_workers
+    middleware = CompressionMiddleware(
+        app, encodings=["gzip"], executor=compression_executor
+    )
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    await middleware(scope, None, send)
+
+    assert sent[1]["body"] == body
+    assert compression_executor.stats().skipped_busy == 1
+
+
+def test_gzip_encoder_round_trip():
+    """Test the incremental encoder output is a valid gzip stream"""
+    encoder = GzipEncoder(6)
+    output = (
+        encoder.compress(b"abc", flush=True)
+        + encoder.compress(b"def")
+        + encoder.finish()
+    )
+
+    assert gzip.decompress(output) == b"abcdef"
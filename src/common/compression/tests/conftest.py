@@ -0,0 +1,55 @@
+"""
+Test configuration for response compression
+"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from ..middleware import CompressionExecutor, CompressionMiddleware
+
+RECORD = {"TeacherName": "Ms. Jane Doe", "Subject": "Mathematics"}
+
+
+@pytest.fixture
+def compression_executor():
+    """Fixture for a small compression executor with a low inline limit."""
+    executor = CompressionExecutor(max_workers=1, inline_bytes=4096)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def compressed_app(compression_executor):
+    """Fixture for an app serving small, large and NDJSON responses."""
+    app = FastAPI()
+
+    @app.get("/small")
+    def small():
+        return RECORD
+
+    @app.get("/large")
+    def large():
+        return [RECORD] * 500
+
+    @app.get("/stream")
+    def stream():
+        lines = (json.dumps(RECORD) + "\n" for _ in range(50))
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=500,
+        encodings=["gzip"],
+        executor=compression_executor,
+    )
+    return app
+
+
+@pytest.fixture
+def compressed_client(compressed_app):
+    """Fixture for a test client over the compressed app."""
+    return TestClient(compressed_app)
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -12,6 +12,128 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_REGION: Optional[str] = None
 
+    # DynamoDB backend: "aws" for boto3, "memory" for the in-process backend
+    DYNAMODB_BACKEND: Literal["aws", "memory"] = "aws"
+    DYNAMODB_MEMORY_THROTTLE_RATE: float = 0.0
+
+    # Per-request deadline budget, overridable per request via X-Request-Timeout
+    REQUEST_DEADLINE_SECONDS: float = 10.0
+    REQUEST_DEADLINE_MAX_SECONDS: float = 30.0
+    DYNAMODB_CONNECT_TIMEOUT: float = 2.0
+    DYNAMODB_READ_TIMEOUT: float = 5.0
+
+    # Admission control per worker: requests beyond the concurrency limit wait in a
+    # bounded queue, then get 503 + Retry-After; bypass paths skip it (below the API prefix)
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 32
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 1.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ADMISSION_BYPASS_PATHS: List[str] = ["/healthz"]
+
+    # Hedged reads for idempotent DynamoDB operations
+    DYNAMODB_HEDGING_ENABLED: bool = False
+    DYNAMODB_HEDGING_PERCENTILE: float = 95.0
+    DYNAMODB_HEDGING_BUDGET_PERCENT: float = 5.0
+    DYNAMODB_HEDGING_MIN_SAMPLES: int = 100
+    DYNAMODB_HEDGING_MAX_WORKERS: int = 32
+
+    # Dedicated thread pool for blocking boto3 calls made from async code; the
+    # health probe has its own small pool so a saturated one cannot fail it
+    AWS_IO_MAX_WORKERS: int = 32
+    HEALTH_IO_MAX_WORKERS: int = 2
+    # Flag blocking calls on the event loop; defaults to DEBUG when unset
+    BLOCKING_CALL_DETECTOR: Optional[bool] = None
+    EVENT_LOOP_SLOW_CALLBACK_SECONDS: float = 0.1
+
+    # Response compression negotiated from Accept-Encoding, in server preference order
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    # Threads per worker for chunks larger than COMPRESSION_INLINE_BYTES
+    COMPRESSION_MAX_WORKERS: int = 2
+    COMPRESSION_INLINE_BYTES: int = 65536
+
+    # Request profiling: X-Profile must be signed with PROFILING_SECRET;
+    # PROFILING_SAMPLE_ONE_IN > 0 also profiles 1 in N requests
+    PROFILING_SECRET: Optional[str] = None
+    PROFILING_SAMPLE_ONE_IN: int = 0
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_OUTPUT_DIR: str = "/tmp/profiles"
+    PROFILING_MAX_PROFILES: int = 100
+    PROFILING_TOP_N: int = 20
+
+    # Span tracing with W3C traceparent propagation; unsampled requests only get ids
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 0.01
+    TRACING_EXPORTER: Literal["log", "memory", "file", "none"] = "log"
+    TRACING_FILE_PATH: str = "/tmp/traces.jsonl"
+    TRACING_MEMORY_MAX_SPANS: int = 10000
+
+    # Memory diagnostics endpoints; mounted when enabled or in DEBUG, and outside
+    # DEBUG they require the X-Diagnostics-Token header
+    DIAGNOSTICS_ENABLED: bool = False
+    DIAGNOSTICS_TOKEN: Optional[str] = None
+    DIAGNOSTICS_TRACEMALLOC_FRAMES: int = 10
+    DIAGNOSTICS_MAX_SNAPSHOTS: int = 5
+
+    # Log sampling and rate limiting below LOG_LIMIT_EXEMPT_LEVEL, keyed by the
+    # log_key extra or logger name; other call sites get LOG_DEFAULT_RATE_LIMIT/s (0 = off)
+    LOG_SAMPLE_RATES: Dict[str, float] = {}
+    LOG_RATE_LIMITS: Dict[str, float] = {
+        "health.check": 1.0,
+        "health.tables": 1.0,
+        "admission.rejected": 1.0,
+    }
+    LOG_DEFAULT_RATE_LIMIT: float = 0.0
+    LOG_LIMIT_EXEMPT_LEVEL: Literal["WARNING", "ERROR", "CRITICAL"] = "ERROR"
+    LOG_SUPPRESSED_SUMMARY_SECONDS: float = 60.0
+    LOG_LIMIT_MAX_KEYS: int = 1000
+
+    # Production server (src/server.py); workers default to the CPU quota
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_MAX_REQUESTS: int = 10000
+    SERVER_MAX_REQUESTS_JITTER: int = 1000
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 25
+    SERVER_KEEP_ALIVE_SECONDS: int = 5
+
+    # In-process read replica of the relationships table; every reload is a full
+    # table scan per worker, and writes from other workers wait for the next one
+    RELATIONSHIP_REPLICA_ENABLED: bool = False
+    RELATIONSHIP_REPLICA_SCAN_SEGMENTS: int = 8
+    RELATIONSHIP_REPLICA_REFRESH_SECONDS: float = 3600.0
+    RELATIONSHIP_REPLICA_MAX_STALENESS_SECONDS: float = 5400.0
+
+    # Per-student version markers behind relationship ETags; cached markers skip DynamoDB
+    RELATIONSHIP_VERSION_CACHE_SECONDS: float = 2.0
+    RELATIONSHIP_VERSION_CACHE_SIZE: int = 10000
+
+    # Relationship item layout: "compact" stores short attribute names, packed
+    # timestamps and compresses names of at least RELATIONSHIP_COMPRESS_MIN_BYTES
+    # in a separate table; switch after copying with the storage migration tool
+    RELATIONSHIP_STORAGE_FORMAT: Literal["legacy", "compact"] = "legacy"
+    RELATIONSHIP_COMPRESS_MIN_BYTES: int = 96
+
+    # Dashboard counters updated on every relationship write; rebuilt by parallel scan.
+    # Each metric is spread over SHARDS partition keys, which reads query and sum
+    RELATIONSHIP_AGGREGATES_ENABLED: bool = True
+    RELATIONSHIP_AGGREGATES_SCAN_SEGMENTS: int = 8
+    RELATIONSHIP_AGGREGATES_SHARDS: int = 8
+
+    # Cold archive: relationships older than ARCHIVE_AFTER_DAYS are moved to
+    # gzip objects in ARCHIVE_BUCKET by the archive job; unset disables reads too
+    ARCHIVE_BUCKET: Optional[str] = None
+    ARCHIVE_PREFIX: str = "archive/relationships"
+    ARCHIVE_AFTER_DAYS: int = 730
+    ARCHIVE_SCAN_SEGMENTS: int = 8
+    ARCHIVE_MANIFEST_CACHE_SECONDS: float = 60.0
+    ARCHIVE_CACHE_PARTITIONS: int = 32
+
     # Dynamically set env_file based on ENVIRONMENT environment variable
     model_config = SettingsConfigDict(
         env_file=(
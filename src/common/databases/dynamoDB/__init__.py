@@ -2,8 +2,51 @@ from .client import (
     DynamoDBClientService,
     get_dynamodb_client_service,
     dynamodb_client_service,
+    create_dynamodb_client_service,
 )
+from .async_client import (
+    AsyncDynamoDBClientService,
+    AsyncDynamoDBTable,
+    get_async_dynamodb_client_service,
+)
+from .memory_client import InMemoryDynamoDBClientService, InMemoryDynamoDBResource
 from .interfaces import DynamoDBClientServiceInterface
+from .query_planner import (
+    FilterSpec,
+    QueryPlan,
+    QueryPlanner,
+    RangeCondition,
+    SearchExplain,
+    student_teacher_relationship_planner,
+)
+from .replica import (
+    ReplicaStatus,
+    TableReplica,
+    student_teacher_relationship_replica,
+)
+from .version_store import VersionStore, VersionStoreStats, relationship_version_store
+from .storage import (
+    CapacityReport,
+    MappedTable,
+    StorageMapping,
+    capacity_report,
+    relationship_storage,
+    relationship_table,
+)
+from .aggregates import (
+    AggregateRebuildReport,
+    RelationshipAggregates,
+    SubjectMonthCount,
+    TeacherStudentCount,
+    relationship_aggregates,
+)
+from .archive import (
+    ArchiveManifest,
+    ArchivePartition,
+    ArchiveRunReport,
+    RelationshipArchive,
+    relationship_archive,
+)
 
 
 __all__ = [
@@ -11,4 +54,38 @@ __all__ = [
     "get_dynamodb_client_service",
     "DynamoDBClientServiceInterface",
     "dynamodb_client_service",
+    "create_dynamodb_client_service",
+    "AsyncDynamoDBClientService",
+    "AsyncDynamoDBTable",
+    "get_async_dynamodb_client_service",
+    "InMemoryDynamoDBClientService",
+    "InMemoryDynamoDBResource",
+    "FilterSpec",
+    "QueryPlan",
+    "QueryPlanner",
+    "RangeCondition",
+    "SearchExplain",
+    "student_teacher_relationship_planner",
+    "ReplicaStatus",
+    "TableReplica",
+    "student_teacher_relationship_replica",
+    "VersionStore",
+    "VersionStoreStats",
+    "relationship_version_store",
+    "CapacityReport",
+    "MappedTable",
+    "StorageMapping",
+    "capacity_report",
+    "relationship_storage",
+    "relationship_table",
+    "AggregateRebuildReport",
+    "RelationshipAggregates",
+    "SubjectMonthCount",
+    "TeacherStudentCount",
+    "relationship_aggregates",
+    "ArchiveManifest",
+    "ArchivePartition",
+    "ArchiveRunReport",
+    "RelationshipArchive",
+    "relationship_archive",
 ]
@@ -0,0 +1,323 @@
+import argparse
+import itertools
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from pydantic import BaseModel
+
+from common.config import settings
+from common.loggers import logger
+from common.resilience import HedgedExecutor, dynamodb_read_executor
+from common.tracing import traced
+from .client import dynamodb_client_service
+from .models import RELATIONSHIP_AGGREGATE_TABLE_NAME
+from .scan import parallel_scan
+from .storage import relationship_table
+
+STUDENTS_PER_TEACHER = "students_per_teacher"
+ENROLLMENTS_PER_SUBJECT_MONTH = "enrollments_per_subject_month"
+# Dashboard metrics whose counters are spread over shards, summed on read
+SHARDED_METRICS = (STUDENTS_PER_TEACHER, ENROLLMENTS_PER_SUBJECT_MONTH)
+# Relationships per (teacher, student) pair, so the teacher count stays distinct
+TEACHER_STUDENTS_PREFIX = "teacher_students#"
+
+AggregateKey = Tuple[str, str]
+
+
+class TeacherStudentCount(BaseModel):
+    TeacherId: str
+    Students: int
+
+
+class SubjectMonthCount(BaseModel):
+    Subject: str
+    Month: str
+    Enrollments: int
+
+
+class AggregateRebuildReport(BaseModel):
+    scanned: int
+    counters: int
+    updated: int
+    removed: int
+    dry_run: bool
+    duration_seconds: float
+
+
+def created_month(created_at: str) -> str:
+    """UTC month (YYYY-MM) of an ISO CreatedAt value."""
+    created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    if created.tzinfo is not None:
+        created = created.astimezone(timezone.utc)
+    return created.strftime("%Y-%m")
+
+
+def _subject_month(item: Dict[str, Any]) -> AggregateKey:
+    # Month first: fixed width, so the subject can contain '#' and months sort
+    return (
+        ENROLLMENTS_PER_SUBJECT_MONTH,
+        f"{created_month(item['CreatedAt'])}#{item['Subject']}",
+    )
+
+
+def _teacher_link(item: Dict[str, Any]) -> AggregateKey:
+    return (f"{TEACHER_STUDENTS_PREFIX}{item['TeacherId']}", item["StudentId"])
+
+
+def shard_metric(metric: str, shard: int) -> str:
+    """Partition key of one shard of a sharded metric."""
+    return f"{metric}#{shard}"
+
+
+class RelationshipAggregates:
+    """
+    Counters for the relationship dashboards, maintained on every write.
+
+    Counters are items of the aggregates table keyed by (Metric, Dimension)
+    and changed with an atomic ADD, so concurrent writers never lose
+    updates. Every write touches the dashboard metrics, so each of them is
+    split over `shards` partitions ("<metric>#<n>"): a write adds to one
+    shard picked at random, and a read queries every shard and sums per
+    dimension. A single shard may go negative; only the sum is meaningful.
+    Students per teacher counts distinct students: a per-pair link
+    counter, unsharded and partitioned by teacher, is bumped first, and the
+    teacher counter only moves when the pair's count goes from 0 to 1 or
+    back.
+
+    Counters are updated after the relationship write, not in the same
+    transaction, so a failure in between leaves them off by one until
+    rebuild() recomputes them with a parallel scan and fixes the ones that
+    differ, writing each sharded total to shard 0. Writes landing while a
+    rebuild runs can be overwritten by it; run it off-peak or run it twice.
+    """
+
+    def __init__(
+        self,
+        scan_segments: int = 8,
+        shards: int = 8,
+        executor: HedgedExecutor = dynamodb_read_executor,
+    ):
+        self.scan_segments = scan_segments
+        self.shards = shards
+        self.executor = executor
+
+    def _stored_key(
+        self, key: AggregateKey, shard: Optional[int] = None
+    ) -> AggregateKey:
+        """Table key of a counter; sharded metrics go to shard, or a random one."""
+        metric, dimension = key
+        if metric not in SHARDED_METRICS:
+            return key
+        if shard is None:
+            shard = random.randrange(self.shards)
+        return (shard_metric(metric, shard), dimension)
+
+    # Incremental updates
+
+    def _add(self, table: Any, key: AggregateKey, delta: int) -> int:
+        """Apply delta and return the stored item's new count (of one shard)."""
+        metric, dimension = self._stored_key(key)
+        response = table.update_item(
+            Key={"Metric": metric, "Dimension": dimension},
+            UpdateExpression="ADD #count :delta",
+            ExpressionAttributeNames={"#count": "Count"},
+            ExpressionAttributeValues={":delta": delta},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(response["Attributes"]["Count"])
+
+    @traced("RelationshipAggregates.record_created")
+    def record_created(self, table: Any, item: Dict[str, Any]) -> None:
+        """Count a newly stored relationship. Call after the write succeeds."""
+        self._add(table, _subject_month(item), 1)
+        if self._add(table, _teacher_link(item), 1) == 1:
+            self._add(table, (STUDENTS_PER_TEACHER, item["TeacherId"]), 1)
+
+    @traced("RelationshipAggregates.record_deleted")
+    def record_deleted(self, table: Any, item: Dict[str, Any]) -> None:
+        """Uncount a deleted relationship, given its old attributes."""
+        self._add(table, _subject_month(item), -1)
+        link = _teacher_link(item)
+        if self._add(table, link, -1) > 0:
+            return
+        self._add(table, (STUDENTS_PER_TEACHER, item["TeacherId"]), -1)
+        try:
+            # Drop the empty link unless a concurrent create re-counted it
+            table.delete_item(
+                Key={"Metric": link[0], "Dimension": link[1]},
+                ConditionExpression=Attr("Count").eq(0),
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    # Reads
+
+    def _query(self, table: Any, condition: Any) -> List[Dict[str, Any]]:
+        request: Dict[str, Any] = {"KeyConditionExpression": condition}
+        items: List[Dict[str, Any]] = []
+        while True:
+            response = self.executor.call("Query", table.query, **request)
+            items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            request["ExclusiveStartKey"] = last_key
+
+    def _sum_shards(
+        self, table: Any, metric: str, dimension: Optional[Any] = None
+    ) -> List[Tuple[str, int]]:
+        """(dimension, total) over every shard of metric, sorted by dimension."""
+        totals: Counter = Counter()
+        for shard in range(self.shards):
+            condition = Key("Metric").eq(shard_metric(metric, shard))
+            if dimension is not None:
+                condition = condition & dimension
+            for item in self._query(table, condition):
+                totals[item["Dimension"]] += int(item["Count"])
+        return sorted(totals.items())
+
+    @traced("RelationshipAggregates.students_per_teacher")
+    def students_per_teacher(
+        self, table: Any, teacher_id: Optional[str] = None
+    ) -> List[TeacherStudentCount]:
+        """Distinct students per teacher, optionally for a single teacher."""
+        if teacher_id is not None:
+            totals = self._sum_shards(
+                table, STUDENTS_PER_TEACHER, Key("Dimension").eq(teacher_id)
+            )
+            count = totals[0][1] if totals else 0
+            return [TeacherStudentCount(TeacherId=teacher_id, Students=count)]
+
+        return [
+            TeacherStudentCount(TeacherId=dimension, Students=count)
+            for dimension, count in self._sum_shards(table, STUDENTS_PER_TEACHER)
+            if count > 0
+        ]
+
+    @traced("RelationshipAggregates.enrollments_per_subject_month")
+    def enrollments_per_subject_month(
+        self, table: Any, month: Optional[str] = None
+    ) -> List[SubjectMonthCount]:
+        """Relationships created per subject and month, optionally for one YYYY-MM."""
+        dimension = None
+        if month is not None:
+            dimension = Key("Dimension").begins_with(f"{month}#")
+        return [
+            SubjectMonthCount(
+                Subject=dimension[8:], Month=dimension[:7], Enrollments=count
+            )
+            for dimension, count in self._sum_shards(
+                table, ENROLLMENTS_PER_SUBJECT_MONTH, dimension
+            )
+            if count > 0
+        ]
+
+    # Rebuild
+
+    def compute(
+        self, relationships_table: Any, archived: Iterable[Dict[str, Any]] = ()
+    ) -> Tuple[Dict[AggregateKey, int], int]:
+        """
+        Recount every counter from the relationships table, plus any archived
+        relationships still counted by the dashboards; returns (counts, scanned).
+        """
+        counts: Counter = Counter()
+        scanned = 0
+        items = itertools.chain(
+            parallel_scan(relationships_table, self.scan_segments), archived
+        )
+        for item in items:
+            scanned += 1
+            counts[_subject_month(item)] += 1
+            counts[_teacher_link(item)] += 1
+        for metric, _ in list(counts):
+            if metric.startswith(TEACHER_STUDENTS_PREFIX):
+                teacher_id = metric[len(TEACHER_STUDENTS_PREFIX) :]
+                counts[(STUDENTS_PER_TEACHER, teacher_id)] += 1
+        return dict(counts), scanned
+
+    @traced("RelationshipAggregates.rebuild")
+    def rebuild(
+        self,
+        relationships_table: Any,
+        aggregate_table: Any,
+        dry_run: bool = False,
+        archived: Iterable[Dict[str, Any]] = (),
+    ) -> AggregateRebuildReport:
+        """Reconcile the aggregates table with a full recount, writing only differences."""
+        started = time.monotonic()
+        counts, scanned = self.compute(relationships_table, archived)
+        expected = {
+            self._stored_key(key, shard=0): count for key, count in counts.items()
+        }
+        stored = {
+            (item["Metric"], item["Dimension"]): int(item["Count"])
+            for item in parallel_scan(aggregate_table, self.scan_segments)
+        }
+        updates = {
+            key: count for key, count in expected.items() if stored.get(key) != count
+        }
+        removals = [
+            key for key, count in stored.items() if key not in expected and count != 0
+        ]
+        # Zero counters left behind by deletes are dropped too, without being reported
+        stale = [
+            key for key, count in stored.items() if key not in expected and count == 0
+        ]
+
+        if not dry_run:
+            with aggregate_table.batch_writer() as batch:
+                for (metric, dimension), count in updates.items():
+                    batch.put_item(
+                        Item={"Metric": metric, "Dimension": dimension, "Count": count}
+                    )
+                for metric, dimension in [*removals, *stale]:
+                    batch.delete_item(Key={"Metric": metric, "Dimension": dimension})
+
+        report = AggregateRebuildReport(
+            scanned=scanned,
+            counters=len(counts),
+            updated=len(updates),
+            removed=len(removals),
+            dry_run=dry_run,
+            duration_seconds=round(time.monotonic() - started, 3),
+        )
+        logger.info(f"Relationship aggregates rebuilt: {report.model_dump()}")
+        return report
+
+
+# Module-level singleton instance
+relationship_aggregates = RelationshipAggregates(
+    scan_segments=settings.RELATIONSHIP_AGGREGATES_SCAN_SEGMENTS,
+    shards=settings.RELATIONSHIP_AGGREGATES_SHARDS,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild relationship aggregates")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report differences without writing"
+    )
+    args = parser.parse_args()
+    # Imported here: the archive module builds on this one
+    from .archive import relationship_archive
+
+    # Archived relationships stay counted, so the recount reads them back
+    client = dynamodb_client_service.get_client()
+    report = relationship_aggregates.rebuild(
+        relationship_table(client),
+        client.Table(RELATIONSHIP_AGGREGATE_TABLE_NAME),
+        dry_run=args.dry_run,
+        archived=relationship_archive.items() if relationship_archive else (),
+    )
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,503 @@
+"""
+Move old relationships out of DynamoDB into compressed S3 objects.
+
+    PYTHONPATH=src python -m common.databases.dynamoDB.archive [--cutoff ISO] [--dry-run]
+
+Archived relationships are stored as gzip JSON lines, one object per
+CreatedAt month and run, under {prefix}/month=YYYY-MM/. A manifest at
+{prefix}/manifest.json lists every object with its item count and CreatedAt
+range, plus archived_before: every relationship older than it is in the
+archive, not the table.
+"""
+
+import argparse
+import contextvars
+import functools
+import gzip
+import json
+import operator
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from pydantic import BaseModel, Field
+
+from common.config import settings
+from common.loggers import logger
+from common.s3.s3_service import S3Service
+from common.tracing import traced
+from .aggregates import created_month
+from .client import dynamodb_client_service
+from .models import RELATIONSHIP_VERSION_TABLE_NAME
+from .query_planner import FilterSpec, RangeCondition
+from .scan import parallel_scan
+from .storage import relationship_table
+from .version_store import VersionStore, relationship_version_store
+
+MANIFEST_NAME = "manifest.json"
+MAX_PARALLEL_READS = 8
+
+
+class ArchivePartition(BaseModel):
+    """One archived object: the relationships of a CreatedAt month from one run."""
+
+    month: str
+    key: str
+    items: int
+    bytes: int
+    min_created_at: str
+    max_created_at: str
+    archived_at: str
+
+    def overlaps(self, condition: RangeCondition) -> bool:
+        if condition.gte is not None and self.max_created_at < condition.gte:
+            return False
+        if condition.lte is not None and self.min_created_at > condition.lte:
+            return False
+        prefix = condition.begins_with
+        if prefix is not None:
+            width = len(prefix)
+            return self.min_created_at[:width] <= prefix <= self.max_created_at[:width]
+        return True
+
+
+class ArchiveManifest(BaseModel):
+    version: int = 1
+    archived_before: Optional[str] = None
+    partitions: List[ArchivePartition] = Field(default_factory=list)
+
+    def covers(self, spec: FilterSpec) -> bool:
+        """True if spec's CreatedAt range reaches back before archived_before."""
+        condition = spec.ranges.get("CreatedAt")
+        if self.archived_before is None or condition is None:
+            return False
+        lower = condition.gte or condition.begins_with
+        return lower is None or lower < self.archived_before
+
+    def partitions_for(self, spec: FilterSpec) -> List[ArchivePartition]:
+        condition = spec.ranges.get("CreatedAt", RangeCondition())
+        return [p for p in self.partitions if p.overlaps(condition)]
+
+
+class ArchiveRunReport(BaseModel):
+    cutoff: str
+    scanned: int
+    archived: int
+    partitions: int
+    skipped: int
+    raw_bytes: int
+    compressed_bytes: int
+    students: int
+    dry_run: bool
+    duration_seconds: float
+
+
+def archive_cutoff(days: int, now: Optional[datetime] = None) -> str:
+    """CreatedAt cutoff `days` ago, in the ISO format relationships are written in."""
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).replace(microsecond=0).isoformat()
+
+
+def _encode(items: List[Dict[str, Any]]) -> bytes:
+    lines = (json.dumps(item, sort_keys=True, default=str) for item in items)
+    return "\n".join(lines).encode("utf-8")
+
+
+def _decode(body: bytes) -> List[Dict[str, Any]]:
+    return [json.loads(line) for line in gzip.decompress(body).splitlines() if line]
+
+
+class RelationshipArchive:
+    """
+    Cold storage for relationships past a CreatedAt cutoff.
+
+    archive() scans the table for older items, writes one object per month,
+    publishes them in the manifest and only then deletes the items, so an
+    interrupted run leaves items in both places rather than neither. Reads
+    de-duplicate on the table key. Deletes wait publish_delay seconds so
+    every worker's cached manifest lists the new objects first; with one
+    archive job at a time the manifest needs no locking.
+
+    Each delete is conditional on the item still matching its archived
+    copy. Items deleted or rewritten by users meanwhile are dropped from the
+    archive by rewriting their month's object, so the archived copy cannot
+    bring a deleted relationship back. Archived relationships are read-only.
+
+    Archived objects never change, so reads keep the most recently used
+    ones decompressed in memory.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        bucket: str,
+        prefix: str = "archive/relationships",
+        manifest_ttl_seconds: float = 60.0,
+        cache_partitions: int = 32,
+        scan_segments: int = 8,
+        publish_delay: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.manifest_ttl_seconds = manifest_ttl_seconds
+        self.cache_partitions = cache_partitions
+        self.scan_segments = scan_segments
+        self.publish_delay = (
+            manifest_ttl_seconds if publish_delay is None else publish_delay
+        )
+        self.sleep = sleep
+        self._manifest: Optional[ArchiveManifest] = None
+        self._manifest_loaded = 0.0
+        self._partitions: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool_executor: Optional[ThreadPoolExecutor] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._pool_executor is None:
+            with self._lock:
+                if self._pool_executor is None:
+                    self._pool_executor = ThreadPoolExecutor(
+                        max_workers=MAX_PARALLEL_READS,
+                        thread_name_prefix="relationship-archive",
+                    )
+        return self._pool_executor
+
+    def shutdown(self) -> None:
+        if self._pool_executor is not None:
+            self._pool_executor.shutdown(wait=True)
+            self._pool_executor = None
+
+    @property
+    def manifest_key(self) -> str:
+        return f"{self.prefix}/{MANIFEST_NAME}"
+
+    def _partition_key(self, month: str, run_id: str) -> str:
+        return f"{self.prefix}/month={month}/part-{run_id}.jsonl.gz"
+
+    # Manifest
+
+    def manifest(self, refresh: bool = False) -> ArchiveManifest:
+        """The archive manifest, re-read from S3 at most every manifest_ttl_seconds."""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                not refresh
+                and self._manifest is not None
+                and now - self._manifest_loaded < self.manifest_ttl_seconds
+            ):
+                return self._manifest
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket, Key=self.manifest_key
+            )
+            manifest = ArchiveManifest.model_validate_json(response["Body"].read())
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in ("NoSuchKey", "404"):
+                raise
+            manifest = ArchiveManifest()
+        with self._lock:
+            self._manifest = manifest
+            self._manifest_loaded = now
+        return manifest
+
+    def _publish(self, manifest: ArchiveManifest) -> None:
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self.manifest_key,
+            Body=manifest.model_dump_json(indent=2).encode("utf-8"),
+            ContentType="application/json",
+        )
+        with self._lock:
+            self._manifest = manifest
+            self._manifest_loaded = time.monotonic()
+
+    # Archiving
+
+    @traced("RelationshipArchive.archive")
+    def archive(
+        self,
+        table: Any,
+        cutoff: str,
+        dry_run: bool = False,
+        versions: Optional[VersionStore] = None,
+        versions_table: Any = None,
+    ) -> ArchiveRunReport:
+        """
+        Move every relationship with CreatedAt < cutoff into the archive.
+
+        Students whose relationships were moved get their version bumped, so
+        cached list responses are revalidated.
+        """
+        started = time.monotonic()
+        by_month: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        scanned = 0
+        for item in parallel_scan(
+            table, self.scan_segments, FilterExpression=Attr("CreatedAt").lt(cutoff)
+        ):
+            scanned += 1
+            by_month[created_month(item["CreatedAt"])].append(item)
+
+        run_id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        archived_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+        partitions: Dict[str, ArchivePartition] = {}
+        raw_bytes = compressed_bytes = 0
+        for month in sorted(by_month):
+            partition, raw = self._write_partition(
+                month, by_month[month], run_id, archived_at, dry_run
+            )
+            partitions[month] = partition
+            raw_bytes += raw
+            compressed_bytes += partition.bytes
+
+        moved = [item for month in sorted(by_month) for item in by_month[month]]
+        students = {item["StudentId"] for item in moved}
+        skipped = 0
+        if not dry_run:
+            self._publish_partitions([], list(partitions.values()), cutoff)
+            if moved:
+                self.sleep(self.publish_delay)
+                # BatchWriteItem takes no conditions, so each item is its own
+                # conditional DeleteItem, at most MAX_PARALLEL_READS at a time
+                deleted = list(
+                    self._pool().map(
+                        functools.partial(self._delete_unchanged, table), moved
+                    )
+                )
+                changed = [item for item, ok in zip(moved, deleted) if not ok]
+                skipped = len(changed)
+                if changed:
+                    self._drop_changed(
+                        by_month, partitions, changed, run_id, archived_at
+                    )
+            if versions is not None:
+                for student_id in students:
+                    versions.bump(versions_table, student_id)
+
+        report = ArchiveRunReport(
+            cutoff=cutoff,
+            scanned=scanned,
+            archived=0 if dry_run else len(moved) - skipped,
+            skipped=skipped,
+            partitions=len(partitions),
+            raw_bytes=raw_bytes,
+            compressed_bytes=compressed_bytes,
+            students=len(students),
+            dry_run=dry_run,
+            duration_seconds=round(time.monotonic() - started, 3),
+        )
+        logger.info(f"Relationship archive run: {report.model_dump()}")
+        return report
+
+    def _write_partition(
+        self,
+        month: str,
+        items: List[Dict[str, Any]],
+        run_id: str,
+        archived_at: str,
+        dry_run: bool,
+    ) -> Tuple[ArchivePartition, int]:
+        """Write one month's object; returns its manifest entry and raw size."""
+        items = sorted(items, key=lambda i: (i["StudentId"], i["CreatedAt"]))
+        raw = _encode(items)
+        body = gzip.compress(raw)
+        partition = ArchivePartition(
+            month=month,
+            key=self._partition_key(month, run_id),
+            items=len(items),
+            bytes=len(body),
+            min_created_at=min(i["CreatedAt"] for i in items),
+            max_created_at=max(i["CreatedAt"] for i in items),
+            archived_at=archived_at,
+        )
+        if not dry_run:
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=partition.key,
+                Body=body,
+                ContentType="application/gzip",
+                Metadata={"items": str(partition.items)},
+            )
+        return partition, len(raw)
+
+    def _publish_partitions(
+        self,
+        removed: List[str],
+        added: List[ArchivePartition],
+        cutoff: Optional[str],
+    ) -> None:
+        manifest = self.manifest(refresh=True)
+        self._publish(
+            ArchiveManifest(
+                archived_before=max(
+                    filter(None, [manifest.archived_before, cutoff]), default=None
+                ),
+                partitions=[
+                    *(p for p in manifest.partitions if p.key not in removed),
+                    *added,
+                ],
+            )
+        )
+
+    def _delete_unchanged(self, table: Any, item: Dict[str, Any]) -> bool:
+        """Delete item from the table if it still equals its archived copy."""
+        condition = functools.reduce(
+            operator.and_, (Attr(name).eq(value) for name, value in item.items())
+        )
+        try:
+            table.delete_item(
+                Key={"StudentId": item["StudentId"], "CreatedAt": item["CreatedAt"]},
+                ConditionExpression=condition,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            return False
+        return True
+
+    def _drop_changed(
+        self,
+        by_month: Dict[str, List[Dict[str, Any]]],
+        partitions: Dict[str, ArchivePartition],
+        changed: List[Dict[str, Any]],
+        run_id: str,
+        archived_at: str,
+    ) -> None:
+        """Rewrite the months holding items users deleted or changed mid-run."""
+        keys = {(i["StudentId"], i["CreatedAt"]) for i in changed}
+        months = sorted({created_month(i["CreatedAt"]) for i in changed})
+        replaced = [partitions.pop(month) for month in months]
+        for month in months:
+            kept = [
+                i
+                for i in by_month[month]
+                if (i["StudentId"], i["CreatedAt"]) not in keys
+            ]
+            if kept:
+                partitions[month], _ = self._write_partition(
+                    month, kept, f"{run_id}-1", archived_at, dry_run=False
+                )
+        self._publish_partitions(
+            [p.key for p in replaced],
+            [partitions[month] for month in months if month in partitions],
+            cutoff=None,
+        )
+        logger.info(
+            f"Dropped {len(changed)} relationships changed during archiving from {months}"
+        )
+        # Workers may still hold the previous manifest until it expires
+        self.sleep(self.publish_delay)
+        for partition in replaced:
+            self.s3_client.delete_object(Bucket=self.bucket, Key=partition.key)
+
+    # Reads
+
+    def covers(self, spec: FilterSpec) -> bool:
+        return self.manifest().covers(spec)
+
+    def read_partition(self, partition: ArchivePartition) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = self._partitions.get(partition.key)
+            if items is not None:
+                self._partitions.move_to_end(partition.key)
+                return items
+        response = self.s3_client.get_object(Bucket=self.bucket, Key=partition.key)
+        items = _decode(response["Body"].read())
+        with self._lock:
+            self._partitions[partition.key] = items
+            while len(self._partitions) > self.cache_partitions:
+                self._partitions.popitem(last=False)
+        return items
+
+    def _read_all(
+        self, partitions: List[ArchivePartition]
+    ) -> List[List[Dict[str, Any]]]:
+        if len(partitions) <= 1:
+            return [self.read_partition(p) for p in partitions]
+        contexts = [contextvars.copy_context() for _ in partitions]
+        return list(
+            self._pool().map(
+                lambda context, p: context.run(self.read_partition, p),
+                contexts,
+                partitions,
+            )
+        )
+
+    @traced("RelationshipArchive.search")
+    def search(self, specs: List[FilterSpec]) -> List[Dict[str, Any]]:
+        """Archived items matching any of specs, reading only overlapping partitions."""
+        manifest = self.manifest()
+        specs = [spec for spec in specs if manifest.covers(spec)]
+        partitions = {p.key: p for spec in specs for p in manifest.partitions_for(spec)}
+        ordered = sorted(partitions.values(), key=lambda p: p.key)
+        items: List[Dict[str, Any]] = []
+        for partition_items in self._read_all(ordered):
+            items.extend(i for i in partition_items if any(s.matches(i) for s in specs))
+        return sorted(items, key=lambda i: (i["StudentId"], i["CreatedAt"]))
+
+    def items(self) -> Iterable[Dict[str, Any]]:
+        """Every archived item, one partition at a time."""
+        for partition in self.manifest(refresh=True).partitions:
+            yield from self.read_partition(partition)
+
+    @traced("RelationshipArchive.get")
+    def get(self, student_id: str, created_at: str) -> Optional[Dict[str, Any]]:
+        spec = FilterSpec(
+            equals={"StudentId": student_id},
+            ranges={"CreatedAt": RangeCondition(gte=created_at, lte=created_at)},
+        )
+        items = self.search([spec])
+        return items[0] if items else None
+
+
+def create_relationship_archive() -> Optional[RelationshipArchive]:
+    """The configured archive, or None when ARCHIVE_BUCKET is not set."""
+    if not settings.ARCHIVE_BUCKET:
+        return None
+    return RelationshipArchive(
+        S3Service().s3_client,
+        settings.ARCHIVE_BUCKET,
+        prefix=settings.ARCHIVE_PREFIX,
+        manifest_ttl_seconds=settings.ARCHIVE_MANIFEST_CACHE_SECONDS,
+        cache_partitions=settings.ARCHIVE_CACHE_PARTITIONS,
+        scan_segments=settings.ARCHIVE_SCAN_SEGMENTS,
+    )
+
+
+# Module-level singleton instance, None unless ARCHIVE_BUCKET is set
+relationship_archive = create_relationship_archive()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive old relationships to S3")
+    parser.add_argument(
+        "--cutoff",
+        help=f"Archive relationships with CreatedAt before this ISO value "
+        f"(default: {settings.ARCHIVE_AFTER_DAYS} days ago)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    args = parser.parse_args()
+
+    if relationship_archive is None:
+        parser.error("ARCHIVE_BUCKET is not set")
+
+    client = dynamodb_client_service.get_client()
+    report = relationship_archive.archive(
+        relationship_table(client),
+        args.cutoff or archive_cutoff(settings.ARCHIVE_AFTER_DAYS),
+        dry_run=args.dry_run,
+        versions=relationship_version_store,
+        versions_table=client.Table(RELATIONSHIP_VERSION_TABLE_NAME),
+    )
+    print(report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
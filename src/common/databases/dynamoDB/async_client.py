@@ -0,0 +1,62 @@
+from typing import Any, Dict
+from fastapi import Depends
+
+from common.aws_io import AwsIoExecutor, aws_io_executor
+from .client import get_dynamodb_client_service
+from .interfaces import DynamoDBClientServiceInterface
+
+
+class AsyncDynamoDBTable:
+    """Awaitable facade over a boto3 Table resource."""
+
+    def __init__(self, table: Any, executor: AwsIoExecutor = aws_io_executor):
+        self._table = table
+        self._executor = executor
+
+    async def get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self._executor.run(self._table.get_item, **kwargs)
+
+    async def put_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self._executor.run(self._table.put_item, **kwargs)
+
+    async def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self._executor.run(self._table.delete_item, **kwargs)
+
+    async def query(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self._executor.run(self._table.query, **kwargs)
+
+    async def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self._executor.run(self._table.scan, **kwargs)
+
+
+class AsyncDynamoDBClientService:
+    """Awaitable facade over a DynamoDB client service; calls run on the AWS I/O pool."""
+
+    def __init__(
+        self,
+        dynamodb_client_service: DynamoDBClientServiceInterface,
+        executor: AwsIoExecutor = aws_io_executor,
+    ):
+        self._dynamodb_client_service = dynamodb_client_service
+        self._executor = executor
+
+    def table(self, name: str) -> AsyncDynamoDBTable:
+        return AsyncDynamoDBTable(
+            self._dynamodb_client_service.get_client().Table(name), self._executor
+        )
+
+    async def list_tables(self, **kwargs: Any) -> Dict[str, Any]:
+        client = self._dynamodb_client_service.get_client().meta.client
+        return await self._executor.run(client.list_tables, **kwargs)
+
+    async def batch_get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        resource = self._dynamodb_client_service.get_client()
+        return await self._executor.run(resource.batch_get_item, **kwargs)
+
+
+def get_async_dynamodb_client_service(
+    dynamodb_client_service: DynamoDBClientServiceInterface = Depends(
+        get_dynamodb_client_service
+    ),
+) -> AsyncDynamoDBClientService:
+    return AsyncDynamoDBClientService(dynamodb_client_service)
@@ -4,6 +4,8 @@ from botocore.client import Config
 
 from common.config import settings
 from common.loggers import logger
+from common.resilience import register_deadline_handler
+from common.tracing import register_tracing_handlers
 from .interfaces import DynamoDBClientServiceInterface
 
 
@@ -16,7 +18,11 @@ class DynamoDBClientService(DynamoDBClientServiceInterface):
         if self._client is None:
             client_config = {
                 "region_name": settings.AWS_REGION,
-                "config": Config(retries={"max_attempts": 3}),
+                "config": Config(
+                    retries={"max_attempts": 3},
+                    connect_timeout=settings.DYNAMODB_CONNECT_TIMEOUT,
+                    read_timeout=settings.DYNAMODB_READ_TIMEOUT,
+                ),
             }
 
             if settings.AWS_ACCESS_KEY_ID:
@@ -24,6 +30,8 @@ class DynamoDBClientService(DynamoDBClientServiceInterface):
                 client_config["aws_secret_access_key"] = settings.AWS_SECRET_ACCESS_KEY
 
             self._client = boto3.resource("dynamodb", **client_config)
+            register_deadline_handler(self._client.meta.client)
+            register_tracing_handlers(self._client.meta.client)
             logger.info("DynamoDB client initialized")
 
     # FIXME: No static type suggested by AWS BOTO3, so use ANY
@@ -41,9 +49,20 @@ class DynamoDBClientService(DynamoDBClientServiceInterface):
             logger.info("DynamoDB client connection closed")
 
 
+def create_dynamodb_client_service() -> DynamoDBClientServiceInterface:
+    """Build the DynamoDB client service selected by settings.DYNAMODB_BACKEND"""
+    if settings.DYNAMODB_BACKEND == "memory":
+        from .memory_client import InMemoryDynamoDBClientService
+
+        return InMemoryDynamoDBClientService(
+            throttle_rate=settings.DYNAMODB_MEMORY_THROTTLE_RATE
+        )
+    return DynamoDBClientService()
+
+
 # Module-level singleton instance
-dynamodb_client_service = DynamoDBClientService()
+dynamodb_client_service = create_dynamodb_client_service()
 
 
-def get_dynamodb_client_service() -> DynamoDBClientService:
+def get_dynamodb_client_service() -> DynamoDBClientServiceInterface:
     return dynamodb_client_service
@@ -3,23 +3,18 @@ import boto3
 from faker import Faker
 
 from ....config import settings
-from ..models import STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME
+from ..models import RELATIONSHIP_VERSION_TABLE_NAME
+from ..storage import relationship_table
+from ..version_store import relationship_version_store
 
 # Constants
-TABLE_NAME = STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME
 NUM_STUDENTS = 20
 NUM_TEACHERS = 8
+NUM_SUBJECTS = 10
 NUM_ENROLLMENTS = 50
 
-# Initialize Faker and DynamoDB resource
+# Initialize Faker
 fake = Faker()
-dynamodb: Any = boto3.resource(
-    "dynamodb",
-    region_name=settings.AWS_REGION,
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-)
-table = dynamodb.Table(TABLE_NAME)
 
 
 def generate_students(num_students: int) -> List[Dict[str, str]]:
@@ -58,32 +53,50 @@ def generate_enrollment(
     }
 
 
+def generate_enrollments(num_enrollments: int) -> List[Dict[str, Any]]:
+    """Generate enrollments over a fixed pool of students, teachers and subjects."""
+    students = generate_students(NUM_STUDENTS)
+    teachers = generate_teachers(NUM_TEACHERS)
+    subjects = generate_subjects(NUM_SUBJECTS)
+    return [
+        generate_enrollment(
+            fake.random_element(students),
+            fake.random_element(teachers),
+            fake.random_element(subjects),
+        )
+        for _ in range(num_enrollments)
+    ]
+
+
 def seed_data():
     """Seed mock data into the DynamoDB table."""
     print("🎲 Generating mock data with Faker...")
 
-    students = generate_students(NUM_STUDENTS)
-    teachers = generate_teachers(NUM_TEACHERS)
-    subjects = generate_subjects(10)
+    dynamodb: Any = boto3.resource(
+        "dynamodb",
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+    )
+    # Written in the configured storage layout
+    table = relationship_table(dynamodb)
+    enrollments = generate_enrollments(NUM_ENROLLMENTS)
 
     print(f"📝 Creating {NUM_ENROLLMENTS} enrollments...")
 
     with table.batch_writer() as batch:
-        enrollments = [
-            generate_enrollment(
-                fake.random_element(students),
-                fake.random_element(teachers),
-                fake.random_element(subjects),
-            )
-            for _ in range(NUM_ENROLLMENTS)
-        ]
-
         for i, enrollment in enumerate(enrollments):
             batch.put_item(Item=enrollment)
             if (i + 1) % 25 == 0:
                 print(f"   ✓ Written {i + 1}/{NUM_ENROLLMENTS} items...")
 
-    print(f"✅ Successfully seeded {NUM_ENROLLMENTS} items to '{TABLE_NAME}'!")
+    # Seeded students get new version markers so cached ETags are revalidated
+    relationship_version_store.bump_many(
+        dynamodb.Table(RELATIONSHIP_VERSION_TABLE_NAME),
+        (enrollment["StudentId"] for enrollment in enrollments),
+    )
+
+    print(f"✅ Successfully seeded {NUM_ENROLLMENTS} items to '{table.name}'!")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,667 @@
+import bisect
+import random
+import re
+import threading
+import zlib
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase, Size
+from botocore.exceptions import ClientError
+
+from common.loggers import logger
+from .interfaces import DynamoDBClientServiceInterface
+from .models import (
+    RELATIONSHIP_AGGREGATE_TABLE_DEFINITION,
+    RELATIONSHIP_VERSION_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION,
+)
+
+# Tables created on initialize, mirroring what setup.py creates in AWS
+DEFAULT_TABLE_DEFINITIONS = [
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION,
+    RELATIONSHIP_VERSION_TABLE_DEFINITION,
+    RELATIONSHIP_AGGREGATE_TABLE_DEFINITION,
+]
+
+# Items returned by a single Query/Scan page when no Limit is given (AWS caps by 1 MB)
+DEFAULT_PAGE_SIZE = 1000
+
+_MISSING = object()
+
+
+def _client_error(code: str, message: str, operation: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation)
+
+
+def _key_names(key_schema: List[Dict[str, str]]) -> Tuple[str, Optional[str]]:
+    hash_key = next(k["AttributeName"] for k in key_schema if k["KeyType"] == "HASH")
+    range_key = next(
+        (k["AttributeName"] for k in key_schema if k["KeyType"] == "RANGE"), None
+    )
+    return hash_key, range_key
+
+
+def _resolve(value: Any, item: Dict[str, Any]) -> Any:
+    if isinstance(value, Size):
+        inner = _resolve(value.get_expression()["values"][0], item)
+        return _MISSING if inner is _MISSING else len(inner)
+    if isinstance(value, AttributeBase):
+        return item.get(value.name, _MISSING)
+    return value
+
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "<>": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "begins_with": lambda a, b: isinstance(a, str) and a.startswith(b),
+    "contains": lambda a, b: b in a,
+    "IN": lambda a, b: a in b,
+}
+
+
+def evaluate_condition(condition: ConditionBase, item: Dict[str, Any]) -> bool:
+    """Evaluate a boto3 Key/Attr condition against a plain item dict."""
+    expression = condition.get_expression()
+    operator = expression["operator"]
+    values = expression["values"]
+
+    if operator == "AND":
+        return all(evaluate_condition(v, item) for v in values)
+    if operator == "OR":
+        return any(evaluate_condition(v, item) for v in values)
+    if operator == "NOT":
+        return not evaluate_condition(values[0], item)
+    if operator == "attribute_exists":
+        return _resolve(values[0], item) is not _MISSING
+    if operator == "attribute_not_exists":
+        return _resolve(values[0], item) is _MISSING
+
+    resolved = [_resolve(v, item) for v in values]
+    if resolved[0] is _MISSING:
+        return operator == "<>"
+    try:
+        if operator == "BETWEEN":
+            return resolved[1] <= resolved[0] <= resolved[2]
+        return _COMPARISONS[operator](resolved[0], resolved[1])
+    except KeyError:
+        raise _client_error(
+            "ValidationException",
+            f"Operator {operator} is not supported by the in-memory backend",
+            "Query",
+        )
+    except TypeError:
+        return False
+
+
+def _key_values(condition: ConditionBase, names: Tuple[str, ...]) -> Dict[str, Any]:
+    """Collect equality values on the given attributes from a key condition."""
+    expression = condition.get_expression()
+    if expression["operator"] == "AND":
+        values: Dict[str, Any] = {}
+        for part in expression["values"]:
+            values.update(_key_values(part, names))
+        return values
+    first = expression["values"][0]
+    if expression["operator"] == "=" and isinstance(first, AttributeBase):
+        if first.name in names:
+            return {first.name: expression["values"][1]}
+    return {}
+
+
+def _check_types(item: Dict[str, Any]) -> None:
+    for value in item.values():
+        # Same restriction as boto3's TypeSerializer
+        if isinstance(value, float):
+            raise TypeError("Float types are not supported. Use Decimal types instead.")
+
+
+_UPDATE_CLAUSE = re.compile(r"\b(SET|ADD|REMOVE)\b", re.IGNORECASE)
+
+
+def _update_actions(
+    expression: str, names: Dict[str, str], values: Dict[str, Any]
+) -> List[Tuple[str, str, Any]]:
+    """
+    Parse an UpdateExpression into (action, attribute, value) tuples.
+
+    Supports top-level attributes with SET a = :v, ADD a :n and REMOVE a.
+    """
+
+    def name(token: str) -> str:
+        return names.get(token, token)
+
+    def value(token: str) -> Any:
+        if token not in values:
+            raise _client_error(
+                "ValidationException",
+                f"Value {token} is not defined in ExpressionAttributeValues",
+                "UpdateItem",
+            )
+        return values[token]
+
+    parts = _UPDATE_CLAUSE.split(expression)
+    actions: List[Tuple[str, str, Any]] = []
+    for clause, body in zip(parts[1::2], parts[2::2]):
+        clause = clause.upper()
+        for action in filter(None, (a.strip() for a in body.split(","))):
+            if clause == "SET":
+                target, _, operand = (t.strip() for t in action.partition("="))
+                if not operand.startswith(":"):
+                    raise _client_error(
+                        "ValidationException",
+                        f"SET {action} is not supported by the in-memory backend",
+                        "UpdateItem",
+                    )
+                actions.append(("SET", name(target), value(operand)))
+            elif clause == "ADD":
+                target, operand = action.split()
+                actions.append(("ADD", name(target), value(operand)))
+            else:
+                actions.append(("REMOVE", name(action), None))
+    if not actions or parts[0].strip():
+        raise _client_error(
+            "ValidationException",
+            f"Invalid UpdateExpression: {expression}",
+            "UpdateItem",
+        )
+    return actions
+
+
+def _apply_update(item: Dict[str, Any], actions: List[Tuple[str, str, Any]]) -> None:
+    for action, attribute, value in actions:
+        if action == "SET":
+            item[attribute] = value
+        elif action == "REMOVE":
+            item.pop(attribute, None)
+        elif isinstance(value, (set, frozenset)):
+            item[attribute] = set(item.get(attribute, set())) | value
+        else:
+            current = item.get(attribute, 0)
+            if not isinstance(current, (int, Decimal)) or isinstance(current, bool):
+                raise _client_error(
+                    "ValidationException",
+                    "An operand in the update expression has an incorrect data type",
+                    "UpdateItem",
+                )
+            item[attribute] = current + value
+
+
+def _partition_hash(primary_key: Tuple[Any, ...]) -> int:
+    return zlib.crc32(str(primary_key[0]).encode())
+
+
+def _scan_position(primary_key: Tuple[Any, ...]) -> Tuple[int, Tuple[Any, ...]]:
+    return (_partition_hash(primary_key), primary_key)
+
+
+class _Partitioned:
+    """Items grouped by hash key value, each partition kept in range key order."""
+
+    def __init__(self, hash_key: str, range_key: Optional[str]):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.partitions: Dict[Any, Dict[Tuple[Any, ...], Dict[str, Any]]] = {}
+        self.orders: Dict[Any, List[Tuple[Any, ...]]] = {}
+
+    def sort_key(
+        self, primary_key: Tuple[Any, ...], item: Dict[str, Any]
+    ) -> Tuple[Any, ...]:
+        if self.range_key is None:
+            return (primary_key,)
+        return (item[self.range_key], primary_key)
+
+    def add(self, primary_key: Tuple[Any, ...], item: Dict[str, Any]) -> None:
+        value = item.get(self.hash_key)
+        # Sparse index: items missing the key attributes are not projected
+        if value is None or (self.range_key and self.range_key not in item):
+            return
+        self.partitions.setdefault(value, {})[primary_key] = item
+        bisect.insort(
+            self.orders.setdefault(value, []), self.sort_key(primary_key, item)
+        )
+
+    def remove(self, primary_key: Tuple[Any, ...], item: Dict[str, Any]) -> None:
+        value = item.get(self.hash_key)
+        partition = self.partitions.get(value)
+        if partition is None or partition.pop(primary_key, None) is None:
+            return
+        order = self.orders[value]
+        del order[bisect.bisect_left(order, self.sort_key(primary_key, item))]
+        if not partition:
+            del self.partitions[value]
+            del self.orders[value]
+
+    def walk(
+        self, value: Any, after: Optional[Tuple[Any, ...]], forward: bool = True
+    ) -> Iterator[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+        """Entries of a partition in order, resuming past the sort key `after`."""
+        partition = self.partitions.get(value, {})
+        order = self.orders.get(value, [])
+        if forward:
+            position = 0 if after is None else bisect.bisect_right(order, after)
+            while position < len(order):
+                primary_key = order[position][-1]
+                yield primary_key, partition[primary_key]
+                position += 1
+        else:
+            position = len(order) if after is None else bisect.bisect_left(order, after)
+            while position > 0:
+                position -= 1
+                primary_key = order[position][-1]
+                yield primary_key, partition[primary_key]
+
+
+class InMemoryTable:
+    """Subset of the boto3 Table resource backed by Python dicts."""
+
+    def __init__(
+        self, definition: Dict[str, Any], resource: "InMemoryDynamoDBResource"
+    ):
+        self.name = definition["TableName"]
+        self.table_status = "ACTIVE"
+        self.definition = definition
+        self.hash_key, self.range_key = _key_names(definition["KeySchema"])
+        self._resource = resource
+        self._lock = threading.RLock()
+        self._items: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        self._base = _Partitioned(self.hash_key, self.range_key)
+        # (hash of the partition key, primary key): scan order, resumable by bisect
+        self._scan_order: List[Tuple[int, Tuple[Any, ...]]] = []
+        self._indexes: Dict[str, _Partitioned] = {}
+        for index in [
+            *definition.get("LocalSecondaryIndexes", []),
+            *definition.get("GlobalSecondaryIndexes", []),
+        ]:
+            self._indexes[index["IndexName"]] = _Partitioned(
+                *_key_names(index["KeySchema"])
+            )
+
+    @property
+    def item_count(self) -> int:
+        return len(self._items)
+
+    def _primary_key(self, item: Dict[str, Any], operation: str) -> Tuple[Any, ...]:
+        names = (
+            (self.hash_key,)
+            if self.range_key is None
+            else (self.hash_key, self.range_key)
+        )
+        try:
+            return tuple(item[name] for name in names)
+        except KeyError:
+            raise _client_error(
+                "ValidationException",
+                "The provided key element does not match the schema",
+                operation,
+            )
+
+    def _key_dict(
+        self, item: Dict[str, Any], index: Optional[_Partitioned]
+    ) -> Dict[str, Any]:
+        names = [self.hash_key, self.range_key]
+        if index is not None:
+            names += [index.hash_key, index.range_key]
+        return {name: item[name] for name in names if name is not None}
+
+    def _check_condition(
+        self, existing: Optional[Dict[str, Any]], kwargs: Dict[str, Any], operation: str
+    ) -> None:
+        condition = kwargs.get("ConditionExpression")
+        if condition is not None and not evaluate_condition(condition, existing or {}):
+            raise _client_error(
+                "ConditionalCheckFailedException",
+                "The conditional request failed",
+                operation,
+            )
+
+    def _store(self, item: Dict[str, Any]) -> None:
+        primary_key = self._primary_key(item, "PutItem")
+        previous = self._items.get(primary_key)
+        if previous is not None:
+            self._unstore(primary_key, previous)
+        self._items[primary_key] = item
+        bisect.insort(self._scan_order, _scan_position(primary_key))
+        self._base.add(primary_key, item)
+        for index in self._indexes.values():
+            index.add(primary_key, item)
+
+    def _unstore(self, primary_key: Tuple[Any, ...], item: Dict[str, Any]) -> None:
+        del self._items[primary_key]
+        position = _scan_position(primary_key)
+        del self._scan_order[bisect.bisect_left(self._scan_order, position)]
+        self._base.remove(primary_key, item)
+        for index in self._indexes.values():
+            index.remove(primary_key, item)
+
+    def get_item(self, Key: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._resource.maybe_throttle("GetItem")
+        item = self._items.get(self._primary_key(Key, "GetItem"))
+        return {} if item is None else {"Item": dict(item)}
+
+    def put_item(self, Item: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._resource.maybe_throttle("PutItem")
+        _check_types(Item)
+        with self._lock:
+            existing = self._items.get(self._primary_key(Item, "PutItem"))
+            self._check_condition(existing, kwargs, "PutItem")
+            self._store(dict(Item))
+        return {}
+
+    def delete_item(self, Key: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._resource.maybe_throttle("DeleteItem")
+        primary_key = self._primary_key(Key, "DeleteItem")
+        with self._lock:
+            existing = self._items.get(primary_key)
+            self._check_condition(existing, kwargs, "DeleteItem")
+            if existing is not None:
+                self._unstore(primary_key, existing)
+        if kwargs.get("ReturnValues") == "ALL_OLD" and existing is not None:
+            return {"Attributes": dict(existing)}
+        return {}
+
+    def update_item(
+        self,
+        Key: Dict[str, Any],
+        UpdateExpression: str,
+        ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+        ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        self._resource.maybe_throttle("UpdateItem")
+        actions = _update_actions(
+            UpdateExpression,
+            ExpressionAttributeNames or {},
+            ExpressionAttributeValues or {},
+        )
+        key_names = {self.hash_key, self.range_key}
+        if any(attribute in key_names for _, attribute, _ in actions):
+            raise _client_error(
+                "ValidationException",
+                "Cannot update attribute which is part of the key",
+                "UpdateItem",
+            )
+        primary_key = self._primary_key(Key, "UpdateItem")
+        with self._lock:
+            existing = self._items.get(primary_key)
+            self._check_condition(existing, kwargs, "UpdateItem")
+            updated = dict(existing) if existing is not None else dict(Key)
+            _apply_update(updated, actions)
+            _check_types(updated)
+            self._store(updated)
+
+        return_values = kwargs.get("ReturnValues", "NONE")
+        if return_values == "ALL_NEW":
+            return {"Attributes": dict(updated)}
+        if return_values == "UPDATED_NEW":
+            changed = {attribute for _, attribute, _ in actions}
+            return {"Attributes": {k: v for k, v in updated.items() if k in changed}}
+        if return_values == "ALL_OLD" and existing is not None:
+            return {"Attributes": dict(existing)}
+        return {}
+
+    def _page(
+        self,
+        entries: Iterator[Tuple[Tuple[Any, ...], Dict[str, Any]]],
+        kwargs: Dict[str, Any],
+        index: Optional[_Partitioned],
+        accept: Optional[Callable[[Tuple[Any, ...], Dict[str, Any]], bool]] = None,
+    ) -> Dict[str, Any]:
+        limit = kwargs.get("Limit") or DEFAULT_PAGE_SIZE
+        filter_expression = kwargs.get("FilterExpression")
+
+        items: List[Dict[str, Any]] = []
+        scanned = 0
+        last: Optional[Dict[str, Any]] = None
+        for primary_key, item in entries:
+            if accept is not None and not accept(primary_key, item):
+                continue
+            scanned += 1
+            # Limit counts evaluated items, before the filter, as in DynamoDB
+            if filter_expression is None or evaluate_condition(filter_expression, item):
+                items.append(dict(item))
+            if scanned == limit:
+                last = item
+                break
+
+        response: Dict[str, Any] = {
+            "Items": items,
+            "Count": len(items),
+            "ScannedCount": scanned,
+        }
+        if last is not None:
+            response["LastEvaluatedKey"] = self._key_dict(last, index)
+        return response
+
+    def query(
+        self, KeyConditionExpression: ConditionBase, **kwargs: Any
+    ) -> Dict[str, Any]:
+        self._resource.maybe_throttle("Query")
+        index_name = kwargs.get("IndexName")
+        index = self._indexes.get(index_name) if index_name else None
+        if index_name and index is None:
+            raise _client_error(
+                "ValidationException",
+                f"The table does not have the specified index: {index_name}",
+                "Query",
+            )
+        partitioned = index or self._base
+        values = _key_values(KeyConditionExpression, (partitioned.hash_key,))
+        if partitioned.hash_key not in values:
+            raise _client_error(
+                "ValidationException",
+                f"Query condition missed key schema element: {partitioned.hash_key}",
+                "Query",
+            )
+
+        start = kwargs.get("ExclusiveStartKey")
+        after = None
+        if start is not None:
+            # Resume past the start key even if that item has since been deleted
+            after = partitioned.sort_key(self._primary_key(start, "Query"), start)
+        with self._lock:
+            entries = partitioned.walk(
+                values[partitioned.hash_key],
+                after,
+                forward=kwargs.get("ScanIndexForward") is not False,
+            )
+            return self._page(
+                entries,
+                kwargs,
+                index,
+                accept=lambda _, item: evaluate_condition(KeyConditionExpression, item),
+            )
+
+    def _scan_entries(
+        self, after: Optional[Tuple[int, Tuple[Any, ...]]]
+    ) -> Iterator[Tuple[Tuple[Any, ...], Dict[str, Any]]]:
+        order = self._scan_order
+        position = 0 if after is None else bisect.bisect_right(order, after)
+        while position < len(order):
+            primary_key = order[position][1]
+            yield primary_key, self._items[primary_key]
+            position += 1
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        self._resource.maybe_throttle("Scan")
+        start = kwargs.get("ExclusiveStartKey")
+        after = (
+            None if start is None else _scan_position(self._primary_key(start, "Scan"))
+        )
+        accept = None
+        total_segments = kwargs.get("TotalSegments")
+        if total_segments:
+            segment = kwargs["Segment"]
+
+            def accept(primary_key: Tuple[Any, ...], item: Dict[str, Any]) -> bool:
+                return _partition_hash(primary_key) % total_segments == segment
+
+        with self._lock:
+            return self._page(self._scan_entries(after), kwargs, None, accept)
+
+    def batch_writer(
+        self, overwrite_by_pkeys: Optional[List[str]] = None
+    ) -> "_BatchWriter":
+        return _BatchWriter(self)
+
+    def load(self) -> None:
+        pass
+
+    def describe(self) -> Dict[str, Any]:
+        size = sum(len(repr(item)) for item in self._items.values())
+        return {
+            "Table": {
+                **self.definition,
+                "TableStatus": self.table_status,
+                "ItemCount": self.item_count,
+                "TableSizeBytes": size,
+            }
+        }
+
+
+class _BatchWriter:
+    """Context manager mirroring boto3's BatchWriter; writes apply immediately."""
+
+    def __init__(self, table: InMemoryTable):
+        self._table = table
+
+    def __enter__(self) -> "_BatchWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+    def put_item(self, Item: Dict[str, Any]) -> None:
+        self._table.put_item(Item=Item)
+
+    def delete_item(self, Key: Dict[str, Any]) -> None:
+        self._table.delete_item(Key=Key)
+
+
+class _InMemoryLowLevelClient:
+    """The few ``resource.meta.client`` calls the service relies on."""
+
+    def __init__(self, resource: "InMemoryDynamoDBResource"):
+        self._resource = resource
+
+    def list_tables(self, Limit: int = 100, **kwargs: Any) -> Dict[str, Any]:
+        self._resource.maybe_throttle("ListTables")
+        return {"TableNames": sorted(self._resource.tables)[:Limit]}
+
+    def describe_table(self, TableName: str) -> Dict[str, Any]:
+        return self._resource.Table(TableName).describe()
+
+
+class InMemoryDynamoDBResource:
+    """
+    Fully in-process stand-in for ``boto3.resource("dynamodb")``.
+
+    Supports the Table operations used in this service (Get/Put/Update/Delete,
+    Query with key conditions on the table and its secondary indexes,
+    segmented Scan, pagination, batch reads and writes) with boto3 condition
+    objects. ``throttle_rate`` makes that fraction of calls fail with
+    ProvisionedThroughputExceededException like an over-capacity table.
+    """
+
+    def __init__(self, throttle_rate: float = 0.0):
+        self.throttle_rate = throttle_rate
+        self.tables: Dict[str, InMemoryTable] = {}
+        self.meta = SimpleNamespace(client=_InMemoryLowLevelClient(self))
+
+    def maybe_throttle(self, operation: str) -> None:
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            raise _client_error(
+                "ProvisionedThroughputExceededException",
+                "The level of configured provisioned throughput for the table was exceeded",
+                operation,
+            )
+
+    def create_table(self, **definition: Any) -> InMemoryTable:
+        name = definition["TableName"]
+        if name in self.tables:
+            raise _client_error(
+                "ResourceInUseException", f"Table already exists: {name}", "CreateTable"
+            )
+        self.tables[name] = InMemoryTable(definition, self)
+        return self.tables[name]
+
+    def Table(self, name: str) -> InMemoryTable:
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise _client_error(
+                "ResourceNotFoundException",
+                f"Requested resource not found: {name}",
+                "Table",
+            )
+
+    def batch_get_item(
+        self, RequestItems: Dict[str, Any], **kwargs: Any
+    ) -> Dict[str, Any]:
+        self.maybe_throttle("BatchGetItem")
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        for name, request in RequestItems.items():
+            table = self.Table(name)
+            responses[name] = [
+                result["Item"]
+                for result in (table.get_item(Key=key) for key in request["Keys"])
+                if "Item" in result
+            ]
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+    def batch_write_item(
+        self, RequestItems: Dict[str, Any], **kwargs: Any
+    ) -> Dict[str, Any]:
+        self.maybe_throttle("BatchWriteItem")
+        for name, requests in RequestItems.items():
+            table = self.Table(name)
+            for request in requests:
+                if "PutRequest" in request:
+                    table.put_item(Item=request["PutRequest"]["Item"])
+                else:
+                    table.delete_item(Key=request["DeleteRequest"]["Key"])
+        return {"UnprocessedItems": {}}
+
+
+class InMemoryDynamoDBClientService(DynamoDBClientServiceInterface):
+    """DynamoDB client service that never leaves the process; see DYNAMODB_BACKEND."""
+
+    def __init__(
+        self,
+        throttle_rate: float = 0.0,
+        table_definitions: Optional[List[Dict[str, Any]]] = None,
+    ):
+        self.throttle_rate = throttle_rate
+        self.table_definitions = (
+            DEFAULT_TABLE_DEFINITIONS
+            if table_definitions is None
+            else table_definitions
+        )
+        self._client: Optional[InMemoryDynamoDBResource] = None
+
+    def initialize(self) -> None:
+        """Create the in-memory resource and its tables once at startup"""
+        if self._client is None:
+            self._client = InMemoryDynamoDBResource(throttle_rate=self.throttle_rate)
+            for definition in self.table_definitions:
+                self._client.create_table(**definition)
+            logger.info("In-memory DynamoDB client initialized")
+
+    def get_client(self) -> InMemoryDynamoDBResource:
+        """Get the initialized in-memory DynamoDB resource"""
+        if self._client is None:
+            self.initialize()
+        return self._client  # type: ignore[return-value]
+
+    def close(self) -> None:
+        """Drop all in-memory tables"""
+        if self._client is not None:
+            self._client = None
+            logger.info("In-memory DynamoDB client closed")
@@ -1,6 +1,33 @@
 from .student_teacher_relationship import (
     StudentTeacherRelationship,
     STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME,
+    STUDENT_TEACHER_RELATIONSHIP_SUBJECT_INDEX,
+    STUDENT_TEACHER_RELATIONSHIP_TEACHER_INDEX,
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_ALIASES,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION,
+)
+from .relationship_version import (
+    RELATIONSHIP_VERSION_TABLE_NAME,
+    RELATIONSHIP_VERSION_TABLE_DEFINITION,
+)
+from .relationship_aggregate import (
+    RELATIONSHIP_AGGREGATE_TABLE_NAME,
+    RELATIONSHIP_AGGREGATE_TABLE_DEFINITION,
 )
 
-__all__ = ["StudentTeacherRelationship", "STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME"]
+__all__ = [
+    "StudentTeacherRelationship",
+    "STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME",
+    "STUDENT_TEACHER_RELATIONSHIP_SUBJECT_INDEX",
+    "STUDENT_TEACHER_RELATIONSHIP_TEACHER_INDEX",
+    "STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION",
+    "STUDENT_TEACHER_RELATIONSHIP_ALIASES",
+    "STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME",
+    "STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION",
+    "RELATIONSHIP_VERSION_TABLE_NAME",
+    "RELATIONSHIP_VERSION_TABLE_DEFINITION",
+    "RELATIONSHIP_AGGREGATE_TABLE_NAME",
+    "RELATIONSHIP_AGGREGATE_TABLE_DEFINITION",
+]
@@ -0,0 +1,22 @@
+RELATIONSHIP_AGGREGATE_TABLE_NAME = "poc-StudentTeacherRelationshipAggregates"
+
+# One counter item per (Metric, Dimension), e.g. ("students_per_teacher#3", "T001");
+# dashboard metrics are split over shard partitions that reads query and sum
+RELATIONSHIP_AGGREGATE_TABLE_DEFINITION = {
+    "TableName": RELATIONSHIP_AGGREGATE_TABLE_NAME,
+    "KeySchema": [
+        {
+            "AttributeName": "Metric",
+            "KeyType": "HASH",  # Partition key
+        },
+        {
+            "AttributeName": "Dimension",
+            "KeyType": "RANGE",  # Sort key
+        },
+    ],
+    "AttributeDefinitions": [
+        {"AttributeName": "Metric", "AttributeType": "S"},
+        {"AttributeName": "Dimension", "AttributeType": "S"},
+    ],
+    "ProvisionedThroughput": {"ReadCapacityUnits": 10, "WriteCapacityUnits": 10},
+}
@@ -0,0 +1,16 @@
+RELATIONSHIP_VERSION_TABLE_NAME = "poc-StudentTeacherRelationshipVersions"
+
+# One item per student holding an opaque marker replaced on every relationship write
+RELATIONSHIP_VERSION_TABLE_DEFINITION = {
+    "TableName": RELATIONSHIP_VERSION_TABLE_NAME,
+    "KeySchema": [
+        {
+            "AttributeName": "StudentId",
+            "KeyType": "HASH",  # Partition key
+        },
+    ],
+    "AttributeDefinitions": [
+        {"AttributeName": "StudentId", "AttributeType": "S"},
+    ],
+    "ProvisionedThroughput": {"ReadCapacityUnits": 10, "WriteCapacityUnits": 10},
+}
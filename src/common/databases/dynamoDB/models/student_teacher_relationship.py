@@ -5,6 +5,107 @@ import uuid
 
 
 STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME = "poc-StudentTeacherRelationships"
+STUDENT_TEACHER_RELATIONSHIP_SUBJECT_INDEX = "SubjectIndex"
+STUDENT_TEACHER_RELATIONSHIP_TEACHER_INDEX = "TeacherIdIndex"
+STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME = (
+    "poc-StudentTeacherRelationshipsCompact"
+)
+
+# Stored attribute names of the compact layout; the Pydantic model keeps the long names
+STUDENT_TEACHER_RELATIONSHIP_ALIASES = {
+    "StudentId": "s",
+    "CreatedAt": "c",
+    "TeacherId": "t",
+    "Subject": "sj",
+    "StudentName": "sn",
+    "TeacherName": "tn",
+}
+
+# CreateTable request shared by the setup script and the in-memory backend
+STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION = {
+    "TableName": STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME,
+    "KeySchema": [
+        {
+            "AttributeName": "StudentId",
+            "KeyType": "HASH",  # Partition key
+        },
+        {
+            "AttributeName": "CreatedAt",
+            "KeyType": "RANGE",  # Sort key
+        },
+    ],
+    "AttributeDefinitions": [
+        {"AttributeName": "StudentId", "AttributeType": "S"},
+        {"AttributeName": "CreatedAt", "AttributeType": "S"},
+        {"AttributeName": "Subject", "AttributeType": "S"},
+        {"AttributeName": "TeacherId", "AttributeType": "S"},
+    ],
+    "LocalSecondaryIndexes": [
+        {
+            "IndexName": STUDENT_TEACHER_RELATIONSHIP_SUBJECT_INDEX,
+            "KeySchema": [
+                {"AttributeName": "StudentId", "KeyType": "HASH"},
+                {"AttributeName": "Subject", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        }
+    ],
+    "GlobalSecondaryIndexes": [
+        {
+            "IndexName": STUDENT_TEACHER_RELATIONSHIP_TEACHER_INDEX,
+            "KeySchema": [
+                {"AttributeName": "TeacherId", "KeyType": "HASH"},
+                {"AttributeName": "CreatedAt", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+            "ProvisionedThroughput": {
+                "ReadCapacityUnits": 10,
+                "WriteCapacityUnits": 10,
+            },
+        }
+    ],
+    "ProvisionedThroughput": {"ReadCapacityUnits": 10, "WriteCapacityUnits": 10},
+}
+
+# Same table and indexes with aliased attribute names, see common.databases.dynamoDB.storage
+STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION = {
+    "TableName": STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME,
+    "KeySchema": [
+        {"AttributeName": "s", "KeyType": "HASH"},  # StudentId
+        {"AttributeName": "c", "KeyType": "RANGE"},  # CreatedAt
+    ],
+    "AttributeDefinitions": [
+        {"AttributeName": "s", "AttributeType": "S"},
+        {"AttributeName": "c", "AttributeType": "S"},
+        {"AttributeName": "sj", "AttributeType": "S"},
+        {"AttributeName": "t", "AttributeType": "S"},
+    ],
+    "LocalSecondaryIndexes": [
+        {
+            "IndexName": STUDENT_TEACHER_RELATIONSHIP_SUBJECT_INDEX,
+            "KeySchema": [
+                {"AttributeName": "s", "KeyType": "HASH"},
+                {"AttributeName": "sj", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        }
+    ],
+    "GlobalSecondaryIndexes": [
+        {
+            "IndexName": STUDENT_TEACHER_RELATIONSHIP_TEACHER_INDEX,
+            "KeySchema": [
+                {"AttributeName": "t", "KeyType": "HASH"},
+                {"AttributeName": "c", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+            "ProvisionedThroughput": {
+                "ReadCapacityUnits": 10,
+                "WriteCapacityUnits": 10,
+            },
+        }
+    ],
+    "ProvisionedThroughput": {"ReadCapacityUnits": 10, "WriteCapacityUnits": 10},
+}
 
 
 class StudentTeacherRelationship(BaseModel):
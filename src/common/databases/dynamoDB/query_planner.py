@@ -0,0 +1,418 @@
+import contextvars
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import Attr, Key
+from pydantic import BaseModel, Field
+
+from common.exceptions import ValidationError
+from common.loggers import logger
+from common.resilience import HedgedExecutor, dynamodb_read_executor
+from common.tracing import traced
+from .models import (
+    STUDENT_TEACHER_RELATIONSHIP_SUBJECT_INDEX,
+    STUDENT_TEACHER_RELATIONSHIP_TEACHER_INDEX,
+)
+
+# DynamoDB bills reads in 4 KB units; eventually consistent reads cost half a unit
+READ_UNIT_SIZE_BYTES = 4096
+EVENTUALLY_CONSISTENT_READ_FACTOR = 0.5
+
+# Fraction of a partition assumed to survive a sort key range condition
+RANGE_SELECTIVITY = 0.25
+BOUNDED_RANGE_SELECTIVITY = 0.1
+
+MAX_PARALLEL_QUERIES = 8
+
+
+class RangeCondition(BaseModel):
+    """Range predicate on a single attribute. Bounds are inclusive."""
+
+    gte: Optional[str] = None
+    lte: Optional[str] = None
+    begins_with: Optional[str] = None
+
+    def is_bounded(self) -> bool:
+        return self.gte is not None and self.lte is not None
+
+    def contains(self, value: Any) -> bool:
+        """Evaluate the condition the way DynamoDB compares strings."""
+        if value is None:
+            return False
+        if self.begins_with is not None and not value.startswith(self.begins_with):
+            return False
+        if self.gte is not None and value < self.gte:
+            return False
+        if self.lte is not None and value > self.lte:
+            return False
+        return True
+
+
+class FilterSpec(BaseModel):
+    """Conjunction of equality and range predicates over item attributes."""
+
+    equals: Dict[str, str] = Field(default_factory=dict)
+    ranges: Dict[str, RangeCondition] = Field(default_factory=dict)
+
+    def attributes(self) -> List[str]:
+        return list(self.equals) + [a for a in self.ranges if a not in self.equals]
+
+    def matches(self, item: Dict[str, Any]) -> bool:
+        return all(
+            item.get(name) == value for name, value in self.equals.items()
+        ) and all(
+            condition.contains(item.get(name))
+            for name, condition in self.ranges.items()
+        )
+
+
+class AccessPath(BaseModel):
+    """Key schema of the base table or one of its secondary indexes."""
+
+    index_name: Optional[str] = None
+    hash_key: str
+    range_key: Optional[str] = None
+
+
+class TableStatistics(BaseModel):
+    """Approximate table shape used to estimate the cost of each access path."""
+
+    item_count: int
+    average_item_size: int
+    distinct_values: Dict[str, int] = Field(default_factory=dict)
+
+    @classmethod
+    def from_description(
+        cls, description: Dict[str, Any], distinct_values: Dict[str, int]
+    ) -> "TableStatistics":
+        """Build statistics from a DescribeTable response (refreshed by AWS ~6 hourly)."""
+        table = description["Table"]
+        item_count = max(int(table.get("ItemCount", 0)), 1)
+        size = int(table.get("TableSizeBytes", 0))
+        return cls(
+            item_count=item_count,
+            average_item_size=max(size // item_count, 1),
+            distinct_values=distinct_values,
+        )
+
+
+class QueryPlan(BaseModel):
+    """Chosen access path for a single FilterSpec plus its estimated cost."""
+
+    operation: str
+    index_name: Optional[str] = None
+    key_condition: Dict[str, str] = Field(default_factory=dict)
+    filter_attributes: List[str] = Field(default_factory=list)
+    estimated_items: int
+    estimated_read_units: float
+    spec: FilterSpec
+
+    def explain(self) -> str:
+        target = self.index_name or "table"
+        keys = ", ".join(f"{k} {v}" for k, v in self.key_condition.items()) or "-"
+        filters = ", ".join(self.filter_attributes) or "-"
+        return (
+            f"{self.operation} on {target} key=[{keys}] filter=[{filters}] "
+            f"~{self.estimated_items} items ~{self.estimated_read_units} RCU"
+        )
+
+
+class SearchExplain(BaseModel):
+    """Explain output for a (possibly OR-ed) search."""
+
+    plans: List[QueryPlan]
+    estimated_read_units: float
+
+    def explain(self) -> str:
+        return "\n".join(plan.explain() for plan in self.plans)
+
+
+def _describe_range(condition: RangeCondition) -> str:
+    if condition.begins_with is not None:
+        return f"begins_with {condition.begins_with!r}"
+    if condition.is_bounded():
+        return f"between {condition.gte!r} and {condition.lte!r}"
+    if condition.gte is not None:
+        return f">= {condition.gte!r}"
+    return f"<= {condition.lte!r}"
+
+
+class QueryPlanner:
+    """
+    Picks the cheapest key condition and index for a filter spec.
+
+    Every access path whose hash key is fixed by an equality predicate is a
+    candidate; the one expected to read the fewest items wins and all
+    remaining predicates are pushed into the FilterExpression. When no path
+    applies the only option is a Scan, which is refused unless allowed.
+    The plans of an OR-ed search run on one long-lived pool per planner.
+    """
+
+    def __init__(
+        self,
+        table_key: AccessPath,
+        indexes: List[AccessPath],
+        statistics: TableStatistics,
+        executor: HedgedExecutor = dynamodb_read_executor,
+    ):
+        self.table_key = table_key
+        self.access_paths = [table_key, *indexes]
+        self.statistics = statistics
+        self.executor = executor
+        self._pool_executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._pool_executor is None:
+            with self._lock:
+                if self._pool_executor is None:
+                    self._pool_executor = ThreadPoolExecutor(
+                        max_workers=MAX_PARALLEL_QUERIES,
+                        thread_name_prefix="query-planner",
+                    )
+        return self._pool_executor
+
+    def shutdown(self) -> None:
+        if self._pool_executor is not None:
+            self._pool_executor.shutdown(wait=True)
+            self._pool_executor = None
+
+    def _read_units(self, items: float) -> float:
+        size = max(items, 1) * self.statistics.average_item_size
+        return (
+            math.ceil(size / READ_UNIT_SIZE_BYTES) * EVENTUALLY_CONSISTENT_READ_FACTOR
+        )
+
+    def _estimate(self, path: AccessPath, spec: FilterSpec) -> Optional[float]:
+        if path.hash_key not in spec.equals:
+            return None
+        stats = self.statistics
+        items = stats.item_count / max(stats.distinct_values.get(path.hash_key, 1), 1)
+
+        if path.range_key is not None:
+            if path.range_key in spec.equals:
+                distinct = stats.distinct_values.get(path.range_key, stats.item_count)
+                items = items / max(distinct, 1)
+            elif path.range_key in spec.ranges:
+                condition = spec.ranges[path.range_key]
+                items *= (
+                    BOUNDED_RANGE_SELECTIVITY
+                    if condition.is_bounded()
+                    else RANGE_SELECTIVITY
+                )
+        return max(items, 1.0)
+
+    def plan(self, spec: FilterSpec, allow_scan: bool = False) -> QueryPlan:
+        """
+        Choose the access path that reads the fewest items for spec.
+
+        Raises:
+            ValidationError: If only a full table scan can satisfy spec and
+                allow_scan is False
+        """
+        best: Optional[Tuple[float, AccessPath]] = None
+        for path in self.access_paths:
+            estimate = self._estimate(path, spec)
+            # Strict comparison keeps the base table on ties, avoiding index lag
+            if estimate is not None and (best is None or estimate < best[0]):
+                best = (estimate, path)
+
+        if best is None:
+            if not allow_scan:
+                raise ValidationError(
+                    field="filters",
+                    message="no key or index matches these filters and a full "
+                    "table scan is not allowed",
+                )
+            items = self.statistics.item_count
+            return QueryPlan(
+                operation="Scan",
+                filter_attributes=spec.attributes(),
+                estimated_items=items,
+                estimated_read_units=self._read_units(items),
+                spec=spec,
+            )
+
+        estimate, path = best
+        key_condition = {path.hash_key: f"= {spec.equals[path.hash_key]!r}"}
+        consumed = {path.hash_key}
+        if path.range_key in spec.equals:
+            key_condition[path.range_key] = f"= {spec.equals[path.range_key]!r}"
+            consumed.add(path.range_key)
+        elif path.range_key in spec.ranges:
+            condition = spec.ranges[path.range_key]
+            key_condition[path.range_key] = _describe_range(condition)
+            # A key condition holds one operator; bounds beside begins_with filter
+            if _residual_bounds(Attr(path.range_key), condition) is None:
+                consumed.add(path.range_key)
+
+        return QueryPlan(
+            operation="Query",
+            index_name=path.index_name,
+            key_condition=key_condition,
+            filter_attributes=[a for a in spec.attributes() if a not in consumed],
+            estimated_items=math.ceil(estimate),
+            estimated_read_units=self._read_units(estimate),
+            spec=spec,
+        )
+
+    def explain(
+        self, specs: List[FilterSpec], allow_scan: bool = False
+    ) -> SearchExplain:
+        """Plan each OR-ed spec and sum their estimated read cost."""
+        plans = [self.plan(spec, allow_scan=allow_scan) for spec in specs]
+        return SearchExplain(
+            plans=plans,
+            estimated_read_units=sum(plan.estimated_read_units for plan in plans),
+        )
+
+    def build_request(self, plan: QueryPlan) -> Dict[str, Any]:
+        """Translate a plan into keyword arguments for Table.query / Table.scan"""
+        spec = plan.spec
+        key_attributes = set(plan.key_condition)
+        request: Dict[str, Any] = {}
+
+        if plan.operation == "Query":
+            key_expression = None
+            for attribute in plan.key_condition:
+                if attribute in spec.equals:
+                    condition = Key(attribute).eq(spec.equals[attribute])
+                else:
+                    condition = _range_condition(Key(attribute), spec.ranges[attribute])
+                key_expression = (
+                    condition if key_expression is None else key_expression & condition
+                )
+            request["KeyConditionExpression"] = key_expression
+            if plan.index_name is not None:
+                request["IndexName"] = plan.index_name
+
+        filter_expression = None
+        for attribute, value in spec.equals.items():
+            if attribute not in key_attributes:
+                condition = Attr(attribute).eq(value)
+                filter_expression = (
+                    condition
+                    if filter_expression is None
+                    else filter_expression & condition
+                )
+        for attribute, range_condition in spec.ranges.items():
+            if attribute not in key_attributes:
+                condition = _range_condition(Attr(attribute), range_condition)
+                residual = _residual_bounds(Attr(attribute), range_condition)
+                if residual is not None:
+                    condition = condition & residual
+            else:
+                condition = _residual_bounds(Attr(attribute), range_condition)
+            if condition is not None:
+                filter_expression = (
+                    condition
+                    if filter_expression is None
+                    else filter_expression & condition
+                )
+        if filter_expression is not None:
+            request["FilterExpression"] = filter_expression
+        return request
+
+    @traced("QueryPlanner.execute")
+    def execute(self, table: Any, plan: QueryPlan) -> List[Dict[str, Any]]:
+        """
+        Run a plan against a boto3 Table resource, following pagination.
+
+        Each page is read through the executor so it honours the request
+        deadline and may be hedged.
+        """
+        request = self.build_request(plan)
+        operation = table.query if plan.operation == "Query" else table.scan
+        items: List[Dict[str, Any]] = []
+        while True:
+            response = self.executor.call(plan.operation, operation, **request)
+            items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            request["ExclusiveStartKey"] = last_key
+
+    @traced("QueryPlanner.search")
+    def search(
+        self, table: Any, specs: List[FilterSpec], allow_scan: bool = False
+    ) -> Tuple[List[Dict[str, Any]], SearchExplain]:
+        """
+        Return items matching any of specs together with the explain output.
+
+        Independent plans run in parallel and results are de-duplicated on
+        the table's primary key.
+        """
+        explain = self.explain(specs, allow_scan=allow_scan)
+        logger.debug(explain.explain())
+
+        if len(explain.plans) == 1:
+            results = [self.execute(table, explain.plans[0])]
+        else:
+            # Copy the caller's context per plan so the request deadline follows
+            contexts = [contextvars.copy_context() for _ in explain.plans]
+            results = list(
+                self._pool().map(
+                    lambda context, plan: context.run(self.execute, table, plan),
+                    contexts,
+                    explain.plans,
+                )
+            )
+
+        seen = set()
+        items: List[Dict[str, Any]] = []
+        for result in results:
+            for item in result:
+                key = (
+                    item.get(self.table_key.hash_key),
+                    item.get(self.table_key.range_key),
+                )
+                if key not in seen:
+                    seen.add(key)
+                    items.append(item)
+        return items, explain
+
+
+def _residual_bounds(builder: Any, condition: RangeCondition) -> Optional[Any]:
+    """The gte/lte bounds that _range_condition leaves out next to begins_with."""
+    if condition.begins_with is None or (
+        condition.gte is None and condition.lte is None
+    ):
+        return None
+    return _range_condition(builder, condition.model_copy(update={"begins_with": None}))
+
+
+def _range_condition(builder: Any, condition: RangeCondition) -> Any:
+    if condition.begins_with is not None:
+        return builder.begins_with(condition.begins_with)
+    if condition.is_bounded():
+        return builder.between(condition.gte, condition.lte)
+    if condition.gte is not None:
+        return builder.gte(condition.gte)
+    return builder.lte(condition.lte)
+
+
+# Defaults sized from the mock fixture ratios; refresh with TableStatistics.from_description
+STUDENT_TEACHER_RELATIONSHIP_STATISTICS = TableStatistics(
+    item_count=1_000_000,
+    average_item_size=256,
+    distinct_values={"StudentId": 400_000, "TeacherId": 20_000, "Subject": 500},
+)
+
+student_teacher_relationship_planner = QueryPlanner(
+    table_key=AccessPath(hash_key="StudentId", range_key="CreatedAt"),
+    indexes=[
+        AccessPath(
+            index_name=STUDENT_TEACHER_RELATIONSHIP_SUBJECT_INDEX,
+            hash_key="StudentId",
+            range_key="Subject",
+        ),
+        AccessPath(
+            index_name=STUDENT_TEACHER_RELATIONSHIP_TEACHER_INDEX,
+            hash_key="TeacherId",
+            range_key="CreatedAt",
+        ),
+    ],
+    statistics=STUDENT_TEACHER_RELATIONSHIP_STATISTICS,
+)
@@ -0,0 +1,315 @@
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from common.config import settings
+from common.loggers import logger
+from common.tracing import traced
+from .models import STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME
+from .query_planner import FilterSpec
+from .scan import parallel_scan
+
+
+class ReplicaStatus(BaseModel):
+    """Point-in-time view of a replica's freshness and footprint."""
+
+    table_name: str
+    loaded: bool
+    fresh: bool
+    item_count: int
+    watermark: Optional[str] = None
+    staleness_seconds: Optional[float] = None
+    memory_bytes: int
+
+
+class _Snapshot:
+    """Rows, key map and hash indexes of one replica load."""
+
+    def __init__(self, replica: "TableReplica"):
+        self.replica = replica
+        self.rows: List[Optional[Tuple[Any, ...]]] = []
+        self.keys: Dict[Tuple[Any, ...], int] = {}
+        self.indexes: Dict[str, Dict[Any, List[int]]] = {
+            name: {} for name in replica.index_attributes
+        }
+        self.strings: Dict[str, str] = {}
+        self.watermark: Optional[str] = None
+        # Running size of live rows and interned strings; containers are added
+        # when memory_bytes() is asked for
+        self._item_bytes = 0
+
+    def _intern(self, value: Any) -> Any:
+        if isinstance(value, str):
+            interned = self.strings.setdefault(value, value)
+            if interned is value:
+                self._item_bytes += sys.getsizeof(value)
+            return interned
+        return value
+
+    def add(self, item: Dict[str, Any]) -> None:
+        replica = self.replica
+        key = tuple(item.get(name) for name in replica.key_attributes)
+        row = tuple(self._intern(item.get(name)) for name in replica.attributes)
+        # A replaced row gets a new id; the old id stays in its buckets as a
+        # dead slot that readers skip, so no bucket is ever rewritten
+        self.remove(key)
+        row_id = len(self.rows)
+        self.rows.append(row)
+        self.keys[key] = row_id
+        self._item_bytes += sys.getsizeof(row)
+        for name, index in self.indexes.items():
+            value = row[replica.positions[name]]
+            if value is not None:
+                bucket = index.get(value)
+                if bucket is None:
+                    index[value] = [row_id]
+                else:
+                    bucket.append(row_id)
+
+        watermark = item.get(replica.watermark_attribute)
+        if watermark is not None and (
+            self.watermark is None or watermark > self.watermark
+        ):
+            self.watermark = watermark
+
+    def remove(self, key: Tuple[Any, ...]) -> None:
+        row_id = self.keys.pop(key, None)
+        if row_id is None:
+            return
+        # Row ids stay stable for readers; the slot is left empty until the
+        # next full load drops it
+        self._item_bytes -= sys.getsizeof(self.rows[row_id])
+        self.rows[row_id] = None
+
+    def memory_bytes(self) -> int:
+        """Current footprint; walks the index buckets but not the rows."""
+        total = self._item_bytes + sys.getsizeof(self.rows)
+        total += sys.getsizeof(self.keys) + sys.getsizeof(self.strings)
+        for index in self.indexes.values():
+            total += sys.getsizeof(index)
+            total += sum(sys.getsizeof(bucket) for bucket in index.values())
+        return total
+
+
+class TableReplica:
+    """
+    Compact in-process copy of a read-dominated DynamoDB table.
+
+    Items are stored as tuples in attribute order with interned strings, and
+    hash indexes map each value of the indexed attributes to row ids. A full
+    parallel scan loads the replica and is repeated every refresh_interval;
+    each reload reads, and bills, the whole table once per worker process, so
+    the interval defaults to an hour. Writes made through this process are
+    applied with apply() and discard() straight away; writes from other
+    processes, including the archive job, show up at the next reload. The
+    replica counts as fresh for max_staleness seconds after a load, so
+    readers must check ``is_fresh()`` and fall back to DynamoDB otherwise.
+
+    Loads build a new snapshot that is swapped in whole, replaying any writes
+    applied while the scan ran. Index buckets are append-only lists: deleted
+    and replaced rows leave dead ids behind that readers skip, and the next
+    load compacts them away, so readers never lock.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        key_attributes: Tuple[str, ...],
+        attributes: Tuple[str, ...],
+        index_attributes: Tuple[str, ...],
+        watermark_attribute: str,
+        scan_segments: int = 8,
+        refresh_interval: float = 3600.0,
+        max_staleness: float = 5400.0,
+    ):
+        self.table_name = table_name
+        self.key_attributes = key_attributes
+        self.attributes = attributes
+        self.index_attributes = index_attributes
+        self.watermark_attribute = watermark_attribute
+        self.scan_segments = scan_segments
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self.positions = {name: i for i, name in enumerate(attributes)}
+
+        self._snapshot = _Snapshot(self)
+        self._table: Optional[Any] = None
+        self._loaded_at: Optional[float] = None
+        # Writes applied while a load scans, replayed onto the new snapshot
+        self._pending: Optional[List[Tuple[str, Any]]] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # Loading
+
+    def load(self, table: Any) -> None:
+        """Replace the replica contents with a full parallel scan of table."""
+        self._table = table
+        started = time.monotonic()
+        with self._lock:
+            self._pending = []
+        try:
+            snapshot = _Snapshot(self)
+            for item in parallel_scan(table, self.scan_segments):
+                snapshot.add(item)
+            with self._lock:
+                for operation, value in self._pending:
+                    getattr(snapshot, operation)(value)
+                self._snapshot = snapshot
+        finally:
+            with self._lock:
+                self._pending = None
+
+        self._loaded_at = time.monotonic()
+        logger.info(
+            f"Replica of {self.table_name} loaded {len(snapshot.keys)} items "
+            f"in {self._loaded_at - started:.2f}s"
+        )
+
+    def _write(self, operation: str, value: Any) -> None:
+        with self._lock:
+            getattr(self._snapshot, operation)(value)
+            if self._pending is not None:
+                self._pending.append((operation, value))
+
+    def apply(self, item: Dict[str, Any]) -> None:
+        """Insert or replace an item written through this process."""
+        self._write("add", item)
+
+    def discard(self, *key: Any) -> None:
+        """Drop an item deleted through this process."""
+        self._write("remove", key)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.load(self._table)
+            except Exception as e:
+                logger.error(f"Replica reload of {self.table_name} failed: {e}")
+
+    def start(self, table: Any) -> None:
+        """Load the replica and keep refreshing it on a daemon thread."""
+        try:
+            self.load(table)
+        except Exception as e:
+            # Serve from DynamoDB until the background reload manages a load
+            self._table = table
+            logger.error(f"Replica load of {self.table_name} failed: {e}")
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"replica-{self.table_name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.refresh_interval)
+            self._thread = None
+
+    # Reading
+
+    def staleness(self) -> Optional[float]:
+        """Seconds since the last full load, the oldest a missed write can be."""
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    def is_fresh(self) -> bool:
+        staleness = self.staleness()
+        return staleness is not None and staleness <= self.max_staleness
+
+    def _to_item(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        return {
+            name: value
+            for name, value in zip(self.attributes, row)
+            if value is not None
+        }
+
+    def get(self, *key: Any) -> Optional[Dict[str, Any]]:
+        snapshot = self._snapshot
+        row_id = snapshot.keys.get(key)
+        row = None if row_id is None else snapshot.rows[row_id]
+        return None if row is None else self._to_item(row)
+
+    def _matches(self, row: Tuple[Any, ...], spec: FilterSpec) -> bool:
+        for name, value in spec.equals.items():
+            if row[self.positions[name]] != value:
+                return False
+        for name, condition in spec.ranges.items():
+            if not condition.contains(row[self.positions[name]]):
+                return False
+        return True
+
+    def query(self, spec: FilterSpec) -> List[Dict[str, Any]]:
+        """Evaluate spec using the smallest matching hash index bucket."""
+        snapshot = self._snapshot
+        candidates: Optional[Sequence[int]] = None
+        for name in self.index_attributes:
+            if name in spec.equals:
+                bucket = snapshot.indexes[name].get(spec.equals[name], ())
+                if candidates is None or len(bucket) < len(candidates):
+                    candidates = bucket
+        rows = snapshot.rows
+        if candidates is None:
+            candidates = range(len(rows))
+        matches = []
+        for row_id in candidates:
+            row = rows[row_id]
+            if row is not None and self._matches(row, spec):
+                matches.append(self._to_item(row))
+        return matches
+
+    @traced("TableReplica.search")
+    def search(self, specs: List[FilterSpec]) -> List[Dict[str, Any]]:
+        """Return items matching any of specs, de-duplicated on the table key."""
+        seen = set()
+        items: List[Dict[str, Any]] = []
+        for spec in specs:
+            for item in self.query(spec):
+                key = tuple(item.get(name) for name in self.key_attributes)
+                if key not in seen:
+                    seen.add(key)
+                    items.append(item)
+        return items
+
+    def memory_bytes(self) -> int:
+        """Approximate footprint of rows, interned strings and indexes."""
+        return self._snapshot.memory_bytes()
+
+    def status(self) -> ReplicaStatus:
+        snapshot = self._snapshot
+        staleness = self.staleness()
+        return ReplicaStatus(
+            table_name=self.table_name,
+            loaded=self._loaded_at is not None,
+            fresh=self.is_fresh(),
+            item_count=len(snapshot.keys),
+            watermark=snapshot.watermark,
+            staleness_seconds=None if staleness is None else round(staleness, 3),
+            memory_bytes=snapshot.memory_bytes(),
+        )
+
+
+# Module-level singleton, only started when RELATIONSHIP_REPLICA_ENABLED is set
+student_teacher_relationship_replica = TableReplica(
+    table_name=STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME,
+    key_attributes=("StudentId", "CreatedAt"),
+    attributes=(
+        "StudentId",
+        "CreatedAt",
+        "TeacherId",
+        "Subject",
+        "StudentName",
+        "TeacherName",
+    ),
+    index_attributes=("StudentId", "TeacherId", "Subject"),
+    watermark_attribute="CreatedAt",
+    scan_segments=settings.RELATIONSHIP_REPLICA_SCAN_SEGMENTS,
+    refresh_interval=settings.RELATIONSHIP_REPLICA_REFRESH_SECONDS,
+    max_staleness=settings.RELATIONSHIP_REPLICA_MAX_STALENESS_SECONDS,
+)
@@ -0,0 +1,82 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+# Marks the end of one segment in the parallel_scan page queue
+_DONE = object()
+
+
+def scan_pages(
+    table: Any, segment: int, total_segments: int, **kwargs: Any
+) -> Iterator[List[Dict[str, Any]]]:
+    """Pages of one Scan segment, following pagination."""
+    request: Dict[str, Any] = {
+        **kwargs,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+    }
+    while True:
+        response = table.scan(**request)
+        yield response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        request["ExclusiveStartKey"] = last_key
+
+
+def parallel_scan(
+    table: Any,
+    total_segments: int,
+    buffer_pages: Optional[int] = None,
+    **kwargs: Any,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Scan every segment on its own thread, yielding items as pages arrive.
+
+    Segments hand pages over through a queue holding at most buffer_pages
+    pages (two per segment by default), so a slow consumer holds the scan
+    back instead of whole segments piling up in memory. A failing segment
+    raises from the iterator, and closing the iterator early stops every
+    segment. kwargs are passed to each Scan.
+    """
+    pages: "queue.Queue[Any]" = queue.Queue(maxsize=buffer_pages or 2 * total_segments)
+    stopped = threading.Event()
+
+    def put(value: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan(segment: int) -> None:
+        try:
+            for page in scan_pages(table, segment, total_segments, **kwargs):
+                if not put(page):
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(_DONE)
+
+    with ThreadPoolExecutor(
+        max_workers=total_segments, thread_name_prefix="parallel-scan"
+    ) as executor:
+        for segment in range(total_segments):
+            executor.submit(scan, segment)
+        try:
+            remaining = total_segments
+            while remaining:
+                page = pages.get()
+                if page is _DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from page
+        finally:
+            # Unblocks segments waiting on a full queue before the pool joins them
+            stopped.set()
@@ -2,7 +2,12 @@ from typing import Any
 import boto3
 from common.config import settings
 
-from .models import STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME
+from .models import (
+    RELATIONSHIP_AGGREGATE_TABLE_DEFINITION,
+    RELATIONSHIP_VERSION_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION,
+)
 
 # Initialize DynamoDB resource with credentials from .env
 dynamodb: Any = boto3.resource(
@@ -15,51 +20,20 @@ dynamodb: Any = boto3.resource(
 
 def create_student_teacher_relationship_table():
     # Create StudentTeacherRelationships table
-    TABLE_NAME = STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME
+    try:
+        table = dynamodb.create_table(**STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION)
+
+        print("Table status:", table.table_status)
+
+    except Exception as e:
+        print(f"Error creating table: {e}")
+
+
+def create_student_teacher_relationship_compact_table():
+    # Create the StudentTeacherRelationships table with the compact storage layout
     try:
         table = dynamodb.create_table(
-            TableName=TABLE_NAME,
-            KeySchema=[
-                {
-                    "AttributeName": "StudentId",
-                    "KeyType": "HASH",  # Partition key
-                },
-                {
-                    "AttributeName": "CreatedAt",
-                    "KeyType": "RANGE",  # Sort key
-                },
-            ],
-            AttributeDefinitions=[
-                {"AttributeName": "StudentId", "AttributeType": "S"},
-                {"AttributeName": "CreatedAt", "AttributeType": "S"},
-                {"AttributeName": "Subject", "AttributeType": "S"},
-                {"AttributeName": "TeacherId", "AttributeType": "S"},
-            ],
-            LocalSecondaryIndexes=[
-                {
-                    "IndexName": "SubjectIndex",
-                    "KeySchema": [
-                        {"AttributeName": "StudentId", "KeyType": "HASH"},
-                        {"AttributeName": "Subject", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                }
-            ],
-            GlobalSecondaryIndexes=[
-                {
-                    "IndexName": "TeacherIdIndex",
-                    "KeySchema": [
-                        {"AttributeName": "TeacherId", "KeyType": "HASH"},
-                        {"AttributeName": "CreatedAt", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {"ProjectionType": "ALL"},
-                    "ProvisionedThroughput": {
-                        "ReadCapacityUnits": 10,
-                        "WriteCapacityUnits": 10,
-                    },
-                }
-            ],
-            ProvisionedThroughput={"ReadCapacityUnits": 10, "WriteCapacityUnits": 10},
+            **STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION
         )
 
         print("Table status:", table.table_status)
@@ -68,8 +42,33 @@ def create_student_teacher_relationship_table():
         print(f"Error creating table: {e}")
 
 
+def create_relationship_version_table():
+    # Create the per-student version marker table used for ETags
+    try:
+        table = dynamodb.create_table(**RELATIONSHIP_VERSION_TABLE_DEFINITION)
+
+        print("Table status:", table.table_status)
+
+    except Exception as e:
+        print(f"Error creating table: {e}")
+
+
+def create_relationship_aggregate_table():
+    # Create the counters behind the relationship dashboards
+    try:
+        table = dynamodb.create_table(**RELATIONSHIP_AGGREGATE_TABLE_DEFINITION)
+
+        print("Table status:", table.table_status)
+
+    except Exception as e:
+        print(f"Error creating table: {e}")
+
+
 def set_up():
     create_student_teacher_relationship_table()
+    create_student_teacher_relationship_compact_table()
+    create_relationship_version_table()
+    create_relationship_aggregate_table()
 
 
 if __name__ == "__main__":
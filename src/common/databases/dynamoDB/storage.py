@@ -0,0 +1,431 @@
+import math
+import re
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase, Size
+from boto3.dynamodb.types import Binary
+from pydantic import BaseModel
+
+from common.config import settings
+from .models import (
+    STUDENT_TEACHER_RELATIONSHIP_ALIASES,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME,
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION,
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME,
+)
+
+# DynamoDB bills writes per started 1 KB and reads per started 4 KB
+WRITE_UNIT_SIZE_BYTES = 1024
+READ_UNIT_SIZE_BYTES = 4096
+# Per-item storage overhead of a table and of each secondary index
+ITEM_OVERHEAD_BYTES = 100
+
+# Operators whose operand must match a stored value exactly; others compare ranges
+_EXACT_OPERATORS = {"=", "<>", "IN"}
+
+_ISO_TIMESTAMP = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z|[+-]\d{2}:\d{2})?$"
+)
+_ISO_PREFIX = re.compile(
+    r"^(\d{4})(?:-(\d{2})(?:-(\d{2})(?:T(\d{2})(?::(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?)?)?)?"
+)
+_PACKED_TIMESTAMP = re.compile(
+    r"^(\d{14})(\d{6})(Z|N|[+-]\d{4})?(?:/([0-5]))?(?:=(.+))?$"
+)
+# Separates a packed timestamp from the original text it was normalised from
+_ORIGINAL_MARKER = "="
+# Sorts above every packed suffix; appended to bounds that include a whole instant
+_INSTANT_END = "~"
+
+
+class AttributeCodec:
+    """Converts one attribute between its public and stored value."""
+
+    def encode(self, value: Any) -> Any:
+        return value
+
+    def decode(self, value: Any) -> Any:
+        return value
+
+    def encode_operand(self, value: Any, operator: str) -> Any:
+        """Stored form of a condition operand; range bounds may be prefixes."""
+        return self.encode(value)
+
+
+class TimestampCodec(AttributeCodec):
+    """
+    Packs ISO timestamps into sortable UTC digits with the fraction padded
+    to six places, e.g. 2024-10-08T12:30:00.5+02:00 is stored as
+    20241008103000500000+0200/1. The suffix restores the original text: the
+    offset (none for +00:00, Z, N for naive, or the original offset), then
+    /<digits> when the fraction was not six digits long. Every packed value
+    starts with the same 20 digits, so values sort by instant whatever
+    their suffix. Range bounds compare at the instant, and partial ISO
+    prefixes ("2024-10") become digit prefixes. Other text that
+    datetime.fromisoformat accepts, which is all the model accepts, is
+    packed from its isoformat() followed by "=" and the original text, so
+    "2024-10-08" and "2024-10-08T00:00:00" stay distinct keys that sort
+    together; anything else is stored unchanged and can only come from keys
+    that were never written.
+    """
+
+    def _pack(self, value: str) -> Optional[str]:
+        match = _ISO_TIMESTAMP.match(value)
+        if match is None:
+            return None
+        *parts, fraction, offset = match.groups()
+        try:
+            moment = datetime(*(int(part) for part in parts))
+        except ValueError:
+            return None
+        if offset is None:
+            suffix = "N"
+        elif offset in ("Z", "+00:00"):
+            suffix = "Z" if offset == "Z" else ""
+        else:
+            sign = 1 if offset[0] == "+" else -1
+            moment -= sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))
+            suffix = offset.replace(":", "")
+        fraction = fraction or ""
+        if len(fraction) != 6:
+            suffix += f"/{len(fraction)}"
+        return f"{moment:%Y%m%d%H%M%S}{fraction.ljust(6, '0')}{suffix}"
+
+    def encode(self, value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        packed = self._pack(value)
+        if packed is not None:
+            return packed
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        packed = self._pack(moment.isoformat())
+        return f"{packed}{_ORIGINAL_MARKER}{value}" if packed else value
+
+    def decode(self, value: Any) -> Any:
+        match = _PACKED_TIMESTAMP.match(value) if isinstance(value, str) else None
+        if match is None:
+            return value
+        digits, fraction, suffix, width, original = match.groups()
+        if original is not None:
+            return original
+        moment = datetime.strptime(digits, "%Y%m%d%H%M%S")
+        if suffix in (None, "Z"):
+            offset = suffix or "+00:00"
+        elif suffix == "N":
+            offset = ""
+        else:
+            sign = 1 if suffix[0] == "+" else -1
+            moment += sign * timedelta(hours=int(suffix[1:3]), minutes=int(suffix[3:5]))
+            offset = f"{suffix[:3]}:{suffix[3:]}"
+        if width is not None:
+            fraction = fraction[: int(width)]
+        fraction = f".{fraction}" if fraction else ""
+        return f"{moment:%Y-%m-%dT%H:%M:%S}{fraction}{offset}"
+
+    def encode_operand(self, value: Any, operator: str) -> Any:
+        if operator in _EXACT_OPERATORS or not isinstance(value, str):
+            return self.encode(value)
+        packed = self._pack(value) if operator != "begins_with" else None
+        if packed is not None:
+            # Stored values at this instant carry a suffix, so <= and > must
+            # take in every suffix while >= and < stop at the bare digits
+            instant = packed[:20]
+            return instant + _INSTANT_END if operator in ("<=", ">") else instant
+        match = _ISO_PREFIX.match(value)
+        return "".join(part for part in match.groups() if part) if match else value
+
+
+class CompressedStringCodec(AttributeCodec):
+    """Stores strings of at least min_bytes as zlib-compressed binary when that is smaller."""
+
+    def __init__(self, min_bytes: int = 96):
+        self.min_bytes = min_bytes
+
+    def encode(self, value: Any) -> Any:
+        if not isinstance(value, str):
+            return value
+        raw = value.encode()
+        if len(raw) < self.min_bytes:
+            return value
+        compressed = zlib.compress(raw, 9)
+        return Binary(compressed) if len(compressed) < len(raw) else value
+
+    def decode(self, value: Any) -> Any:
+        if isinstance(value, Binary):
+            value = value.value
+        if isinstance(value, (bytes, bytearray)):
+            return zlib.decompress(value).decode()
+        return value
+
+
+class StorageMapping:
+    """Maps public attribute names and values to their stored form and back."""
+
+    def __init__(
+        self,
+        aliases: Dict[str, str],
+        codecs: Optional[Dict[str, AttributeCodec]] = None,
+    ):
+        self.aliases = aliases
+        self.names = {alias: name for name, alias in aliases.items()}
+        self.codecs = codecs or {}
+        self._identity = AttributeCodec()
+
+    def alias(self, name: str) -> str:
+        return self.aliases.get(name, name)
+
+    def encode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            self.alias(name): self.codecs.get(name, self._identity).encode(value)
+            for name, value in item.items()
+        }
+
+    def decode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        decoded = {}
+        for alias, value in item.items():
+            name = self.names.get(alias, alias)
+            decoded[name] = self.codecs.get(name, self._identity).decode(value)
+        return decoded
+
+    def encode_condition(self, condition: Any) -> Any:
+        """Rebuild a boto3 Key/Attr condition over stored names and values."""
+        if isinstance(condition, Size):
+            return Size(self.encode_condition(condition.get_expression()["values"][0]))
+        if isinstance(condition, ConditionBase):
+            expression = condition.get_expression()
+            values = expression["values"]
+            attribute = values[0] if isinstance(values[0], AttributeBase) else None
+            name = getattr(attribute, "name", None)
+            codec = (
+                self.codecs.get(name, self._identity)
+                if name is not None and not isinstance(attribute, Size)
+                else self._identity
+            )
+            operators = [expression["operator"]] * len(values)
+            if expression["operator"] == "BETWEEN":
+                # BETWEEN includes both ends, so each bound is encoded on its own side
+                operators = [expression["operator"], ">=", "<="]
+            encoded = []
+            for value, operator in zip(values, operators):
+                if isinstance(value, (ConditionBase, AttributeBase)):
+                    encoded.append(self.encode_condition(value))
+                elif isinstance(value, (list, tuple)):
+                    encoded.append([codec.encode_operand(v, operator) for v in value])
+                else:
+                    encoded.append(codec.encode_operand(value, operator))
+            return type(condition)(*encoded)
+        if isinstance(condition, AttributeBase):
+            return type(condition)(self.alias(condition.name))
+        return condition
+
+
+class _MappedBatchWriter:
+    def __init__(self, writer: Any, mapping: StorageMapping):
+        self._writer = writer
+        self._mapping = mapping
+
+    def __enter__(self) -> "_MappedBatchWriter":
+        self._writer.__enter__()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._writer.__exit__(*exc)
+
+    def put_item(self, Item: Dict[str, Any]) -> None:
+        self._writer.put_item(Item=self._mapping.encode_item(Item))
+
+    def delete_item(self, Key: Dict[str, Any]) -> None:
+        self._writer.delete_item(Key=self._mapping.encode_item(Key))
+
+
+class MappedTable:
+    """
+    boto3 Table wrapper that stores items through a StorageMapping.
+
+    Callers keep using public attribute names in items, keys and Key/Attr
+    conditions; responses are decoded back. Only the Table calls used by
+    the relationships code are mapped. Compressed attributes are binary in
+    DynamoDB, so they cannot be filtered on server side.
+    """
+
+    def __init__(self, table: Any, mapping: StorageMapping):
+        self.table = table
+        self.mapping = mapping
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.table, name)
+
+    def _encode_request(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        request = dict(kwargs)
+        for name in (
+            "KeyConditionExpression",
+            "FilterExpression",
+            "ConditionExpression",
+        ):
+            if request.get(name) is not None:
+                request[name] = self.mapping.encode_condition(request[name])
+        for name in ("Key", "Item", "ExclusiveStartKey"):
+            if request.get(name) is not None:
+                request[name] = self.mapping.encode_item(request[name])
+        return request
+
+    def _decode_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        decoded = dict(response)
+        if "Item" in response:
+            decoded["Item"] = self.mapping.decode_item(response["Item"])
+        if "Attributes" in response:
+            decoded["Attributes"] = self.mapping.decode_item(response["Attributes"])
+        if "Items" in response:
+            decoded["Items"] = [
+                self.mapping.decode_item(item) for item in response["Items"]
+            ]
+        if "LastEvaluatedKey" in response:
+            decoded["LastEvaluatedKey"] = self.mapping.decode_item(
+                response["LastEvaluatedKey"]
+            )
+        return decoded
+
+    def get_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._decode_response(
+            self.table.get_item(**self._encode_request(kwargs))
+        )
+
+    def put_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._decode_response(
+            self.table.put_item(**self._encode_request(kwargs))
+        )
+
+    def delete_item(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._decode_response(
+            self.table.delete_item(**self._encode_request(kwargs))
+        )
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._decode_response(self.table.query(**self._encode_request(kwargs)))
+
+    def scan(self, **kwargs: Any) -> Dict[str, Any]:
+        return self._decode_response(self.table.scan(**self._encode_request(kwargs)))
+
+    def batch_writer(
+        self, overwrite_by_pkeys: Optional[List[str]] = None
+    ) -> _MappedBatchWriter:
+        if overwrite_by_pkeys is not None:
+            overwrite_by_pkeys = [
+                self.mapping.alias(name) for name in overwrite_by_pkeys
+            ]
+        return _MappedBatchWriter(
+            self.table.batch_writer(overwrite_by_pkeys=overwrite_by_pkeys), self.mapping
+        )
+
+
+# Module-level singleton instance for the relationships compact layout
+relationship_storage = StorageMapping(
+    aliases=STUDENT_TEACHER_RELATIONSHIP_ALIASES,
+    codecs={
+        "CreatedAt": TimestampCodec(),
+        "StudentName": CompressedStringCodec(settings.RELATIONSHIP_COMPRESS_MIN_BYTES),
+        "TeacherName": CompressedStringCodec(settings.RELATIONSHIP_COMPRESS_MIN_BYTES),
+    },
+)
+
+
+def relationship_table(client: Any, storage_format: Optional[str] = None) -> Any:
+    """The relationships table in the configured layout, always speaking public names."""
+    if (storage_format or settings.RELATIONSHIP_STORAGE_FORMAT) == "compact":
+        return MappedTable(
+            client.Table(STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME),
+            relationship_storage,
+        )
+    return client.Table(STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME)
+
+
+# Capacity accounting
+
+
+def _value_size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, Binary):
+        return len(value.value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, bool) or value is None:
+        return 1
+    if isinstance(value, (int, float)) or hasattr(value, "as_tuple"):
+        digits = len(str(value).lstrip("-").replace(".", "").strip("0")) or 1
+        return math.ceil(digits / 2) + 1
+    return len(str(value).encode())
+
+
+def item_size(item: Dict[str, Any]) -> int:
+    """DynamoDB item size: attribute name bytes plus value bytes."""
+    return sum(len(name.encode()) + _value_size(value) for name, value in item.items())
+
+
+class LayoutCapacity(BaseModel):
+    table_name: str
+    items: int
+    average_item_bytes: float
+    write_units_per_put: float
+    read_units_per_get: float
+    read_units_per_100_item_query: float
+    storage_bytes: int
+
+
+class CapacityReport(BaseModel):
+    legacy: LayoutCapacity
+    compact: LayoutCapacity
+    item_bytes_saved_percent: float
+    write_units_saved_percent: float
+
+
+def _layout_capacity(
+    definition: Dict[str, Any], items: List[Dict[str, Any]]
+) -> LayoutCapacity:
+    sizes = [item_size(item) for item in items]
+    indexes = len(definition.get("LocalSecondaryIndexes", [])) + len(
+        definition.get("GlobalSecondaryIndexes", [])
+    )
+    # With ALL projections every put is also written, at full size, to each index
+    writes = sum(
+        math.ceil(size / WRITE_UNIT_SIZE_BYTES) * (1 + indexes) for size in sizes
+    )
+    gets = sum(math.ceil(size / READ_UNIT_SIZE_BYTES) * 0.5 for size in sizes)
+    # A query is billed on the summed size of the items it reads
+    query = math.ceil(sum(sizes) / len(sizes) * 100 / READ_UNIT_SIZE_BYTES) * 0.5
+    return LayoutCapacity(
+        table_name=definition["TableName"],
+        items=len(items),
+        average_item_bytes=round(sum(sizes) / len(sizes), 1),
+        write_units_per_put=round(writes / len(sizes), 3),
+        read_units_per_get=round(gets / len(sizes), 3),
+        read_units_per_100_item_query=query,
+        storage_bytes=(sum(sizes) + ITEM_OVERHEAD_BYTES * len(sizes)) * (1 + indexes),
+    )
+
+
+def capacity_report(
+    items: List[Dict[str, Any]], mapping: StorageMapping = relationship_storage
+) -> CapacityReport:
+    """Compare the capacity the legacy and compact layouts need for the same items."""
+    legacy = _layout_capacity(STUDENT_TEACHER_RELATIONSHIP_TABLE_DEFINITION, items)
+    compact = _layout_capacity(
+        STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_DEFINITION,
+        [mapping.encode_item(item) for item in items],
+    )
+    return CapacityReport(
+        legacy=legacy,
+        compact=compact,
+        item_bytes_saved_percent=round(
+            100 * (1 - compact.average_item_bytes / legacy.average_item_bytes), 1
+        ),
+        write_units_saved_percent=round(
+            100 * (1 - compact.write_units_per_put / legacy.write_units_per_put), 1
+        ),
+    )
@@ -0,0 +1,129 @@
+"""
+Copy relationships into the compact storage layout and report the capacity saved.
+
+    PYTHONPATH=src python -m common.databases.dynamoDB.storage_migration copy [--dry-run]
+    PYTHONPATH=src python -m common.databases.dynamoDB.storage_migration report [--items N]
+
+Switching over: create the compact table (setup-db), run copy, set
+RELATIONSHIP_STORAGE_FORMAT=compact, then run copy again with
+--created-after set to the first run's start time to pick up relationships
+created in between. Deletes made during the switch are not carried over.
+Every student copied gets a new version marker, so ETags issued before the
+switch are revalidated.
+"""
+
+import argparse
+import time
+from typing import Any, Optional, Set
+
+from boto3.dynamodb.conditions import Attr
+from pydantic import BaseModel
+
+from common.loggers import logger
+from .client import dynamodb_client_service
+from .models import RELATIONSHIP_VERSION_TABLE_NAME
+from .scan import parallel_scan
+from .storage import (
+    capacity_report,
+    item_size,
+    relationship_storage,
+    relationship_table,
+)
+from .version_store import VersionStore, relationship_version_store
+
+
+class MigrationReport(BaseModel):
+    scanned: int
+    written: int
+    legacy_bytes: int
+    compact_bytes: int
+    dry_run: bool
+    duration_seconds: float
+
+
+def migrate(
+    source: Any,
+    target: Any,
+    scan_segments: int = 8,
+    created_after: Optional[str] = None,
+    dry_run: bool = False,
+    versions: Optional[VersionStore] = None,
+    versions_table: Any = None,
+) -> MigrationReport:
+    """
+    Copy every legacy item into the compact table with a parallel scan.
+
+    Items are overwritten by key, so the copy can be re-run safely. Students
+    whose relationships were copied get their version bumped.
+    """
+    started = time.monotonic()
+    request = {}
+    if created_after is not None:
+        request["FilterExpression"] = Attr("CreatedAt").gte(created_after)
+
+    scanned = written = legacy_bytes = compact_bytes = 0
+    students: Set[str] = set()
+    with target.batch_writer() as batch:
+        for item in parallel_scan(source, scan_segments, **request):
+            scanned += 1
+            legacy_bytes += item_size(item)
+            compact_bytes += item_size(relationship_storage.encode_item(item))
+            if not dry_run:
+                batch.put_item(Item=item)
+                students.add(item["StudentId"])
+                written += 1
+    if versions is not None:
+        versions.bump_many(versions_table, students)
+
+    report = MigrationReport(
+        scanned=scanned,
+        written=written,
+        legacy_bytes=legacy_bytes,
+        compact_bytes=compact_bytes,
+        dry_run=dry_run,
+        duration_seconds=round(time.monotonic() - started, 3),
+    )
+    logger.info(f"Relationship storage migration: {report.model_dump()}")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Relationship storage layout tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    copy = commands.add_parser("copy", help="Copy legacy items into the compact table")
+    copy.add_argument("--dry-run", action="store_true", help="Measure without writing")
+    copy.add_argument(
+        "--created-after", help="Only copy items with CreatedAt >= this value"
+    )
+    copy.add_argument("--segments", type=int, default=8, help="Parallel scan segments")
+
+    report = commands.add_parser(
+        "report", help="Capacity of both layouts on synthetic data"
+    )
+    report.add_argument("--items", type=int, default=1000)
+
+    args = parser.parse_args()
+    if args.command == "report":
+        from .fixtures.mock_student_teacher_relationships import generate_enrollments
+
+        print(
+            capacity_report(generate_enrollments(args.items)).model_dump_json(indent=2)
+        )
+        return
+
+    client = dynamodb_client_service.get_client()
+    result = migrate(
+        relationship_table(client, "legacy"),
+        relationship_table(client, "compact"),
+        scan_segments=args.segments,
+        created_after=args.created_after,
+        dry_run=args.dry_run,
+        versions=relationship_version_store,
+        versions_table=client.Table(RELATIONSHIP_VERSION_TABLE_NAME),
+    )
+    print(result.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from common.resilience import HedgedExecutor
+from ..aggregates import (
+    ENROLLMENTS_PER_SUBJECT_MONTH,
+    STUDENTS_PER_TEACHER,
+    RelationshipAggregates,
+    SubjectMonthCount,
+    TeacherStudentCount,
+    created_month,
+    shard_metric,
+)
+
+
+def test_created_month_uses_utc():
+    assert created_month("2024-10-31T23:30:00-02:00") == "2024-11"
+    assert created_month("2024-10-08T10:30:00Z") == "2024-10"
+    assert created_month("2024-01-01") == "2024-01"
+
+
+def test_students_per_teacher_counts_distinct_students(aggregates, aggregate_table):
+    """Test a second relationship between the same pair does not recount the student"""
+    first = {
+        "StudentId": "S1",
+        "CreatedAt": "2024-01-01",
+        "TeacherId": "T1",
+        "Subject": "Math",
+    }
+    second = {**first, "CreatedAt": "2024-02-01", "Subject": "Physics"}
+
+    aggregates.record_created(aggregate_table, first)
+    aggregates.record_created(aggregate_table, second)
+    assert aggregates.students_per_teacher(aggregate_table, "T1") == [
+        TeacherStudentCount(TeacherId="T1", Students=1)
+    ]
+
+    aggregates.record_deleted(aggregate_table, first)
+    assert aggregates.students_per_teacher(aggregate_table, "T1")[0].Students == 1
+
+    aggregates.record_deleted(aggregate_table, second)
+    assert aggregates.students_per_teacher(aggregate_table, "T1")[0].Students == 0
+    assert aggregates.students_per_teacher(aggregate_table) == []
+    # The emptied pair counter is dropped to keep the table compact
+    assert aggregate_table.item_count == 3
+
+
+def test_enrollments_per_subject_month(aggregates, aggregate_table, relationship_items):
+    for item in relationship_items:
+        aggregates.record_created(aggregate_table, item)
+
+    assert aggregates.enrollments_per_subject_month(aggregate_table) == [
+        SubjectMonthCount(Subject="Math", Month="2024-01", Enrollments=1),
+        SubjectMonthCount(Subject="Math", Month="2024-03", Enrollments=1),
+        SubjectMonthCount(Subject="Art", Month="2024-06", Enrollments=1),
+    ]
+    assert aggregates.enrollments_per_subject_month(aggregate_table, "2024-03") == [
+        SubjectMonthCount(Subject="Math", Month="2024-03", Enrollments=1),
+    ]
+
+
+def test_rebuild_reconciles_counters(aggregates, memory_table, aggregate_table):
+    """Test a rebuild restores counters that drifted from the relationships table"""
+    aggregate_table.put_item(
+        Item={
+            "Metric": shard_metric(STUDENTS_PER_TEACHER, 0),
+            "Dimension": "T1",
+            "Count": 7,
+        }
+    )
+    aggregate_table.put_item(
+        Item={
+            "Metric": shard_metric(ENROLLMENTS_PER_SUBJECT_MONTH, 0),
+            "Dimension": "2023-01#Gone",
+            "Count": 2,
+        }
+    )
+
+    dry_run = aggregates.rebuild(memory_table, aggregate_table, dry_run=True)
+    assert aggregates.students_per_teacher(aggregate_table, "T1")[0].Students == 7
+
+    report = aggregates.rebuild(memory_table, aggregate_table)
+
+    assert report.scanned == 3
+    assert (
+        (report.updated, report.removed) == (dry_run.updated, dry_run.removed) == (8, 1)
+    )
+    assert aggregates.students_per_teacher(aggregate_table) == [
+        TeacherStudentCount(TeacherId="T1", Students=2),
+        TeacherStudentCount(TeacherId="T2", Students=1),
+    ]
+    assert len(aggregates.enrollments_per_subject_month(aggregate_table)) == 3
+    assert aggregates.rebuild(memory_table, aggregate_table).updated == 0
+
+
+def test_sharded_counters_are_summed(memory_table, aggregate_table, relationship_items):
+    """Test writes spread over shards read back as totals, and a rebuild collapses them"""
+    aggregates = RelationshipAggregates(
+        scan_segments=2, shards=4, executor=HedgedExecutor()
+    )
+    for _ in range(5):
+        for item in relationship_items:
+            aggregates.record_created(aggregate_table, item)
+        for item in relationship_items:
+            aggregates.record_deleted(aggregate_table, item)
+    for item in relationship_items:
+        aggregates.record_created(aggregate_table, item)
+
+    metrics = {item["Metric"] for item in aggregate_table.scan()["Items"]}
+    assert len(metrics & {shard_metric(STUDENTS_PER_TEACHER, n) for n in range(4)}) > 1
+    assert aggregates.students_per_teacher(aggregate_table) == [
+        TeacherStudentCount(TeacherId="T1", Students=2),
+        TeacherStudentCount(TeacherId="T2", Students=1),
+    ]
+    assert aggregates.students_per_teacher(aggregate_table, "T1")[0].Students == 2
+    assert len(aggregates.enrollments_per_subject_month(aggregate_table)) == 3
+
+    aggregates.rebuild(memory_table, aggregate_table)
+    assert aggregates.students_per_teacher(aggregate_table, "T1")[0].Students == 2
+    assert all(
+        not item["Metric"].startswith(
+            (STUDENTS_PER_TEACHER, ENROLLMENTS_PER_SUBJECT_MONTH)
+        )
+        or item["Metric"].endswith("#0")
+        for item in aggregate_table.scan()["Items"]
+    )
@@ -0,0 +1,169 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+from ..archive import ArchiveManifest, archive_cutoff
+from ..query_planner import FilterSpec, RangeCondition
+
+
+def created_between(gte=None, lte=None, **equals):
+    return FilterSpec(
+        equals=equals, ranges={"CreatedAt": RangeCondition(gte=gte, lte=lte)}
+    )
+
+
+def test_archive_cutoff():
+    now = datetime(2026, 3, 1, 12, 0, 0, 123, tzinfo=timezone.utc)
+    assert archive_cutoff(730, now) == "2024-03-01T12:00:00+00:00"
+
+
+def test_archive_moves_old_items(
+    archive, s3_client, memory_table, version_store, version_table
+):
+    before = {sid: version_store.current(version_table, sid) for sid in ("S1", "S2")}
+
+    report = archive.archive(
+        memory_table, "2024-05-01", versions=version_store, versions_table=version_table
+    )
+
+    assert (report.scanned, report.archived, report.partitions, report.students) == (
+        2,
+        2,
+        2,
+        2,
+    )
+    remaining = memory_table.scan()["Items"]
+    assert [(i["StudentId"], i["CreatedAt"]) for i in remaining] == [
+        ("S1", "2024-06-01")
+    ]
+
+    manifest = archive.manifest(refresh=True)
+    assert manifest.archived_before == "2024-05-01"
+    assert [p.month for p in manifest.partitions] == ["2024-01", "2024-03"]
+    body = s3_client.objects[("archive-bucket", manifest.partitions[0].key)]
+    lines = gzip.decompress(body).splitlines()
+    assert [json.loads(line)["StudentId"] for line in lines] == ["S1"]
+    assert manifest.partitions[0].key.startswith(
+        "archive/relationships/month=2024-01/part-"
+    )
+    for sid in ("S1", "S2"):
+        assert version_store.current(version_table, sid) != before[sid]
+
+
+def test_archive_drops_items_deleted_during_run(archive, s3_client, memory_table):
+    """Test a delete made while the manifest propagates is not undone by the archive"""
+    archive.sleep = lambda seconds: memory_table.delete_item(
+        Key={"StudentId": "S2", "CreatedAt": "2024-03-01"}
+    )
+
+    report = archive.archive(memory_table, "2024-05-01")
+
+    assert (report.archived, report.skipped, report.partitions) == (1, 1, 1)
+    manifest = archive.manifest(refresh=True)
+    assert [p.month for p in manifest.partitions] == ["2024-01"]
+    assert archive.get("S2", "2024-03-01") is None
+    assert archive.get("S1", "2024-01-01") is not None
+    assert [key for _, key in s3_client.objects if "month=2024-03" in key] == []
+
+
+def test_archive_keeps_items_rewritten_during_run(archive, memory_table):
+    """Test an item changed after the scan stays in the table and leaves the archive"""
+    changed = {
+        "StudentId": "S1",
+        "CreatedAt": "2024-01-01",
+        "TeacherId": "T9",
+        "Subject": "Art",
+    }
+    archive.sleep = lambda seconds: memory_table.put_item(Item=changed)
+
+    report = archive.archive(memory_table, "2024-05-01")
+
+    assert report.skipped == 1
+    assert (
+        memory_table.get_item(Key={"StudentId": "S1", "CreatedAt": "2024-01-01"})[
+            "Item"
+        ]
+        == changed
+    )
+    assert archive.get("S1", "2024-01-01") is None
+
+
+def test_archive_dry_run_writes_nothing(archive, s3_client, memory_table):
+    report = archive.archive(memory_table, "2024-05-01", dry_run=True)
+
+    assert (report.scanned, report.archived, report.partitions) == (2, 0, 2)
+    assert report.compressed_bytes > 0
+    assert s3_client.objects == {}
+    assert len(memory_table.scan()["Items"]) == 3
+
+
+def test_search_reads_only_overlapping_partitions(archive, s3_client, memory_table):
+    archive.archive(memory_table, "2024-05-01")
+    gets = s3_client.gets
+
+    items = archive.search([created_between(gte="2024-02-01", TeacherId="T1")])
+
+    assert [(i["StudentId"], i["CreatedAt"]) for i in items] == [("S2", "2024-03-01")]
+    assert s3_client.gets == gets + 1
+    # Cached partitions are not read again
+    archive.search([created_between(gte="2024-02-01")])
+    assert s3_client.gets == gets + 1
+
+
+def test_search_skips_specs_outside_archive(archive, s3_client, memory_table):
+    archive.archive(memory_table, "2024-05-01")
+    gets = s3_client.gets
+
+    assert archive.search([FilterSpec(equals={"StudentId": "S1"})]) == []
+    assert archive.search([created_between(gte="2024-05-01")]) == []
+    assert s3_client.gets == gets
+
+
+def test_get_archived_item(archive, memory_table):
+    archive.archive(memory_table, "2024-05-01")
+
+    assert archive.get("S1", "2024-01-01")["Subject"] == "Math"
+    assert archive.get("S1", "2024-02-01") is None
+
+
+def test_manifest_covers_and_prunes():
+    manifest = ArchiveManifest.model_validate(
+        {
+            "archived_before": "2024-05-01",
+            "partitions": [
+                {
+                    "month": "2024-01",
+                    "key": "a",
+                    "items": 1,
+                    "bytes": 10,
+                    "min_created_at": "2024-01-01",
+                    "max_created_at": "2024-01-31",
+                    "archived_at": "2026-01-01",
+                }
+            ],
+        }
+    )
+    assert manifest.covers(created_between(lte="2023-01-01"))
+    assert manifest.covers(
+        FilterSpec(ranges={"CreatedAt": RangeCondition(begins_with="2024-01")})
+    )
+    assert not manifest.covers(FilterSpec())
+    assert manifest.partitions_for(created_between(gte="2024-01-15")) != []
+    assert manifest.partitions_for(created_between(gte="2024-02-01")) == []
+    assert (
+        manifest.partitions_for(
+            FilterSpec(ranges={"CreatedAt": RangeCondition(begins_with="2023")})
+        )
+        == []
+    )
+
+
+def test_rebuild_keeps_archived_relationships_counted(
+    archive, aggregates, memory_table, aggregate_table
+):
+    aggregates.rebuild(memory_table, aggregate_table)
+    archive.archive(memory_table, "2024-05-01")
+
+    report = aggregates.rebuild(memory_table, aggregate_table, archived=archive.items())
+
+    assert (report.scanned, report.updated, report.removed) == (3, 0, 0)
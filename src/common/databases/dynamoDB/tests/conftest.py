@@ -0,0 +1,191 @@
+"""
+Test configuration for DynamoDB helpers
+"""
+
+import io
+
+import pytest
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
+
+from ..memory_client import InMemoryDynamoDBClientService
+from common.resilience import HedgedExecutor
+from ..aggregates import RelationshipAggregates
+from ..archive import RelationshipArchive
+from ..models import (
+    RELATIONSHIP_AGGREGATE_TABLE_NAME,
+    RELATIONSHIP_VERSION_TABLE_NAME,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME,
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME,
+)
+from ..replica import TableReplica
+from ..storage import MappedTable, relationship_storage
+from ..version_store import VersionStore
+from ..query_planner import (
+    AccessPath,
+    QueryPlanner,
+    TableStatistics,
+)
+
+
+@pytest.fixture
+def statistics():
+    """Fixture for a table of 1000 items over 100 students and 10 teachers."""
+    return TableStatistics(
+        item_count=1000,
+        average_item_size=200,
+        distinct_values={"StudentId": 100, "TeacherId": 10, "Subject": 20},
+    )
+
+
+@pytest.fixture
+def planner(statistics):
+    """Fixture for a planner mirroring the relationships table layout."""
+    return QueryPlanner(
+        table_key=AccessPath(hash_key="StudentId", range_key="CreatedAt"),
+        indexes=[
+            AccessPath(
+                index_name="SubjectIndex", hash_key="StudentId", range_key="Subject"
+            ),
+            AccessPath(
+                index_name="TeacherIdIndex", hash_key="TeacherId", range_key="CreatedAt"
+            ),
+        ],
+        statistics=statistics,
+    )
+
+
+@pytest.fixture
+def mock_table():
+    """Fixture for a mocked boto3 Table resource."""
+    table = MagicMock()
+    table.query.return_value = {"Items": []}
+    table.scan.return_value = {"Items": []}
+    return table
+
+
+@pytest.fixture
+def relationship_items():
+    """Fixture for stored relationship items across two students and teachers."""
+    return [
+        {
+            "StudentId": "S1",
+            "CreatedAt": "2024-01-01",
+            "TeacherId": "T1",
+            "Subject": "Math",
+        },
+        {
+            "StudentId": "S1",
+            "CreatedAt": "2024-06-01",
+            "TeacherId": "T2",
+            "Subject": "Art",
+        },
+        {
+            "StudentId": "S2",
+            "CreatedAt": "2024-03-01",
+            "TeacherId": "T1",
+            "Subject": "Math",
+        },
+    ]
+
+
+@pytest.fixture
+def replica():
+    """Fixture for a single-segment replica of the relationships table."""
+    return TableReplica(
+        table_name="TestTable",
+        key_attributes=("StudentId", "CreatedAt"),
+        attributes=("StudentId", "CreatedAt", "TeacherId", "Subject"),
+        index_attributes=("StudentId", "TeacherId", "Subject"),
+        watermark_attribute="CreatedAt",
+        scan_segments=1,
+    )
+
+
+@pytest.fixture
+def memory_resource(relationship_items):
+    """Fixture for an in-memory DynamoDB resource seeded with relationship items."""
+    service = InMemoryDynamoDBClientService()
+    resource = service.get_client()
+    table = resource.Table(STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME)
+    with table.batch_writer() as batch:
+        for item in relationship_items:
+            batch.put_item(Item=item)
+    return resource
+
+
+@pytest.fixture
+def memory_table(memory_resource):
+    """Fixture for the seeded in-memory relationships table."""
+    return memory_resource.Table(STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME)
+
+
+@pytest.fixture
+def version_table(memory_resource):
+    """Fixture for the in-memory version marker table."""
+    return memory_resource.Table(RELATIONSHIP_VERSION_TABLE_NAME)
+
+
+@pytest.fixture
+def version_store():
+    """Fixture for a version store with a long-lived cache."""
+    return VersionStore(
+        hash_key="StudentId", cache_seconds=60, executor=HedgedExecutor()
+    )
+
+
+@pytest.fixture
+def aggregate_table(memory_resource):
+    """Fixture for the in-memory aggregates table."""
+    return memory_resource.Table(RELATIONSHIP_AGGREGATE_TABLE_NAME)
+
+
+@pytest.fixture
+def aggregates():
+    """Fixture for aggregates scanning with two segments, on a single shard."""
+    return RelationshipAggregates(scan_segments=2, shards=1, executor=HedgedExecutor())
+
+
+@pytest.fixture
+def compact_table(memory_resource):
+    """Fixture for the empty compact relationships table behind its storage mapping."""
+    return MappedTable(
+        memory_resource.Table(STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME),
+        relationship_storage,
+    )
+
+
+class FakeS3Client:
+    """Dict-backed stand-in for the put/get/delete_object calls of an S3 client."""
+
+    def __init__(self):
+        self.objects = {}
+        self.gets = 0
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = bytes(Body)
+        return {}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def get_object(self, Bucket, Key):
+        self.gets += 1
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+@pytest.fixture
+def s3_client():
+    """Fixture for an empty fake S3 client."""
+    return FakeS3Client()
+
+
+@pytest.fixture
+def archive(s3_client):
+    """Fixture for an archive that publishes without waiting and caches the manifest."""
+    return RelationshipArchive(
+        s3_client, "archive-bucket", scan_segments=2, publish_delay=0
+    )
@@ -0,0 +1,256 @@
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from ..memory_client import InMemoryDynamoDBResource
+from ..models import (
+    RELATIONSHIP_AGGREGATE_TABLE_NAME,
+    RELATIONSHIP_VERSION_TABLE_NAME,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME,
+    STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME,
+)
+from ..query_planner import FilterSpec
+
+
+def test_get_put_delete(memory_table):
+    key = {"StudentId": "S1", "CreatedAt": "2024-01-01"}
+
+    assert memory_table.get_item(Key=key)["Item"]["Subject"] == "Math"
+
+    memory_table.put_item(Item={**key, "TeacherId": "T9", "Subject": "Music"})
+    assert memory_table.get_item(Key=key)["Item"]["Subject"] == "Music"
+    assert (
+        memory_table.query(
+            KeyConditionExpression=Key("TeacherId").eq("T9"), IndexName="TeacherIdIndex"
+        )["Count"]
+        == 1
+    )
+
+    memory_table.delete_item(Key=key)
+    assert memory_table.get_item(Key=key) == {}
+    assert (
+        memory_table.query(
+            KeyConditionExpression=Key("TeacherId").eq("T9"), IndexName="TeacherIdIndex"
+        )["Count"]
+        == 0
+    )
+
+
+def test_put_with_condition(memory_table):
+    item = {
+        "StudentId": "S1",
+        "CreatedAt": "2024-01-01",
+        "TeacherId": "T1",
+        "Subject": "Math",
+    }
+
+    with pytest.raises(ClientError) as exc_info:
+        memory_table.put_item(
+            Item=item, ConditionExpression=Attr("StudentId").not_exists()
+        )
+
+    assert exc_info.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def test_update_item_add_and_set(aggregate_table):
+    key = {"Metric": "m", "Dimension": "d"}
+
+    first = aggregate_table.update_item(
+        Key=key,
+        UpdateExpression="ADD #count :one SET Label = :label",
+        ExpressionAttributeNames={"#count": "Count"},
+        ExpressionAttributeValues={":one": 1, ":label": "first"},
+        ReturnValues="UPDATED_NEW",
+    )
+    second = aggregate_table.update_item(
+        Key=key,
+        UpdateExpression="ADD #count :two",
+        ExpressionAttributeNames={"#count": "Count"},
+        ExpressionAttributeValues={":two": 2},
+        ReturnValues="ALL_NEW",
+    )
+
+    assert first == {"Attributes": {"Count": 1, "Label": "first"}}
+    assert second["Attributes"] == {**key, "Count": 3, "Label": "first"}
+
+    aggregate_table.update_item(Key=key, UpdateExpression="REMOVE Label")
+    assert aggregate_table.get_item(Key=key)["Item"] == {**key, "Count": 3}
+
+
+def test_update_item_validation(aggregate_table):
+    key = {"Metric": "m", "Dimension": "d"}
+    aggregate_table.put_item(Item={**key, "Label": "text"})
+
+    with pytest.raises(ClientError) as exc_info:
+        aggregate_table.update_item(
+            Key=key,
+            UpdateExpression="ADD Label :one",
+            ExpressionAttributeValues={":one": 1},
+        )
+    assert exc_info.value.response["Error"]["Code"] == "ValidationException"
+
+    with pytest.raises(ClientError) as exc_info:
+        aggregate_table.update_item(
+            Key=key,
+            UpdateExpression="SET Label = :v",
+            ExpressionAttributeValues={":v": "new"},
+            ConditionExpression=Attr("Label").eq("other"),
+        )
+    assert exc_info.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def test_query_table_orders_by_range_key(memory_table):
+    response = memory_table.query(
+        KeyConditionExpression=Key("StudentId").eq("S1")
+        & Key("CreatedAt").gte("2024-01-01"),
+        ScanIndexForward=False,
+    )
+
+    assert [i["CreatedAt"] for i in response["Items"]] == ["2024-06-01", "2024-01-01"]
+
+
+def test_query_subject_index(memory_table):
+    response = memory_table.query(
+        IndexName="SubjectIndex",
+        KeyConditionExpression=Key("StudentId").eq("S1") & Key("Subject").eq("Art"),
+    )
+
+    assert [i["CreatedAt"] for i in response["Items"]] == ["2024-06-01"]
+
+
+def test_query_requires_hash_key(memory_table):
+    with pytest.raises(ClientError):
+        memory_table.query(KeyConditionExpression=Key("CreatedAt").gte("2024"))
+
+
+def test_query_paginates(memory_table):
+    condition = Key("TeacherId").eq("T1")
+
+    first = memory_table.query(
+        KeyConditionExpression=condition, IndexName="TeacherIdIndex", Limit=1
+    )
+    second = memory_table.query(
+        KeyConditionExpression=condition,
+        IndexName="TeacherIdIndex",
+        Limit=1,
+        ExclusiveStartKey=first["LastEvaluatedKey"],
+    )
+
+    assert first["LastEvaluatedKey"]["TeacherId"] == "T1"
+    assert [i["StudentId"] for i in first["Items"] + second["Items"]] == ["S1", "S2"]
+
+
+def test_query_resumes_after_deleted_start_key(memory_table):
+    condition = Key("StudentId").eq("S1")
+    first = memory_table.query(KeyConditionExpression=condition, Limit=1)
+    memory_table.delete_item(Key=first["LastEvaluatedKey"])
+
+    second = memory_table.query(
+        KeyConditionExpression=condition,
+        Limit=1,
+        ExclusiveStartKey=first["LastEvaluatedKey"],
+    )
+
+    assert [i["CreatedAt"] for i in second["Items"]] == ["2024-06-01"]
+
+
+def test_query_reverse_paginates(memory_table):
+    condition = Key("StudentId").eq("S1")
+    first = memory_table.query(
+        KeyConditionExpression=condition, ScanIndexForward=False, Limit=1
+    )
+    second = memory_table.query(
+        KeyConditionExpression=condition,
+        ScanIndexForward=False,
+        ExclusiveStartKey=first["LastEvaluatedKey"],
+    )
+
+    assert [i["CreatedAt"] for i in first["Items"] + second["Items"]] == [
+        "2024-06-01",
+        "2024-01-01",
+    ]
+
+
+def test_scan_resumes_after_deleted_start_key(memory_table):
+    seen = []
+    request = {"Limit": 1}
+    while True:
+        page = memory_table.scan(**request)
+        seen += [(i["StudentId"], i["CreatedAt"]) for i in page["Items"]]
+        if "LastEvaluatedKey" not in page:
+            break
+        # Deleting the item the next page resumes from must not stop the scan
+        memory_table.delete_item(Key=page["LastEvaluatedKey"])
+        request["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+
+    assert len(seen) == 3
+
+
+def test_scan_segments_cover_table(memory_table):
+    items = []
+    for segment in range(3):
+        items += memory_table.scan(Segment=segment, TotalSegments=3)["Items"]
+
+    assert len(items) == 3
+
+
+def test_scan_filter(memory_table):
+    response = memory_table.scan(FilterExpression=Attr("Subject").eq("Math"))
+
+    assert response["Count"] == 2
+    assert response["ScannedCount"] == 3
+
+
+def test_batch_get_item(memory_resource):
+    response = memory_resource.batch_get_item(
+        RequestItems={
+            STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME: {
+                "Keys": [
+                    {"StudentId": "S1", "CreatedAt": "2024-01-01"},
+                    {"StudentId": "S9", "CreatedAt": "2024-01-01"},
+                ]
+            }
+        }
+    )
+
+    assert len(response["Responses"][STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME]) == 1
+
+
+def test_list_tables(memory_resource):
+    client = memory_resource.meta.client
+
+    assert client.list_tables()["TableNames"] == sorted(
+        [
+            STUDENT_TEACHER_RELATIONSHIP_TABLE_NAME,
+            STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME,
+            RELATIONSHIP_VERSION_TABLE_NAME,
+            RELATIONSHIP_AGGREGATE_TABLE_NAME,
+        ]
+    )
+    assert len(client.list_tables(Limit=1)["TableNames"]) == 1
+
+
+def test_throttling():
+    resource = InMemoryDynamoDBResource(throttle_rate=1.0)
+
+    with pytest.raises(ClientError) as exc_info:
+        resource.meta.client.list_tables()
+
+    assert (
+        exc_info.value.response["Error"]["Code"]
+        == "ProvisionedThroughputExceededException"
+    )
+
+
+def test_planner_runs_against_memory_backend(memory_table):
+    from ..query_planner import student_teacher_relationship_planner
+
+    items, _ = student_teacher_relationship_planner.search(
+        memory_table,
+        [
+            FilterSpec(equals={"StudentId": "S1", "Subject": "Art"}),
+            FilterSpec(equals={"TeacherId": "T1"}),
+        ],
+    )
+
+    assert len(items) == 3
@@ -0,0 +1,163 @@
+import pytest
+
+from common.exceptions import ValidationError
+from ..query_planner import FilterSpec, RangeCondition, TableStatistics
+
+
+def test_plan_student_only_uses_table(planner):
+    plan = planner.plan(FilterSpec(equals={"StudentId": "S1"}))
+
+    assert plan.operation == "Query"
+    assert plan.index_name is None
+    assert plan.estimated_items == 10
+
+
+def test_plan_student_and_subject_uses_subject_index(planner):
+    plan = planner.plan(FilterSpec(equals={"StudentId": "S1", "Subject": "Math"}))
+
+    assert plan.index_name == "SubjectIndex"
+    assert set(plan.key_condition) == {"StudentId", "Subject"}
+    assert plan.filter_attributes == []
+
+
+def test_plan_teacher_with_date_range_uses_teacher_index(planner):
+    spec = FilterSpec(
+        equals={"TeacherId": "T1", "Subject": "Math"},
+        ranges={"CreatedAt": RangeCondition(gte="2024-01-01", lte="2024-12-31")},
+    )
+
+    plan = planner.plan(spec)
+
+    assert plan.index_name == "TeacherIdIndex"
+    assert set(plan.key_condition) == {"TeacherId", "CreatedAt"}
+    assert plan.filter_attributes == ["Subject"]
+    assert plan.estimated_items == 10
+
+
+def test_plan_prefers_student_over_teacher(planner):
+    plan = planner.plan(FilterSpec(equals={"StudentId": "S1", "TeacherId": "T1"}))
+
+    assert plan.index_name is None
+    assert plan.filter_attributes == ["TeacherId"]
+
+
+def test_plan_refuses_scan_by_default(planner):
+    with pytest.raises(ValidationError):
+        planner.plan(FilterSpec(equals={"Subject": "Math"}))
+
+
+def test_plan_allows_scan_when_requested(planner):
+    plan = planner.plan(FilterSpec(equals={"Subject": "Math"}), allow_scan=True)
+
+    assert plan.operation == "Scan"
+    assert plan.estimated_items == 1000
+    assert plan.estimated_read_units == 24.5
+
+
+def test_build_request_pushes_remaining_predicates_into_filter(planner):
+    spec = FilterSpec(
+        equals={"TeacherId": "T1", "Subject": "Math"},
+        ranges={"CreatedAt": RangeCondition(gte="2024-01-01")},
+    )
+
+    request = planner.build_request(planner.plan(spec))
+
+    assert request["IndexName"] == "TeacherIdIndex"
+    assert "KeyConditionExpression" in request
+    assert "FilterExpression" in request
+
+
+def test_execute_follows_pagination(planner, mock_table):
+    mock_table.query.side_effect = [
+        {
+            "Items": [{"StudentId": "S1", "CreatedAt": "1"}],
+            "LastEvaluatedKey": {"k": 1},
+        },
+        {"Items": [{"StudentId": "S1", "CreatedAt": "2"}]},
+    ]
+
+    items = planner.execute(
+        mock_table, planner.plan(FilterSpec(equals={"StudentId": "S1"}))
+    )
+
+    assert len(items) == 2
+    assert mock_table.query.call_args_list[1].kwargs["ExclusiveStartKey"] == {"k": 1}
+
+
+def test_search_runs_or_filters_and_deduplicates(planner, mock_table):
+    item = {"StudentId": "S1", "CreatedAt": "1", "TeacherId": "T1"}
+    mock_table.query.return_value = {"Items": [item]}
+
+    items, explain = planner.search(
+        mock_table,
+        [
+            FilterSpec(equals={"StudentId": "S1"}),
+            FilterSpec(equals={"TeacherId": "T1"}),
+        ],
+    )
+
+    assert items == [item]
+    assert mock_table.query.call_count == 2
+    assert len(explain.plans) == 2
+    assert explain.estimated_read_units == sum(
+        p.estimated_read_units for p in explain.plans
+    )
+
+
+def test_statistics_from_description():
+    stats = TableStatistics.from_description(
+        {"Table": {"ItemCount": 10, "TableSizeBytes": 2000}}, {"StudentId": 5}
+    )
+
+    assert stats.item_count == 10
+    assert stats.average_item_size == 200
+
+
+def test_filter_spec_matches():
+    spec = FilterSpec(
+        equals={"TeacherId": "T1"},
+        ranges={"CreatedAt": RangeCondition(gte="2024-01-01", lte="2024-03-01")},
+    )
+
+    assert spec.matches({"TeacherId": "T1", "CreatedAt": "2024-02-01"})
+    assert not spec.matches({"TeacherId": "T1", "CreatedAt": "2024-04-01"})
+    assert not spec.matches({"TeacherId": "T2", "CreatedAt": "2024-02-01"})
+    assert not spec.matches({"TeacherId": "T1"})
+
+
+def test_search_reuses_one_pool(planner, mock_table):
+    specs = [
+        FilterSpec(equals={"StudentId": "S1"}),
+        FilterSpec(equals={"TeacherId": "T1"}),
+    ]
+
+    planner.search(mock_table, specs)
+    pool = planner._pool()
+    planner.search(mock_table, specs)
+
+    assert planner._pool() is pool
+    planner.shutdown()
+
+
+@pytest.mark.parametrize(
+    "equals, created",
+    [
+        ({"StudentId": "S1"}, ["2024-06-01"]),
+        ({"StudentId": "S1", "Subject": "Math"}, []),
+    ],
+)
+def test_begins_with_keeps_bounds_on_both_paths(
+    planner, replica, mock_table, memory_table, relationship_items, equals, created
+):
+    spec = FilterSpec(
+        equals=equals,
+        ranges={"CreatedAt": RangeCondition(begins_with="2024", gte="2024-03-01")},
+    )
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+
+    items, _ = planner.search(memory_table, [spec])
+
+    expected = [i for i in relationship_items if spec.matches(i)]
+    assert [i["CreatedAt"] for i in items] == created
+    assert items == expected == replica.query(spec)
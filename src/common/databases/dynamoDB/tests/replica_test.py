@@ -0,0 +1,134 @@
+from ..query_planner import FilterSpec, RangeCondition
+
+
+def test_load_builds_indexes(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+
+    replica.load(mock_table)
+
+    assert replica.is_fresh()
+    assert [
+        i["CreatedAt"] for i in replica.query(FilterSpec(equals={"TeacherId": "T1"}))
+    ] == [
+        "2024-01-01",
+        "2024-03-01",
+    ]
+    assert replica.get("S1", "2024-06-01")["Subject"] == "Art"
+
+
+def test_query_applies_all_predicates(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+
+    items = replica.query(
+        FilterSpec(
+            equals={"Subject": "Math"},
+            ranges={"CreatedAt": RangeCondition(gte="2024-02-01")},
+        )
+    )
+
+    assert [i["StudentId"] for i in items] == ["S2"]
+
+
+def test_reload_replaces_contents(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+    new_item = {
+        "StudentId": "S3",
+        "CreatedAt": "2024-07-01",
+        "TeacherId": "T2",
+        "Subject": "Art",
+    }
+    mock_table.scan.return_value = {"Items": [relationship_items[1], new_item]}
+
+    replica.load(mock_table)
+
+    assert "FilterExpression" not in mock_table.scan.call_args.kwargs
+    status = replica.status()
+    assert status.item_count == 2
+    assert status.watermark == "2024-07-01"
+    assert status.memory_bytes > 0
+    assert replica.get("S1", "2024-01-01") is None
+
+
+def test_apply_and_discard_local_writes(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+    moved = {**relationship_items[0], "TeacherId": "T3"}
+
+    replica.apply(moved)
+    replica.discard("S2", "2024-03-01")
+
+    assert replica.query(FilterSpec(equals={"TeacherId": "T1"})) == []
+    assert replica.query(FilterSpec(equals={"TeacherId": "T3"})) == [moved]
+    assert replica.get("S2", "2024-03-01") is None
+    assert replica.status().item_count == 2
+
+
+def test_repeated_writes_keep_one_index_entry(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+
+    for _ in range(3):
+        replica.apply(relationship_items[0])
+
+    items = replica.query(FilterSpec(equals={"StudentId": "S1"}))
+    assert sorted(i["CreatedAt"] for i in items) == ["2024-01-01", "2024-06-01"]
+    assert replica.status().item_count == 3
+
+
+def test_memory_bytes_follow_writes(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+    loaded = replica.memory_bytes()
+
+    replica.apply(
+        {**relationship_items[0], "CreatedAt": "2024-09-01", "Subject": "Music"}
+    )
+    grown = replica.memory_bytes()
+    replica.discard("S1", "2024-09-01")
+
+    assert grown > loaded
+    assert replica.memory_bytes() < grown
+
+
+def test_writes_during_load_are_replayed(replica, mock_table, relationship_items):
+    def scan(**kwargs):
+        # A delete lands while the scan is still reading the old state
+        replica.discard("S2", "2024-03-01")
+        return {"Items": relationship_items}
+
+    mock_table.scan.side_effect = scan
+
+    replica.load(mock_table)
+
+    assert replica.get("S2", "2024-03-01") is None
+    assert replica.status().item_count == 2
+
+
+def test_freshness_follows_full_load(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+
+    replica._loaded_at -= replica.max_staleness + 1
+
+    assert not replica.is_fresh()
+
+
+def test_search_deduplicates_or_filters(replica, mock_table, relationship_items):
+    mock_table.scan.return_value = {"Items": relationship_items}
+    replica.load(mock_table)
+
+    items = replica.search(
+        [FilterSpec(equals={"StudentId": "S1"}), FilterSpec(equals={"Subject": "Art"})]
+    )
+
+    assert len(items) == 2
+
+
+def test_unloaded_replica_is_stale(replica):
+    status = replica.status()
+
+    assert not replica.is_fresh()
+    assert not status.loaded
+    assert status.staleness_seconds is None
@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pytest
+
+from ..scan import parallel_scan
+
+
+class PagedTable:
+    """Table stub serving pages_per_segment one-item pages for every segment."""
+
+    def __init__(self, pages_per_segment: int, fail_segment: int = -1):
+        self.pages_per_segment = pages_per_segment
+        self.fail_segment = fail_segment
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def scan(self, Segment, TotalSegments, ExclusiveStartKey=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if Segment == self.fail_segment:
+            raise RuntimeError("segment failed")
+        page = 0 if ExclusiveStartKey is None else ExclusiveStartKey["page"] + 1
+        response = {"Items": [{"Segment": Segment, "Page": page}]}
+        if page + 1 < self.pages_per_segment:
+            response["LastEvaluatedKey"] = {"page": page}
+        return response
+
+
+def test_parallel_scan_yields_every_page():
+    table = PagedTable(pages_per_segment=5)
+
+    items = list(parallel_scan(table, 3))
+
+    assert sorted((item["Segment"], item["Page"]) for item in items) == [
+        (segment, page) for segment in range(3) for page in range(5)
+    ]
+
+
+def test_parallel_scan_buffers_a_bounded_number_of_pages():
+    """Test segments stop reading ahead once the page queue is full"""
+    table = PagedTable(pages_per_segment=1000)
+    items = parallel_scan(table, 2, buffer_pages=4)
+
+    next(items)
+    time.sleep(0.3)
+    calls = table.calls
+    items.close()
+
+    # Queued pages, plus one held by each blocked segment and the one consumed
+    assert calls <= 4 + 2 + 1
+
+
+def test_parallel_scan_raises_segment_errors():
+    table = PagedTable(pages_per_segment=1000, fail_segment=1)
+
+    with pytest.raises(RuntimeError, match="segment failed"):
+        list(parallel_scan(table, 2))
@@ -0,0 +1,266 @@
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import Binary
+from botocore.exceptions import ClientError
+
+from ..query_planner import FilterSpec, RangeCondition
+from ..storage import (
+    CompressedStringCodec,
+    TimestampCodec,
+    capacity_report,
+    relationship_storage,
+)
+from ..storage_migration import migrate
+
+ITEM = {
+    "StudentId": "S1",
+    "CreatedAt": "2024-10-08T10:30:00.123456+00:00",
+    "TeacherId": "T1",
+    "Subject": "Math",
+    "StudentName": "Jane Doe",
+}
+
+
+@pytest.mark.parametrize(
+    "value, stored",
+    [
+        ("2024-10-08T10:30:00.123456+00:00", "20241008103000123456"),
+        ("2024-10-08T10:30:00Z", "20241008103000000000Z/0"),
+        ("2024-10-08T12:30:00.5+02:00", "20241008103000500000+0200/1"),
+        ("2024-10-08T01:00:00-05:30", "20241008063000000000-0530/0"),
+        ("2024-05-03T12:34:56", "20240503123456000000N/0"),
+    ],
+)
+def test_timestamp_codec_round_trips(value, stored):
+    codec = TimestampCodec()
+
+    assert codec.encode(value) == stored
+    assert codec.decode(stored) == value
+
+
+@pytest.mark.parametrize(
+    "value, stored",
+    [
+        ("2024-01-01", "20240101000000000000N/0=2024-01-01"),
+        ("2024-10-08 10:30:00Z", "20241008103000000000/0=2024-10-08 10:30:00Z"),
+        ("20241008T103000.5", "20241008103000500000N=20241008T103000.5"),
+    ],
+)
+def test_timestamp_codec_keeps_other_iso_text(value, stored):
+    """Test ISO text outside the packed grammar is packed with its original text"""
+    codec = TimestampCodec()
+
+    assert codec.encode(value) == stored
+    assert codec.decode(stored) == value
+    assert codec.encode("not a timestamp") == "not a timestamp"
+
+
+def test_timestamp_codec_keeps_distinct_values_distinct():
+    """Test different texts of the same instant never pack to the same key"""
+    codec = TimestampCodec()
+    values = [
+        "2024-10-08",
+        "2024-10-08T00:00",
+        "2024-10-08T00:00:00",
+        "2024-10-08 00:00:00",
+        "2024-10-08T00:00:00.000",
+        "2024-10-08T00:00:00.000000",
+        "2024-10-08T00:00:00Z",
+        "2024-10-08T00:00:00+00:00",
+        "2024-10-08T02:00:00+02:00",
+        "20241008",
+        "20241008T000000",
+    ]
+    stored = [codec.encode(value) for value in values]
+
+    assert len(set(stored)) == len(values)
+    assert [codec.decode(value) for value in stored] == values
+    assert len({value[:20] for value in stored}) == 1
+
+
+def test_timestamp_codec_sorts_by_instant():
+    """Test whole seconds sort before fractions of the same second"""
+    codec = TimestampCodec()
+    values = [
+        "2024-10-08T10:30:00.5Z",
+        "2024-10-08T10:30:00Z",
+        "2024-10-08T12:30:00.25+02:00",
+        "2024-10-08T10:30:01",
+    ]
+
+    assert sorted(values, key=codec.encode) == [
+        "2024-10-08T10:30:00Z",
+        "2024-10-08T12:30:00.25+02:00",
+        "2024-10-08T10:30:00.5Z",
+        "2024-10-08T10:30:01",
+    ]
+
+
+def test_timestamp_bounds():
+    """Test range bounds keep the order of the original ISO values"""
+    codec = TimestampCodec()
+
+    assert codec.encode_operand("2024-10", "begins_with") == "202410"
+    assert (
+        codec.encode_operand("2024-10-08T12:30:00+02:00", ">=")
+        == "20241008103000000000"
+    )
+    assert (
+        codec.encode_operand("2024-10-08T12:30:00+02:00", "<=")
+        == "20241008103000000000~"
+    )
+    assert (
+        codec.encode_operand("2024-10-08T10:30:00Z", "=") == "20241008103000000000Z/0"
+    )
+    assert codec.encode_operand("2024-10-07", "<=") < codec.encode(
+        "2024-10-08T00:00:00Z"
+    )
+
+
+def test_compressed_string_codec():
+    codec = CompressedStringCodec(min_bytes=32)
+    long_name = "Professor " * 20
+
+    assert codec.encode("Jane Doe") == "Jane Doe"
+    assert isinstance(codec.encode(long_name), Binary)
+    assert codec.decode(codec.encode(long_name)) == long_name
+
+
+def test_mapped_table_stores_aliases(compact_table):
+    compact_table.put_item(Item=ITEM)
+
+    stored = compact_table.table.get_item(Key={"s": "S1", "c": "20241008103000123456"})
+    key = {"StudentId": "S1", "CreatedAt": ITEM["CreatedAt"]}
+
+    assert stored["Item"] == {
+        "s": "S1",
+        "c": "20241008103000123456",
+        "t": "T1",
+        "sj": "Math",
+        "sn": "Jane Doe",
+    }
+    assert compact_table.get_item(Key=key)["Item"] == ITEM
+    with pytest.raises(ClientError):
+        compact_table.put_item(
+            Item=ITEM, ConditionExpression=Attr("StudentId").not_exists()
+        )
+    assert (
+        compact_table.delete_item(Key=key, ReturnValues="ALL_OLD")["Attributes"] == ITEM
+    )
+
+
+def test_mapped_table_queries(compact_table, planner):
+    """Test planner queries, ranges and pagination work through the mapping"""
+    with compact_table.batch_writer() as batch:
+        for day in range(1, 6):
+            batch.put_item(Item={**ITEM, "CreatedAt": f"2024-10-0{day}T10:00:00+00:00"})
+
+    items, _ = planner.search(
+        compact_table,
+        [
+            FilterSpec(
+                equals={"TeacherId": "T1"},
+                ranges={
+                    "CreatedAt": RangeCondition(gte="2024-10-02", lte="2024-10-04")
+                },
+            )
+        ],
+    )
+    page = compact_table.query(
+        KeyConditionExpression=Key("StudentId").eq("S1"), Limit=2
+    )
+    rest = compact_table.query(
+        KeyConditionExpression=Key("StudentId").eq("S1"),
+        ExclusiveStartKey=page["LastEvaluatedKey"],
+    )
+
+    assert [item["CreatedAt"][:10] for item in items] == ["2024-10-02", "2024-10-03"]
+    assert page["LastEvaluatedKey"]["CreatedAt"] == "2024-10-02T10:00:00+00:00"
+    assert len(page["Items"]) + len(rest["Items"]) == 5
+
+
+BOUNDARY = [
+    "2024-10-08T10:29:59.999999+00:00",
+    "2024-10-08T10:30:00Z",
+    "2024-10-08T12:30:00+02:00",
+    "2024-10-08T10:30:00.000001+00:00",
+]
+
+
+@pytest.mark.parametrize(
+    "condition, expected",
+    [
+        (Key("CreatedAt").lte("2024-10-08T10:30:00+00:00"), BOUNDARY[:3]),
+        (Key("CreatedAt").lt("2024-10-08T10:30:00+00:00"), BOUNDARY[:1]),
+        (Key("CreatedAt").gte("2024-10-08T10:30:00+00:00"), BOUNDARY[1:]),
+        (Key("CreatedAt").gt("2024-10-08T10:30:00+00:00"), BOUNDARY[3:]),
+        (
+            Key("CreatedAt").between("2024-10-08T10:30:00Z", "2024-10-08T10:30:00Z"),
+            BOUNDARY[1:3],
+        ),
+        (
+            Key("CreatedAt").between("2024-10-08T10:00:00Z", "2024-10-08T10:30:00Z"),
+            BOUNDARY[:3],
+        ),
+    ],
+)
+def test_mapped_table_range_boundaries(compact_table, condition, expected):
+    """Test range conditions at the exact instant match the legacy ordering"""
+    for created_at in BOUNDARY:
+        compact_table.put_item(Item={**ITEM, "CreatedAt": created_at})
+
+    items = compact_table.query(
+        KeyConditionExpression=Key("StudentId").eq("S1") & condition
+    )["Items"]
+
+    assert sorted(item["CreatedAt"] for item in items) == sorted(expected)
+
+
+def test_mapped_table_keeps_non_canonical_created_at(compact_table):
+    """Test non-canonical CreatedAt is stored packed and read back unchanged"""
+    key = {"StudentId": "S1", "CreatedAt": "2024-10-08 10:30:00Z"}
+    compact_table.put_item(Item={**ITEM, **key})
+    compact_table.put_item(
+        Item={**ITEM, "StudentId": "S1", "CreatedAt": "2024-10-08T10:30:00+00:00"}
+    )
+
+    assert compact_table.item_count == 2
+    assert compact_table.get_item(Key=key)["Item"]["CreatedAt"] == key["CreatedAt"]
+
+
+def test_migrate(
+    memory_table, compact_table, relationship_items, version_store, version_table
+):
+    versions = {"versions": version_store, "versions_table": version_table}
+    dry_run = migrate(
+        memory_table, compact_table, scan_segments=2, dry_run=True, **versions
+    )
+    assert dry_run.written == 0 and compact_table.item_count == 0
+    assert version_store.stats().bumps == 0
+
+    report = migrate(memory_table, compact_table, scan_segments=2, **versions)
+    assert version_store.stats().bumps == 2
+    again = migrate(
+        memory_table, compact_table, scan_segments=2, created_after="2024-05-01"
+    )
+
+    assert (report.scanned, report.written) == (3, 3)
+    assert report.compact_bytes < report.legacy_bytes
+    assert again.scanned == 1
+    assert compact_table.item_count == 3
+    assert sorted(
+        compact_table.scan()["Items"], key=lambda i: i["CreatedAt"]
+    ) == sorted(relationship_items, key=lambda i: i["CreatedAt"])
+
+
+def test_capacity_report(relationship_items):
+    items = [
+        {**item, "CreatedAt": f"{item['CreatedAt']}T10:00:00+00:00"}
+        for item in relationship_items
+    ]
+
+    report = capacity_report(items, relationship_storage)
+
+    assert report.compact.average_item_bytes < report.legacy.average_item_bytes
+    assert report.item_bytes_saved_percent > 0
+    assert report.legacy.write_units_per_put == 3.0
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock
+
+from common.resilience import HedgedExecutor
+from ..version_store import INITIAL_VERSION, VersionStore
+
+
+def test_missing_marker_is_not_written(version_store, version_table):
+    """Test an unwritten partition reads as the initial version without a write"""
+    assert version_store.current(version_table, "S1") == INITIAL_VERSION
+    version_store.clear()
+
+    assert version_store.current(version_table, "S1") == INITIAL_VERSION
+    assert "Item" not in version_table.get_item(Key={"StudentId": "S1"})
+
+
+def test_bump_changes_version(version_store, version_table):
+    """Test every write produces a new marker visible to readers"""
+    before = version_store.current(version_table, "S1")
+    after = version_store.bump(version_table, "S1")
+
+    assert before == INITIAL_VERSION
+    assert after != before
+    assert version_store.current(version_table, "S1") == after
+
+
+def test_cached_version_skips_dynamodb(version_store):
+    """Test a cached marker is served without a GetItem"""
+    table = MagicMock()
+    table.get_item.return_value = {"Item": {"StudentId": "S1", "Version": "v1"}}
+
+    version_store.current(table, "S1")
+    version_store.current(table, "S1")
+
+    assert table.get_item.call_count == 1
+    assert version_store.stats().hits == 1
+
+
+def test_expired_version_is_reread(version_table):
+    """Test markers written by other processes are seen after the cache expires"""
+    store = VersionStore(
+        hash_key="StudentId", cache_seconds=0, executor=HedgedExecutor()
+    )
+    other = VersionStore(
+        hash_key="StudentId", cache_seconds=0, executor=HedgedExecutor()
+    )
+    store.current(version_table, "S1")
+
+    bumped = other.bump(version_table, "S1")
+
+    assert store.current(version_table, "S1") == bumped
+
+
+def test_cache_is_bounded(version_table):
+    """Test the least recently used markers are evicted"""
+    store = VersionStore(
+        hash_key="StudentId", cache_seconds=60, max_entries=2, executor=HedgedExecutor()
+    )
+    for student_id in ("S1", "S2", "S3"):
+        store.current(version_table, student_id)
+
+    assert store.stats().cached == 2
+
+
+def test_bump_many_changes_every_version(version_store, version_table):
+    """Test bulk writers give each distinct partition one new marker"""
+    before = version_store.current(version_table, "S1")
+
+    count = version_store.bump_many(version_table, ["S1", "S2", "S1"])
+    version_store.clear()
+
+    assert count == 2
+    assert version_store.current(version_table, "S1") != before
+    assert version_store.current(version_table, "S2") != INITIAL_VERSION
@@ -0,0 +1,131 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from common.config import settings
+from common.resilience import HedgedExecutor, dynamodb_read_executor
+from common.tracing import traced
+
+
+# Version of a partition that has never been written; bump() never produces it
+INITIAL_VERSION = "0"
+
+
+class VersionStoreStats(BaseModel):
+    cached: int
+    hits: int
+    misses: int
+    bumps: int
+
+
+class VersionStore:
+    """
+    Opaque per-partition version markers used to build ETags.
+
+    Writers call bump() after changing a partition, which stores a fresh
+    random marker, so any change yields a new ETag. A partition that was
+    never written has no marker and reads as INITIAL_VERSION, so reads
+    never write. Readers call current(), served from a small local
+    cache for cache_seconds; a cached marker lets an unchanged poll be
+    answered without touching DynamoDB. Writes from other processes become
+    visible once the cached entry expires.
+    """
+
+    def __init__(
+        self,
+        hash_key: str,
+        cache_seconds: float = 2.0,
+        max_entries: int = 10000,
+        executor: HedgedExecutor = dynamodb_read_executor,
+    ):
+        self.hash_key = hash_key
+        self.cache_seconds = cache_seconds
+        self.max_entries = max_entries
+        self.executor = executor
+        self._cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bumps = 0
+
+    def _cached(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def _remember(self, key: str, version: str) -> None:
+        with self._lock:
+            self._cache[key] = (version, time.monotonic() + self.cache_seconds)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    @traced("VersionStore.current")
+    def current(self, table: Any, key: str) -> str:
+        """Return the partition's version marker, INITIAL_VERSION if it has none."""
+        version = self._cached(key)
+        if version is not None:
+            return version
+
+        response = self.executor.call(
+            "GetItem", table.get_item, Key={self.hash_key: key}, ConsistentRead=True
+        )
+        version = response.get("Item", {}).get("Version", INITIAL_VERSION)
+        self._remember(key, version)
+        return version
+
+    @traced("VersionStore.bump")
+    def bump(self, table: Any, key: str) -> str:
+        """Record a change to the partition. Call after the data write succeeds."""
+        version = uuid.uuid4().hex
+        table.put_item(Item={self.hash_key: key, "Version": version})
+        self._remember(key, version)
+        with self._lock:
+            self._bumps += 1
+        return version
+
+    def bump_many(self, table: Any, keys: Iterable[str]) -> int:
+        """
+        Record changes to many partitions in one batch, for bulk writers that
+        bypass the service (seeding, storage migration). Returns the count.
+        """
+        count = 0
+        with table.batch_writer(overwrite_by_pkeys=[self.hash_key]) as batch:
+            for key in set(keys):
+                version = uuid.uuid4().hex
+                batch.put_item(Item={self.hash_key: key, "Version": version})
+                self._remember(key, version)
+                count += 1
+        with self._lock:
+            self._bumps += count
+        return count
+
+    def stats(self) -> VersionStoreStats:
+        with self._lock:
+            return VersionStoreStats(
+                cached=len(self._cache),
+                hits=self._hits,
+                misses=self._misses,
+                bumps=self._bumps,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+# Module-level singleton so cached markers outlive a single request
+relationship_version_store = VersionStore(
+    hash_key="StudentId",
+    cache_seconds=settings.RELATIONSHIP_VERSION_CACHE_SECONDS,
+    max_entries=settings.RELATIONSHIP_VERSION_CACHE_SIZE,
+)
@@ -0,0 +1,15 @@
+from .memory import (
+    MemoryDiagnostics,
+    MemoryStatus,
+    SnapshotDiff,
+    memory_diagnostics,
+)
+from .middleware import MemoryAccountingMiddleware
+
+__all__ = [
+    "MemoryDiagnostics",
+    "MemoryStatus",
+    "SnapshotDiff",
+    "memory_diagnostics",
+    "MemoryAccountingMiddleware",
+]
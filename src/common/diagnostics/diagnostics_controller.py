@@ -0,0 +1,107 @@
+import gc
+import hmac
+from typing import Dict, Literal, Optional
+from fastapi import APIRouter, Depends, Header, Query, status
+
+from common.config import settings
+from common.exceptions import NotFoundError
+from .memory import MemoryStatus, SnapshotDiff, memory_diagnostics
+
+
+def require_diagnostics_access(
+    x_diagnostics_token: Optional[str] = Header(default=None),
+) -> None:
+    """
+    Allow access in DEBUG or with the configured X-Diagnostics-Token.
+
+    Raises:
+        NotFoundError: Otherwise, so the endpoints are not discoverable
+    """
+    if settings.DEBUG:
+        return
+    token = settings.DIAGNOSTICS_TOKEN
+    if (
+        token
+        and x_diagnostics_token
+        and hmac.compare_digest(x_diagnostics_token, token)
+    ):
+        return
+    raise NotFoundError("Resource")
+
+
+router = APIRouter(
+    prefix="/diagnostics/memory",
+    tags=["diagnostics"],
+    dependencies=[Depends(require_diagnostics_access)],
+)
+
+
+@router.get(
+    "",
+    summary="Report RSS, garbage collector and allocation tracing status with per-route peaks",
+    response_description="Return the memory status; top_types also counts live objects by type",
+    status_code=status.HTTP_200_OK,
+    response_model=MemoryStatus,
+)
+def get_memory_status(top_types: int = Query(default=0, ge=0, le=100)):
+    return memory_diagnostics.status(top_types)
+
+
+@router.post(
+    "/tracing/start",
+    summary="Start tracemalloc allocation tracing (slows allocations while on)",
+    status_code=status.HTTP_200_OK,
+    response_model=MemoryStatus,
+)
+def start_tracing(
+    frames: int = Query(default=settings.DIAGNOSTICS_TRACEMALLOC_FRAMES, ge=1, le=100),
+):
+    memory_diagnostics.start(frames)
+    return memory_diagnostics.status()
+
+
+@router.post(
+    "/tracing/stop",
+    summary="Stop allocation tracing and drop all snapshots",
+    status_code=status.HTTP_200_OK,
+    response_model=MemoryStatus,
+)
+def stop_tracing():
+    memory_diagnostics.stop()
+    return memory_diagnostics.status()
+
+
+@router.post(
+    "/snapshots",
+    summary="Take an allocation snapshot to diff against later",
+    response_description="Return the snapshot id",
+    status_code=status.HTTP_201_CREATED,
+)
+def take_snapshot() -> Dict[str, str]:
+    return {"snapshot_id": memory_diagnostics.take_snapshot()}
+
+
+@router.get(
+    "/snapshots/diff",
+    summary="Diff two snapshots by file, line or traceback",
+    response_description="Return the allocations that grew the most from base to target",
+    status_code=status.HTTP_200_OK,
+    response_model=SnapshotDiff,
+)
+def diff_snapshots(
+    base: str,
+    target: str,
+    group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+    limit: int = Query(default=20, ge=1, le=200),
+):
+    return memory_diagnostics.diff(base, target, group_by=group_by, limit=limit)
+
+
+@router.post(
+    "/gc",
+    summary="Run a full garbage collection, e.g. before a snapshot",
+    response_description="Return the number of unreachable objects found",
+    status_code=status.HTTP_200_OK,
+)
+def collect_garbage() -> Dict[str, int]:
+    return {"collected": gc.collect()}
@@ -0,0 +1,264 @@
+import gc
+import itertools
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel
+
+from common.config import settings
+from common.exceptions import NotFoundError, ValidationError
+
+STATM_PATH = "/proc/self/statm"
+
+# Allocations made by the diagnostics themselves or by imports are noise
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class GcGeneration(BaseModel):
+    collections: int
+    collected: int
+    uncollectable: int
+
+
+class GcStatus(BaseModel):
+    enabled: bool
+    counts: List[int]
+    generations: List[GcGeneration]
+    garbage: int
+    top_types: Optional[Dict[str, int]] = None
+
+
+class RouteMemoryStats(BaseModel):
+    requests: int
+    # Requests that overlapped others, so their peak and retained bytes are unknown
+    overlapped: int = 0
+    peak_bytes_max: int
+    peak_bytes_mean: float
+    retained_bytes_total: int
+
+
+class MemoryStatus(BaseModel):
+    rss_bytes: Optional[int] = None
+    peak_rss_bytes: int
+    tracing: bool
+    traced_current_bytes: int
+    traced_peak_bytes: int
+    snapshots: List[str]
+    gc: GcStatus
+    routes: Dict[str, RouteMemoryStats]
+
+
+class AllocationDiff(BaseModel):
+    location: str
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+class SnapshotDiff(BaseModel):
+    base: str
+    target: str
+    group_by: str
+    total_diff_bytes: int
+    top: List[AllocationDiff]
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, read from /proc on Linux."""
+    try:
+        with open(STATM_PATH) as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def gc_status(top_types: int = 0) -> GcStatus:
+    """Collector counters; top_types > 0 also counts live objects by type (slow)."""
+    types = None
+    if top_types > 0:
+        counts = Counter(type(obj).__qualname__ for obj in gc.get_objects())
+        types = dict(counts.most_common(top_types))
+    return GcStatus(
+        enabled=gc.isenabled(),
+        counts=list(gc.get_count()),
+        generations=[GcGeneration(**stats) for stats in gc.get_stats()],
+        garbage=len(gc.garbage),
+        top_types=types,
+    )
+
+
+# Key for requests that matched no route, so scanned paths cannot grow the table
+UNMATCHED_ROUTE = "unmatched"
+
+
+class _RouteCounter:
+    __slots__ = ("requests", "overlapped", "peak_max", "peak_total", "retained_total")
+
+    def __init__(self):
+        self.requests = 0
+        self.overlapped = 0
+        self.peak_max = 0
+        self.peak_total = 0
+        self.retained_total = 0
+
+
+class MemoryDiagnostics:
+    """
+    Allocation tracing, snapshot diffs and per-route memory accounting.
+
+    Tracing is off until start() is called; tracemalloc slows allocations
+    noticeably, so it is meant to be switched on for a window, snapshots
+    taken, then switched off. While tracing, each request's peak traced
+    memory above its starting point and the memory it left behind are
+    recorded against its route. tracemalloc keeps one process-wide peak
+    that every request resets on entry, so a request that overlapped
+    others would see their allocations too; such requests are only counted
+    as overlapped. Requests that matched no route share the UNMATCHED_ROUTE
+    key.
+    """
+
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, tracemalloc.Snapshot]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._routes: Dict[str, _RouteCounter] = {}
+        self._lock = threading.Lock()
+
+    def start(self, frames: int = 10) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """Stop tracing and drop every snapshot, releasing tracemalloc's memory."""
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def take_snapshot(self) -> str:
+        """
+        Record the current allocations and return the snapshot id.
+
+        Raises:
+            ValidationError: If tracing has not been started
+        """
+        if not tracemalloc.is_tracing():
+            raise ValidationError(
+                field="tracing", message="allocation tracing is not started"
+            )
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        snapshot_id = f"s{next(self._ids)}"
+        with self._lock:
+            self._snapshots[snapshot_id] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def _snapshot(self, snapshot_id: str) -> tracemalloc.Snapshot:
+        with self._lock:
+            snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise NotFoundError(f"Snapshot {snapshot_id}")
+        return snapshot
+
+    def diff(
+        self,
+        base: str,
+        target: str,
+        group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+        limit: int = 20,
+    ) -> SnapshotDiff:
+        """
+        Allocation growth from base to target, largest first.
+
+        Raises:
+            NotFoundError: If either snapshot id is unknown or was evicted
+        """
+        stats = self._snapshot(target).compare_to(self._snapshot(base), group_by)
+        top = [
+            AllocationDiff(
+                location=" <- ".join(
+                    f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+                ),
+                size_bytes=stat.size,
+                size_diff_bytes=stat.size_diff,
+                count=stat.count,
+                count_diff=stat.count_diff,
+            )
+            for stat in stats[:limit]
+        ]
+        return SnapshotDiff(
+            base=base,
+            target=target,
+            group_by=group_by,
+            total_diff_bytes=sum(stat.size_diff for stat in stats),
+            top=top,
+        )
+
+    def _counter(self, route: str) -> _RouteCounter:
+        counter = self._routes.get(route)
+        if counter is None:
+            counter = self._routes[route] = _RouteCounter()
+        return counter
+
+    def record_request(self, route: str, peak_bytes: int, retained_bytes: int) -> None:
+        with self._lock:
+            counter = self._counter(route)
+            counter.requests += 1
+            counter.peak_max = max(counter.peak_max, peak_bytes)
+            counter.peak_total += peak_bytes
+            counter.retained_total += retained_bytes
+
+    def record_overlapped(self, route: str) -> None:
+        with self._lock:
+            self._counter(route).overlapped += 1
+
+    def routes(self) -> Dict[str, RouteMemoryStats]:
+        with self._lock:
+            return {
+                route: RouteMemoryStats(
+                    requests=counter.requests,
+                    overlapped=counter.overlapped,
+                    peak_bytes_max=counter.peak_max,
+                    peak_bytes_mean=round(
+                        counter.peak_total / max(counter.requests, 1), 1
+                    ),
+                    retained_bytes_total=counter.retained_total,
+                )
+                for route, counter in self._routes.items()
+            }
+
+    def status(self, top_types: int = 0) -> MemoryStatus:
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshots = list(self._snapshots)
+        return MemoryStatus(
+            rss_bytes=rss_bytes(),
+            peak_rss_bytes=peak_rss_bytes(),
+            tracing=tracemalloc.is_tracing(),
+            traced_current_bytes=current,
+            traced_peak_bytes=peak,
+            snapshots=snapshots,
+            gc=gc_status(top_types),
+            routes=self.routes(),
+        )
+
+
+# Module-level singleton instance
+memory_diagnostics = MemoryDiagnostics(max_snapshots=settings.DIAGNOSTICS_MAX_SNAPSHOTS)
@@ -0,0 +1,49 @@
+import tracemalloc
+from typing import Any
+
+from .memory import UNMATCHED_ROUTE, MemoryDiagnostics, memory_diagnostics
+
+
+class MemoryAccountingMiddleware:
+    """
+    ASGI middleware attributing traced allocations to routes.
+
+    Costs a single is_tracing() check per request until allocation tracing
+    is started through the diagnostics endpoints. tracemalloc has one
+    process-wide peak, so only requests that ran alone on the worker are
+    measured; the others are counted as overlapped.
+    """
+
+    def __init__(self, app: Any, diagnostics: MemoryDiagnostics = memory_diagnostics):
+        self.app = app
+        self.diagnostics = diagnostics
+        # Traced requests in flight and started so far; only touched on the event loop
+        self._in_flight = 0
+        self._started = 0
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            await self.app(scope, receive, send)
+            return
+
+        alone = self._in_flight == 0
+        self._in_flight += 1
+        self._started += 1
+        started = self._started
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+            # Tracing may have been stopped by this very request
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                path = getattr(scope.get("route"), "path", None)
+                route = UNMATCHED_ROUTE if path is None else f"{scope['method']} {path}"
+                if alone and self._started == started:
+                    self.diagnostics.record_request(
+                        route, max(peak - start, 0), current - start
+                    )
+                else:
+                    self.diagnostics.record_overlapped(route)
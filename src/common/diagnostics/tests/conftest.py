@@ -0,0 +1,46 @@
+"""
+Test configuration for memory diagnostics
+"""
+
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.config import settings
+from .. import diagnostics_controller
+from ..memory import MemoryDiagnostics
+from ..middleware import MemoryAccountingMiddleware
+
+TOKEN = "diagnostics-token"
+
+# Module-level so allocations survive the request, like a leak would
+leaked = []
+
+
+@pytest.fixture
+def diagnostics(monkeypatch):
+    """Fixture for a fresh diagnostics instance used by the routes."""
+    instance = MemoryDiagnostics(max_snapshots=2)
+    monkeypatch.setattr(diagnostics_controller, "memory_diagnostics", instance)
+    yield instance
+    tracemalloc.stop()
+    leaked.clear()
+
+
+@pytest.fixture
+def diagnostics_client(diagnostics, monkeypatch):
+    """Fixture for an app exposing the diagnostics routes behind a token."""
+    monkeypatch.setattr(settings, "DEBUG", False)
+    monkeypatch.setattr(settings, "DIAGNOSTICS_TOKEN", TOKEN)
+    app = FastAPI()
+
+    @app.get("/leak")
+    def leak():
+        leaked.append(bytearray(256 * 1024))
+        return {"leaked": len(leaked)}
+
+    app.include_router(diagnostics_controller.router)
+    app.add_middleware(MemoryAccountingMiddleware, diagnostics=diagnostics)
+    return TestClient(app, headers={"X-Diagnostics-Token": TOKEN})
@@ -0,0 +1,117 @@
+import asyncio
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ..memory import UNMATCHED_ROUTE
+from ..middleware import MemoryAccountingMiddleware
+from .conftest import TOKEN
+
+
+def test_requires_token(diagnostics_client):
+    """Test the endpoints are hidden without the diagnostics token"""
+    anonymous = TestClient(diagnostics_client.app)
+
+    assert anonymous.get("/diagnostics/memory").status_code == 404
+    wrong = anonymous.get(
+        "/diagnostics/memory", headers={"X-Diagnostics-Token": TOKEN[:-1]}
+    )
+    assert wrong.status_code == 404
+    assert diagnostics_client.get("/diagnostics/memory").status_code == 200
+
+
+def test_status_reports_rss_and_gc(diagnostics_client):
+    response = diagnostics_client.get("/diagnostics/memory", params={"top_types": 5})
+
+    body = response.json()
+    assert body["rss_bytes"] > 0
+    assert body["tracing"] is False
+    assert len(body["gc"]["generations"]) == 3
+    assert len(body["gc"]["top_types"]) == 5
+
+
+def test_snapshot_diff_finds_leak(diagnostics_client):
+    """Test a diff between snapshots points at the leaking line"""
+    diagnostics_client.post("/diagnostics/memory/tracing/start")
+    base = diagnostics_client.post("/diagnostics/memory/snapshots").json()[
+        "snapshot_id"
+    ]
+    for _ in range(4):
+        diagnostics_client.get("/leak")
+    target = diagnostics_client.post("/diagnostics/memory/snapshots").json()[
+        "snapshot_id"
+    ]
+
+    diff = diagnostics_client.get(
+        "/diagnostics/memory/snapshots/diff", params={"base": base, "target": target}
+    ).json()
+
+    assert "conftest.py" in diff["top"][0]["location"]
+    assert diff["top"][0]["size_diff_bytes"] >= 4 * 256 * 1024
+
+
+def test_routes_record_retained_memory(diagnostics_client):
+    """Test allocations left behind are attributed to the route"""
+    diagnostics_client.post("/diagnostics/memory/tracing/start")
+    diagnostics_client.get("/leak")
+    diagnostics_client.get("/leak")
+
+    routes = diagnostics_client.get("/diagnostics/memory").json()["routes"]
+
+    assert routes["GET /leak"]["requests"] == 2
+    assert routes["GET /leak"]["peak_bytes_max"] >= 256 * 1024
+    assert routes["GET /leak"]["retained_bytes_total"] >= 2 * 256 * 1024
+
+
+def test_unmatched_paths_share_one_key(diagnostics_client):
+    """Test requests for unknown paths do not add a key per path"""
+    diagnostics_client.post("/diagnostics/memory/tracing/start")
+    diagnostics_client.get("/missing/1")
+    diagnostics_client.post("/missing/2")
+
+    routes = diagnostics_client.get("/diagnostics/memory").json()["routes"]
+
+    assert routes[UNMATCHED_ROUTE]["requests"] == 2
+    assert not any(route.endswith(("/missing/1", "/missing/2")) for route in routes)
+
+
+@pytest.mark.asyncio
+async def test_overlapping_requests_are_not_measured(diagnostics):
+    """Test requests sharing the process-wide peak are only counted"""
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+
+    middleware = MemoryAccountingMiddleware(app, diagnostics=diagnostics)
+    diagnostics.start()
+
+    def request(path):
+        return middleware({"type": "http", "method": "GET", "path": path}, None, None)
+
+    slow = asyncio.ensure_future(request("/slow"))
+    await asyncio.sleep(0)
+    await request("/fast")
+    release.set()
+    await slow
+    await request("/fast")
+    tracemalloc.stop()
+
+    stats = diagnostics.routes()[UNMATCHED_ROUTE]
+    assert (stats.requests, stats.overlapped) == (1, 2)
+
+
+def test_snapshot_requires_tracing(diagnostics_client):
+    assert diagnostics_client.post("/diagnostics/memory/snapshots").status_code == 400
+
+
+def test_unknown_snapshot(diagnostics_client):
+    diagnostics_client.post("/diagnostics/memory/tracing/start")
+
+    response = diagnostics_client.get(
+        "/diagnostics/memory/snapshots/diff", params={"base": "s1", "target": "s9"}
+    )
+
+    assert response.status_code == 404
@@ -2,7 +2,18 @@ from .exceptions_config import (
     CustomError,
     NotFoundError,
     ValidationError,
+    ConflictError,
+    ArchivedError,
     InternalServiceError,
+    DeadlineExceededError,
 )
 
-__all__ = ["CustomError", "NotFoundError", "ValidationError", "InternalServiceError"]
+__all__ = [
+    "CustomError",
+    "NotFoundError",
+    "ValidationError",
+    "ConflictError",
+    "ArchivedError",
+    "InternalServiceError",
+    "DeadlineExceededError",
+]
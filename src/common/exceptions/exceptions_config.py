@@ -18,6 +18,21 @@ class ValidationError(CustomError):
         )
 
 
+class ConflictError(CustomError):
+    def __init__(self, item: str):
+        super().__init__(status_code=409, detail=f"{item} already exists.")
+
+
+class ArchivedError(CustomError):
+    def __init__(self, item: str):
+        super().__init__(status_code=409, detail=f"{item} is archived and read-only.")
+
+
 class InternalServiceError(CustomError):
     def __init__(self, message: str = "An internal server error occurred."):
         super().__init__(status_code=500, detail=message)
+
+
+class DeadlineExceededError(CustomError):
+    def __init__(self, message: str = "Request deadline exceeded."):
+        super().__init__(status_code=504, detail=message)
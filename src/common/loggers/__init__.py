@@ -1,6 +1,7 @@
 import logging
 
 from .logging_config import Logger
+from .sampling import LogLimiter, LogLimiterStats, log_limiter
 
 # Set the custom logger class as the default logger class
 logging.setLoggerClass(Logger)
@@ -9,4 +10,21 @@ logging.setLoggerClass(Logger)
 logger = logging.getLogger("app")
 strands_logger = logging.getLogger("strands")
 
-__all__ = ["logger", "strands_logger"]
+
+def flush_logs() -> None:
+    """Flush every handler of the application loggers, e.g. before a worker exits."""
+    log_limiter.flush(logger)
+    for item in logging.Logger.manager.loggerDict.values():
+        if isinstance(item, logging.Logger):
+            for handler in item.handlers:
+                handler.flush()
+
+
+__all__ = [
+    "logger",
+    "strands_logger",
+    "flush_logs",
+    "LogLimiter",
+    "LogLimiterStats",
+    "log_limiter",
+]
@@ -3,6 +3,8 @@ import json
 from enum import Enum
 
 from ..config import settings
+from ..tracing.context import current_trace_ids
+from .sampling import log_limiter
 
 
 class LogFormat(Enum):
@@ -38,6 +40,9 @@ class JsonFormatter(logging.Formatter):
             "level": record.levelname,
             "message": record.getMessage(),
         }
+        trace_ids = current_trace_ids()
+        if trace_ids is not None:
+            log_entry["trace_id"], log_entry["span_id"] = trace_ids
         return color + json.dumps(log_entry) + LogFormat.RESET.value
 
 
@@ -53,6 +58,9 @@ class Logger(logging.Logger):
 
         self.propagate = False
 
+        # Sample and rate limit high-volume records before they are formatted
+        self.addFilter(log_limiter)
+
         # Create a console handler
         handler = logging.StreamHandler()
 
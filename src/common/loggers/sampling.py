@@ -0,0 +1,197 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ..config import settings
+
+# Pass log_key in extra to group records across call sites, e.g.
+# logger.info("...", extra={"log_key": "health.check"})
+LOG_KEY_ATTRIBUTE = "log_key"
+SUMMARY_KEY = "logging.suppressed"
+# Suppressed counts of keys beyond max_keys are added up under this key
+OTHER_KEY = "other"
+
+
+class LogLimiterStats(BaseModel):
+    allowed: int
+    suppressed: int
+    suppressed_by_key: Dict[str, int]
+
+
+def _key_name(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        name, pathname, lineno = key
+        return f"{name}:{os.path.basename(pathname)}:{lineno}"
+    return str(key)
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class LogLimiter(logging.Filter):
+    """
+    Logger filter that samples and rate limits records below exempt_level.
+
+    Records are grouped by their log_key extra, or by call site when none
+    is given. Limits are looked up by log key first, then by logger name:
+    sample_rates keeps that fraction of records at random, rate_limits
+    allows a burst of one second's worth and then that many records per
+    second. default_rate_limit applies to every other key; 0 disables it.
+    Suppressed records are counted, and a summary of them is logged at
+    WARNING at most every summary_seconds, on the next record or flush.
+    A suppressed record is dropped before any handler formats it, so pass
+    arguments lazily (logger.info("x %s", y)) for the cost to stay flat.
+
+    At most max_keys token buckets are kept; the least recently used is
+    dropped first, which only refills its burst early. Suppressed counts
+    are kept for at most max_keys keys as well, the rest under OTHER_KEY.
+    """
+
+    def __init__(
+        self,
+        sample_rates: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        default_rate_limit: float = 0.0,
+        exempt_level: int = logging.ERROR,
+        summary_seconds: float = 60.0,
+        max_keys: int = 1000,
+    ):
+        super().__init__()
+        self.sample_rates = dict(sample_rates or {})
+        self.rate_limits = dict(rate_limits or {})
+        self.default_rate_limit = default_rate_limit
+        self.exempt_level = exempt_level
+        self.summary_seconds = summary_seconds
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, _Bucket]" = OrderedDict()
+        self._suppressed: Counter = Counter()
+        self._suppressed_total: Counter = Counter()
+        self._allowed = 0
+        self._next_summary = time.monotonic() + summary_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return bool(self.sample_rates or self.rate_limits or self.default_rate_limit)
+
+    @staticmethod
+    def _lookup(
+        limits: Dict[str, float], log_key: Optional[str], name: str, default: float
+    ) -> float:
+        if log_key is not None and log_key in limits:
+            return limits[log_key]
+        return limits.get(name, default)
+
+    def _limits(self, record: logging.LogRecord) -> Tuple[Hashable, float, float]:
+        log_key = getattr(record, LOG_KEY_ATTRIBUTE, None)
+        key = log_key or (record.name, record.pathname, record.lineno)
+        sample_rate = self._lookup(self.sample_rates, log_key, record.name, 1.0)
+        rate_limit = self._lookup(
+            self.rate_limits, log_key, record.name, self.default_rate_limit
+        )
+        return key, sample_rate, rate_limit
+
+    def _take(self, key: Hashable, rate: float, now: float) -> bool:
+        bucket = self._buckets.get(key)
+        burst = max(rate, 1.0)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(burst, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+        if bucket.tokens < 1.0:
+            return False
+        bucket.tokens -= 1.0
+        return True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level or not self.active:
+            return True
+        if getattr(record, LOG_KEY_ATTRIBUTE, None) == SUMMARY_KEY:
+            return True
+
+        key, sample_rate, rate_limit = self._limits(record)
+        now = time.monotonic()
+        with self._lock:
+            allowed = sample_rate >= 1.0 or random.random() < sample_rate
+            if allowed and rate_limit > 0:
+                allowed = self._take(key, rate_limit, now)
+            if allowed:
+                self._allowed += 1
+            else:
+                self._count(self._suppressed, key)
+                self._count(self._suppressed_total, key)
+            summary = self._pop_summary(now)
+
+        if summary:
+            logging.getLogger(record.name).warning(
+                "Suppressed %d log records in the last %.0fs: %s",
+                sum(summary.values()),
+                self.summary_seconds,
+                summary,
+                extra={LOG_KEY_ATTRIBUTE: SUMMARY_KEY},
+            )
+        return allowed
+
+    def _count(self, counts: Counter, key: Hashable) -> None:
+        if key not in counts and len(counts) >= self.max_keys:
+            key = OTHER_KEY
+        counts[key] += 1
+
+    def _pop_summary(self, now: float, force: bool = False) -> Dict[str, int]:
+        if not force and now < self._next_summary:
+            return {}
+        self._next_summary = now + self.summary_seconds
+        summary = {
+            _key_name(key): count for key, count in self._suppressed.most_common()
+        }
+        self._suppressed.clear()
+        return summary
+
+    def flush(self, logger: logging.Logger) -> None:
+        """Log the pending summary now, e.g. before the worker exits."""
+        with self._lock:
+            summary = self._pop_summary(time.monotonic(), force=True)
+        if summary:
+            logger.warning(
+                "Suppressed %d log records: %s",
+                sum(summary.values()),
+                summary,
+                extra={LOG_KEY_ATTRIBUTE: SUMMARY_KEY},
+            )
+
+    def stats(self) -> LogLimiterStats:
+        with self._lock:
+            return LogLimiterStats(
+                allowed=self._allowed,
+                suppressed=sum(self._suppressed_total.values()),
+                suppressed_by_key={
+                    _key_name(key): count
+                    for key, count in self._suppressed_total.most_common()
+                },
+            )
+
+
+# Module-level singleton instance shared by every application logger
+log_limiter = LogLimiter(
+    sample_rates=settings.LOG_SAMPLE_RATES,
+    rate_limits=settings.LOG_RATE_LIMITS,
+    default_rate_limit=settings.LOG_DEFAULT_RATE_LIMIT,
+    exempt_level=logging.getLevelName(settings.LOG_LIMIT_EXEMPT_LEVEL),
+    summary_seconds=settings.LOG_SUPPRESSED_SUMMARY_SECONDS,
+    max_keys=settings.LOG_LIMIT_MAX_KEYS,
+)
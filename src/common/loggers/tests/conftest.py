@@ -0,0 +1,64 @@
+"""
+Test configuration for log sampling and rate limiting
+"""
+
+import logging
+
+import pytest
+
+from .. import sampling
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.format(record)
+        self.records.append(record)
+
+    def messages(self):
+        return [record.getMessage() for record in self.records]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fixture for a manually advanced monotonic clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(sampling.time, "monotonic", fake.monotonic)
+    return fake
+
+
+@pytest.fixture
+def limited_logger(clock):
+    """Factory attaching a LogLimiter to a fresh logger with a recording handler."""
+    loggers = []
+
+    def build(**kwargs):
+        limiter = sampling.LogLimiter(summary_seconds=60.0, **kwargs)
+        log = logging.getLogger(f"limited.{len(loggers)}")
+        # Drop the console handler and shared limiter the app Logger class adds
+        log.handlers.clear()
+        log.filters.clear()
+        log.setLevel(logging.DEBUG)
+        log.propagate = False
+        handler = RecordingHandler()
+        log.addHandler(handler)
+        log.addFilter(limiter)
+        loggers.append((log, handler, limiter))
+        return log, handler, limiter
+
+    yield build
+    for log, handler, limiter in loggers:
+        log.removeHandler(handler)
+        log.removeFilter(limiter)
+        logging.Logger.manager.loggerDict.pop(log.name, None)
@@ -0,0 +1,136 @@
+import logging
+
+from ..sampling import LogLimiter
+
+
+def test_inactive_limiter_allows_everything(limited_logger):
+    log, handler, _ = limited_logger()
+
+    for i in range(100):
+        log.info("message %d", i)
+
+    assert len(handler.records) == 100
+
+
+def test_rate_limit_per_key(limited_logger, clock):
+    """Test each log key gets its own budget of records per second"""
+    log, handler, limiter = limited_logger(rate_limits={"health.check": 2.0})
+
+    for _ in range(10):
+        log.info("probe", extra={"log_key": "health.check"})
+        log.info("request")
+
+    assert handler.messages().count("probe") == 2
+    assert handler.messages().count("request") == 10
+    assert limiter.stats().suppressed_by_key == {"health.check": 8}
+
+    clock.now += 1.0
+    log.info("probe", extra={"log_key": "health.check"})
+    assert handler.messages().count("probe") == 3
+
+
+def test_rate_limit_per_logger_keys_by_call_site(limited_logger):
+    """Test a logger-wide limit is applied to each call site separately"""
+    log, handler, limiter = limited_logger()
+    limiter.rate_limits[log.name] = 1.0
+
+    for _ in range(5):
+        log.info("first")
+        log.info("second")
+
+    assert handler.messages() == ["first", "second"]
+    assert limiter.stats().suppressed == 8
+    assert all(
+        key.startswith(f"{log.name}:sampling_test.py:")
+        for key in limiter.stats().suppressed_by_key
+    )
+
+
+def test_sampling(limited_logger, monkeypatch):
+    log, handler, limiter = limited_logger(sample_rates={"s3.read_file": 0.25})
+    draws = iter([0.1, 0.5, 0.9, 0.2])
+    monkeypatch.setattr("common.loggers.sampling.random.random", lambda: next(draws))
+
+    for _ in range(4):
+        log.info("read", extra={"log_key": "s3.read_file"})
+
+    assert len(handler.records) == 2
+    assert limiter.stats().suppressed == 2
+
+
+def test_errors_are_exempt(limited_logger):
+    log, handler, _ = limited_logger(default_rate_limit=1.0)
+
+    for _ in range(5):
+        log.error("failure")
+
+    assert len(handler.records) == 5
+
+
+def test_periodic_summary(limited_logger, clock):
+    """Test suppressed counts are logged once the summary interval passes"""
+    log, handler, _ = limited_logger(rate_limits={"health.check": 1.0})
+    for _ in range(4):
+        log.info("probe", extra={"log_key": "health.check"})
+
+    clock.now += 61
+    log.info("probe", extra={"log_key": "health.check"})
+
+    summary = handler.records[1]
+    assert summary.levelno == logging.WARNING
+    assert (
+        summary.getMessage()
+        == "Suppressed 3 log records in the last 60s: {'health.check': 3}"
+    )
+    assert handler.messages()[2] == "probe"
+
+
+def test_flush_logs_pending_summary(limited_logger):
+    log, handler, limiter = limited_logger(default_rate_limit=1.0)
+    for _ in range(2):
+        log.info("burst")
+
+    limiter.flush(log)
+    limiter.flush(log)
+
+    assert handler.messages()[-1].startswith("Suppressed 1 log records: ")
+    assert len(handler.records) == 2
+
+
+def test_suppressed_records_are_not_formatted(limited_logger):
+    """Test dropped records never have their arguments rendered"""
+    log, _, _ = limited_logger(rate_limits={"hot": 1.0})
+
+    class Expensive:
+        rendered = 0
+
+        def __str__(self):
+            Expensive.rendered += 1
+            return "expensive"
+
+    for _ in range(50):
+        log.info("value %s", Expensive(), extra={"log_key": "hot"})
+
+    assert Expensive.rendered == 1
+
+
+def test_default_limiter_settings():
+    limiter = LogLimiter(rate_limits={"health.check": 1.0})
+
+    assert limiter.active
+    assert not LogLimiter().active
+
+
+def test_keys_are_bounded(limited_logger):
+    """Test distinct log keys cannot grow the buckets or suppressed counts forever"""
+    log, _, limiter = limited_logger(default_rate_limit=1.0, max_keys=3)
+
+    for i in range(10):
+        for _ in range(2):
+            log.info("probe", extra={"log_key": f"key.{i}"})
+
+    assert len(limiter._buckets) == 3
+    stats = limiter.stats()
+    assert len(stats.suppressed_by_key) == 4
+    assert stats.suppressed_by_key["other"] == 7
+    assert stats.suppressed == 10
@@ -0,0 +1,3 @@
+from .registry import MetricsRegistry, metrics_registry
+
+__all__ = ["MetricsRegistry", "metrics_registry"]
@@ -0,0 +1,19 @@
+from typing import Any, Dict
+from fastapi import APIRouter, status
+
+from .registry import metrics_registry
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+)
+
+
+@router.get(
+    "",
+    summary="Collect in-process runtime metrics from every registered provider",
+    response_description="Return the current value of each metric keyed by provider name",
+    status_code=status.HTTP_200_OK,
+)
+def get_metrics() -> Dict[str, Any]:
+    return metrics_registry.snapshot()
@@ -0,0 +1,27 @@
+import threading
+from typing import Any, Callable, Dict
+
+
+class MetricsRegistry:
+    """Named providers whose current values are collected on demand."""
+
+    def __init__(self):
+        self._providers: Dict[str, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, provider: Callable[[], Any]) -> None:
+        with self._lock:
+            self._providers[name] = provider
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._providers.pop(name, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            providers = dict(self._providers)
+        return {name: provider() for name, provider in providers.items()}
+
+
+# Module-level singleton instance
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,16 @@
+from .sampler import FrameStat, ProfileSummary, StackSampler, categorize
+from .middleware import (
+    ProfilingMiddleware,
+    sign_profile_request,
+    verify_profile_request,
+)
+
+__all__ = [
+    "FrameStat",
+    "ProfileSummary",
+    "StackSampler",
+    "categorize",
+    "ProfilingMiddleware",
+    "sign_profile_request",
+    "verify_profile_request",
+]
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from common.config import settings
+from common.loggers import logger
+from .sampler import ProfileSummary, StackSampler
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def _signature(secret: str, expires: int, method: str, path: str) -> str:
+    message = f"{expires}:{method.upper()}:{path}".encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_profile_request(secret: str, method: str, path: str, ttl: int = 300) -> str:
+    """Value for the X-Profile header allowing one route to be profiled for ttl seconds."""
+    expires = int(time.time()) + ttl
+    return f"{expires}.{_signature(secret, expires, method, path)}"
+
+
+def verify_profile_request(secret: str, value: str, method: str, path: str) -> bool:
+    expires, _, signature = value.partition(".")
+    try:
+        expires_at = int(expires)
+    except ValueError:
+        return False
+    if expires_at < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(secret, expires_at, method, path))
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling individual requests with a stack sampler.
+
+    A request is profiled when its X-Profile header holds a valid signature
+    from sign_profile_request, or at random for one in sample_one_in
+    requests. At most one request per worker is profiled at a time; the
+    rest run unprofiled. Results are written to output_dir as
+    <id>.collapsed (flamegraph input) and <id>.json (per-layer time and the
+    top frames), and the id is returned in the X-Profile-Id response
+    header. Requests that raise are not saved. Only the max_profiles most
+    recent profiles are kept; older ones are deleted after each save.
+
+    The sampler sees every thread, so stacks of requests running alongside
+    the profiled one are mixed in. The summary records the most other
+    requests that were in flight on the worker meanwhile; a profile with
+    concurrent_requests > 0 is only a rough picture of its route.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        secret: Optional[str] = settings.PROFILING_SECRET,
+        sample_one_in: int = settings.PROFILING_SAMPLE_ONE_IN,
+        interval: float = settings.PROFILING_INTERVAL_SECONDS,
+        output_dir: str = settings.PROFILING_OUTPUT_DIR,
+        max_profiles: int = settings.PROFILING_MAX_PROFILES,
+        top_n: int = settings.PROFILING_TOP_N,
+    ):
+        self.app = app
+        self.secret = secret
+        self.sample_one_in = sample_one_in
+        self.interval = interval
+        self.output_dir = output_dir
+        self.max_profiles = max_profiles
+        self.top_n = top_n
+        self._active = threading.Lock()
+        # Requests in flight on this worker; only touched on the event loop
+        self._in_flight = 0
+        self._concurrent_peak = 0
+
+    def _requested(self, scope: Any) -> bool:
+        value = Headers(scope=scope).get(PROFILE_HEADER)
+        if value is not None:
+            if self.secret and verify_profile_request(
+                self.secret, value, scope["method"], scope["path"]
+            ):
+                return True
+            logger.warning(f"Ignoring unsigned profiling request for {scope['path']}")
+            return False
+        return self.sample_one_in > 0 and random.randrange(self.sample_one_in) == 0
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self._in_flight += 1
+        if self._active.locked():
+            self._concurrent_peak = max(self._concurrent_peak, self._in_flight - 1)
+        try:
+            if self._requested(scope) and self._active.acquire(blocking=False):
+                await self._profile(scope, receive, send)
+            else:
+                await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def _profile(self, scope: Any, receive: Any, send: Any) -> None:
+        self._concurrent_peak = self._in_flight - 1
+
+        profile_id = uuid.uuid4().hex[:16]
+        response: Dict[str, Any] = {}
+
+        async def send_with_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                MutableHeaders(scope=message)[PROFILE_ID_HEADER] = profile_id
+            await send(message)
+
+        sampler = StackSampler(self.interval)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            self._active.release()
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        summary = ProfileSummary(
+            profile_id=profile_id,
+            method=scope["method"],
+            route=route,
+            status_code=response.get("status"),
+            duration_ms=round(sampler.duration * 1000, 3),
+            interval_ms=self.interval * 1000,
+            samples=sampler.samples,
+            concurrent_requests=self._concurrent_peak,
+            categories_ms=sampler.categories_ms(),
+            top=sampler.top(self.top_n),
+        )
+        await asyncio.to_thread(self._save, summary, sampler.collapsed())
+
+    def _save(self, summary: ProfileSummary, collapsed: str) -> None:
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            base = os.path.join(self.output_dir, summary.profile_id)
+            with open(f"{base}.collapsed", "w") as f:
+                f.write(collapsed)
+            with open(f"{base}.json", "w") as f:
+                f.write(summary.model_dump_json(indent=2))
+        except OSError as e:
+            logger.error(f"Failed to save profile {summary.profile_id}: {e}")
+            return
+        logger.info(
+            f"Profiled {summary.method} {summary.route} in {summary.duration_ms}ms "
+            f"({summary.categories_ms}) -> {base}.collapsed"
+        )
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond max_profiles, by modification time."""
+        try:
+            with os.scandir(self.output_dir) as entries:
+                summaries = [
+                    (entry.stat().st_mtime, entry.name.removesuffix(".json"))
+                    for entry in entries
+                    if entry.name.endswith(".json")
+                ]
+        except OSError as e:
+            logger.error(f"Failed to list profiles in {self.output_dir}: {e}")
+            return
+        summaries.sort()
+        for _, profile_id in summaries[: max(len(summaries) - self.max_profiles, 0)]:
+            for suffix in (".json", ".collapsed"):
+                try:
+                    os.remove(os.path.join(self.output_dir, profile_id + suffix))
+                except FileNotFoundError:
+                    # Another worker pruned it first
+                    pass
+                except OSError as e:
+                    logger.error(f"Failed to delete profile {profile_id}: {e}")
@@ -0,0 +1,169 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+# Leaf frames of threads that are parked rather than working
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("runners.py", "run"),
+    ("base_events.py", "run_forever"),
+}
+
+# (category, path fragments) checked from the innermost frame outwards;
+# the first frame that matches decides where a sample's time is spent
+CATEGORIES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("botocore", ("/botocore/", "/boto3/", "/urllib3/", "/s3transfer/")),
+    # FastJSONResponse.render is pydantic-core serialisation
+    (
+        "pydantic",
+        ("/pydantic/", "/pydantic_core/", "/pydantic_settings/", "json_response.py"),
+    ),
+    ("logging", ("/logging/", "/loggers/")),
+    ("service", ("_service.py", "/databases/", "/s3/")),
+    ("controller", ("_controller.py",)),
+    ("compression", ("/compression/",)),
+    ("framework", ("/fastapi/", "/starlette/", "/uvicorn/", "/anyio/", "/asyncio/")),
+]
+
+
+def _frame_name(filename: str, function: str, lineno: int) -> str:
+    # Collapsed-stack lines use ';' between frames
+    return f"{function} ({os.path.basename(filename)}:{lineno})".replace(";", ":")
+
+
+def categorize(files: List[str]) -> str:
+    """Category of a sample given its frame files, innermost first."""
+    for filename in files:
+        path = filename.replace(os.sep, "/")
+        for category, fragments in CATEGORIES:
+            if any(fragment in path for fragment in fragments):
+                return category
+    return "other"
+
+
+class FrameStat(BaseModel):
+    frame: str
+    self_ms: float
+    total_ms: float
+
+
+class ProfileSummary(BaseModel):
+    profile_id: str
+    method: str
+    route: str
+    status_code: Optional[int] = None
+    duration_ms: float
+    interval_ms: float
+    samples: int
+    # Most other requests in flight on the worker while this one was sampled
+    concurrent_requests: int = 0
+    categories_ms: Dict[str, float]
+    top: List[FrameStat]
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of every thread at a fixed interval.
+
+    Work done for a request on the event loop, the AWS I/O pool or
+    Starlette's threadpool all show up, each stack rooted at its thread
+    name. Threads parked on a lock, queue or selector are skipped, so the
+    counts are CPU and blocking-call time, not idle time. Only one sampler
+    should run per process: other requests running concurrently on the same
+    worker are sampled too.
+
+    The sampler thread needs the GIL to take a sample, so while it runs the
+    interpreter's switch interval is lowered to the sampling interval;
+    otherwise a busy thread would only yield every 5 ms.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._switch_interval: Optional[float] = None
+        self.duration = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.interval, self._switch_interval))
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._switch_interval is not None:
+            sys.setswitchinterval(self._switch_interval)
+        self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(exclude=own)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == exclude:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                continue
+            frames: List[str] = []
+            files: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                lineno = frame.f_lineno or 0
+                frames.append(_frame_name(code.co_filename, code.co_name, lineno))
+                files.append(code.co_filename)
+                frame = frame.f_back
+            frames.append(names.get(ident, f"thread-{ident}").replace(";", ":"))
+            self.stacks[tuple(reversed(frames))] += 1
+            self.categories[categorize(files)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format for flamegraph.pl or speedscope."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def top(self, limit: int) -> List[FrameStat]:
+        """Frames with the most self time; total time counts each frame once per stack."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for frame in set(stack[1:]):
+                total[frame] += count
+        ms = self.interval * 1000
+        return [
+            FrameStat(
+                frame=frame,
+                self_ms=round(count * ms, 3),
+                total_ms=round(total[frame] * ms, 3),
+            )
+            for frame, count in own.most_common(limit)
+        ]
+
+    def categories_ms(self) -> Dict[str, float]:
+        ms = self.interval * 1000
+        return {
+            name: round(count * ms, 3) for name, count in self.categories.most_common()
+        }
@@ -0,0 +1,45 @@
+"""
+Test configuration for request profiling
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ..middleware import ProfilingMiddleware
+
+SECRET = "test-secret"
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def profiled_app(tmp_path):
+    """Fixture for an app whose only route burns CPU for 50 ms."""
+    app = FastAPI()
+
+    @app.get("/work")
+    def work():
+        busy(0.05)
+        return {"ok": True}
+
+    app.add_middleware(
+        ProfilingMiddleware,
+        secret=SECRET,
+        sample_one_in=0,
+        interval=0.001,
+        output_dir=str(tmp_path),
+    )
+    return app
+
+
+@pytest.fixture
+def profiled_client(profiled_app):
+    """Fixture for a test client over the profiled app."""
+    return TestClient(profiled_app)
@@ -0,0 +1,156 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ..middleware import (
+    ProfilingMiddleware,
+    sign_profile_request,
+    verify_profile_request,
+)
+from ..sampler import StackSampler, categorize
+from .conftest import SECRET
+
+
+def test_signed_request_is_profiled(profiled_client, tmp_path):
+    """Test a signed X-Profile header produces collapsed stacks and a summary"""
+    token = sign_profile_request(SECRET, "GET", "/work")
+
+    response = profiled_client.get("/work", headers={"X-Profile": token})
+
+    profile_id = response.headers["x-profile-id"]
+    summary = json.loads((tmp_path / f"{profile_id}.json").read_text())
+    collapsed = (tmp_path / f"{profile_id}.collapsed").read_text()
+    assert summary["route"] == "/work"
+    assert summary["status_code"] == 200
+    assert summary["samples"] > 0
+    assert any("busy (conftest.py" in frame["frame"] for frame in summary["top"])
+    stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+
+
+def test_unsigned_request_is_not_profiled(profiled_client, tmp_path):
+    """Test X-Profile without a valid signature is ignored"""
+    response = profiled_client.get("/work", headers={"X-Profile": "1"})
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_old_profiles_are_pruned(tmp_path):
+    """Test only the most recent max_profiles profiles are kept on disk"""
+    app = FastAPI()
+    app.get("/work")(lambda: {"ok": True})
+    middleware = ProfilingMiddleware(
+        app, secret=SECRET, output_dir=str(tmp_path), max_profiles=2
+    )
+    client = TestClient(middleware)
+    token = sign_profile_request(SECRET, "GET", "/work")
+
+    ids = [
+        client.get("/work", headers={"X-Profile": token}).headers["x-profile-id"]
+        for _ in range(3)
+    ]
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f"{profile_id}{suffix}"
+        for profile_id in ids[1:]
+        for suffix in (".json", ".collapsed")
+    )
+
+
+def test_failed_request_is_not_saved(tmp_path):
+    """Test a request that raises leaves no profile behind"""
+
+    async def failing(scope, receive, send):
+        raise RuntimeError("boom")
+
+    middleware = ProfilingMiddleware(failing, secret=SECRET, output_dir=str(tmp_path))
+    client = TestClient(middleware, raise_server_exceptions=False)
+
+    response = client.get(
+        "/work", headers={"X-Profile": sign_profile_request(SECRET, "GET", "/work")}
+    )
+
+    assert response.status_code == 500
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_summary_records_concurrent_requests(tmp_path):
+    """Test requests overlapping the profiled one are counted in its summary"""
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def noop(message):
+        pass
+
+    def scope(path, headers=()):
+        return {"type": "http", "method": "GET", "path": path, "headers": headers}
+
+    middleware = ProfilingMiddleware(app, secret=SECRET, output_dir=str(tmp_path))
+    token = sign_profile_request(SECRET, "GET", "/slow").encode()
+    profiled = asyncio.ensure_future(
+        middleware(scope("/slow", [(b"x-profile", token)]), None, noop)
+    )
+    other = asyncio.ensure_future(middleware(scope("/slow"), None, noop))
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(profiled, other)
+
+    (summary,) = [json.loads(p.read_text()) for p in tmp_path.glob("*.json")]
+    assert summary["concurrent_requests"] == 1
+
+
+def test_signature_is_bound_to_route_and_expiry():
+    """Test signatures cannot be reused for another route or after expiry"""
+    token = sign_profile_request(SECRET, "GET", "/work")
+
+    assert verify_profile_request(SECRET, token, "GET", "/work")
+    assert not verify_profile_request(SECRET, token, "GET", "/other")
+    assert not verify_profile_request("other", token, "GET", "/work")
+    expired = sign_profile_request(SECRET, "GET", "/work", ttl=-1)
+    assert not verify_profile_request(SECRET, expired, "GET", "/work")
+
+
+def test_categorize_uses_innermost_layer():
+    """Test a sample is attributed to the innermost recognised layer"""
+    outer_to_inner = [
+        "/app/src/relationships/relationships_controller.py",
+        "/app/src/relationships/relationships_service.py",
+        "/venv/site-packages/botocore/endpoint.py",
+        "/venv/site-packages/urllib3/connectionpool.py",
+    ]
+
+    assert categorize(list(reversed(outer_to_inner))) == "botocore"
+    assert categorize(list(reversed(outer_to_inner[:2]))) == "service"
+    assert categorize(["/venv/site-packages/pydantic/main.py"]) == "pydantic"
+    assert categorize(["/usr/lib/python3.12/json/encoder.py"]) == "other"
+
+
+def test_sampler_skips_idle_threads():
+    """Test threads parked on a wait are not counted"""
+    release = threading.Event()
+    parked = threading.Thread(target=release.wait, name="parked")
+    parked.start()
+    sampler = StackSampler()
+    try:
+        time.sleep(0.01)
+        sampler.sample()
+    finally:
+        release.set()
+        parked.join()
+
+    roots = {stack[0] for stack in sampler.stacks}
+    assert "MainThread" in roots
+    assert "parked" not in roots
@@ -0,0 +1,37 @@
+from .admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    AdmissionStats,
+    admission_controller,
+)
+from .deadline import (
+    DeadlineMiddleware,
+    check_deadline,
+    register_deadline_handler,
+    remaining,
+    reset_deadline,
+    set_deadline,
+)
+from .hedging import (
+    HedgedExecutor,
+    HedgingStats,
+    LatencyTracker,
+    dynamodb_read_executor,
+)
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionMiddleware",
+    "AdmissionStats",
+    "admission_controller",
+    "DeadlineMiddleware",
+    "check_deadline",
+    "register_deadline_handler",
+    "remaining",
+    "reset_deadline",
+    "set_deadline",
+    "HedgedExecutor",
+    "HedgingStats",
+    "LatencyTracker",
+    "dynamodb_read_executor",
+]
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+
+from pydantic import BaseModel
+
+from common.config import settings
+from common.loggers import logger
+from common.responses import FastJSONResponse
+
+
+class AdmissionStats(BaseModel):
+    max_concurrency: int
+    max_queue: int
+    active: int
+    queued: int
+    admitted: int
+    waited: int
+    rejected_full: int
+    rejected_timeout: int
+    bypassed: int
+    queue_wait_ms: Dict[str, float]
+
+
+class AdmissionController:
+    """
+    Caps the requests a worker process handles at once.
+
+    Up to max_concurrency requests run; the next max_queue wait in arrival
+    order for up to queue_timeout seconds, and anything beyond that is
+    rejected at once. A finishing request hands its slot straight to the
+    oldest waiter, so a request that arrives while others wait cannot jump
+    the queue. The controller runs on the event loop and needs no lock;
+    only the queue wait window is read from other threads.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        max_queue: int = 128,
+        queue_timeout: float = 1.0,
+        window: int = 1000,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._admitted = 0
+        self._waited = 0
+        self._rejected_full = 0
+        self._rejected_timeout = 0
+        self._bypassed = 0
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            self._max_wait = max(self._max_wait, seconds)
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; False when the queue is full or the wait times out."""
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._admitted += 1
+            self._record_wait(0.0)
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self._rejected_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot arrived as the wait ended; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if not isinstance(e, asyncio.TimeoutError):
+                raise
+            self._rejected_timeout += 1
+            return False
+
+        self._admitted += 1
+        self._waited += 1
+        self._record_wait(time.monotonic() - started)
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def bypass(self) -> None:
+        self._bypassed += 1
+
+    def stats(self) -> AdmissionStats:
+        with self._lock:
+            waits = sorted(self._waits)
+            max_wait = self._max_wait
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(
+                waits[min(int(len(waits) * p / 100), len(waits) - 1)] * 1000, 3
+            )
+
+        return AdmissionStats(
+            max_concurrency=self.max_concurrency,
+            max_queue=self.max_queue,
+            active=self._active,
+            queued=len(self._waiters),
+            admitted=self._admitted,
+            waited=self._waited,
+            rejected_full=self._rejected_full,
+            rejected_timeout=self._rejected_timeout,
+            bypassed=self._bypassed,
+            queue_wait_ms={
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+                "max": round(max_wait * 1000, 3),
+            },
+        )
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware shedding load with a fast 503 once the worker is saturated.
+
+    Paths in bypass_paths (the health probe by default) are never queued or
+    rejected, so a busy pod still answers its liveness and readiness checks.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        controller: Optional[AdmissionController] = None,
+        bypass_paths: Optional[Iterable[str]] = None,
+        retry_after: Optional[int] = None,
+    ):
+        self.app = app
+        self.controller = controller or admission_controller
+        if bypass_paths is None:
+            bypass_paths = [
+                f"/v{settings.API_VERSION}{path}"
+                for path in settings.ADMISSION_BYPASS_PATHS
+            ]
+        self.bypass_paths = frozenset(bypass_paths)
+        self.retry_after = (
+            settings.ADMISSION_RETRY_AFTER_SECONDS
+            if retry_after is None
+            else retry_after
+        )
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] in self.bypass_paths:
+            self.controller.bypass()
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire():
+            logger.warning(
+                "Rejected %s %s: worker saturated",
+                scope["method"],
+                scope["path"],
+                extra={"log_key": "admission.rejected"},
+            )
+            response = FastJSONResponse(
+                {"detail": "Service overloaded, retry later."},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+
+# Module-level singleton instance
+admission_controller = AdmissionController(
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,95 @@
+import math
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Optional
+
+from common.config import settings
+from common.exceptions import DeadlineExceededError
+
+DEADLINE_HEADER = b"x-request-timeout"
+
+# Absolute time.monotonic() by which the current request must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+def set_deadline(seconds: float) -> Token:
+    """Start a budget of seconds for the current context. Returns a reset token."""
+    return _deadline.set(time.monotonic() + seconds)
+
+
+def reset_deadline(token: Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None when no deadline is set."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline() -> Optional[float]:
+    """
+    Return the remaining budget
+
+    Raises:
+        DeadlineExceededError: If the budget is already spent
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceededError()
+    return left
+
+
+def register_deadline_handler(client: Any) -> None:
+    """
+    Bound every HTTP attempt made by a botocore client by the request deadline.
+
+    Attempts are refused once the budget is spent, which also stops retries,
+    and an attempt started with less budget left than the client's read
+    timeout waits only for what is left.
+    """
+    read_timeout = client.meta.config.read_timeout
+
+    def bound_attempt(request: Any = None, **kwargs: Any) -> None:
+        left = check_deadline()
+        context = getattr(request, "context", None)
+        if left is not None and context is not None and left < read_timeout:
+            context["read_timeout"] = left
+
+    client.meta.events.register("before-send", bound_attempt)
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware giving each HTTP request a deadline budget.
+
+    Clients may ask for a shorter or longer budget with the X-Request-Timeout
+    header (seconds), capped at REQUEST_DEADLINE_MAX_SECONDS. Values that are
+    not a positive finite number fall back to REQUEST_DEADLINE_SECONDS.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        seconds = settings.REQUEST_DEADLINE_SECONDS
+        for name, value in scope["headers"]:
+            if name == DEADLINE_HEADER:
+                try:
+                    requested = float(value)
+                except ValueError:
+                    break
+                # nan, inf and non-positive budgets are ignored, not honoured
+                if math.isfinite(requested) and requested > 0:
+                    seconds = min(requested, settings.REQUEST_DEADLINE_MAX_SECONDS)
+                break
+
+        token = set_deadline(seconds)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_deadline(token)
@@ -0,0 +1,229 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional
+
+from pydantic import BaseModel
+
+from common.config import settings
+from common.exceptions import DeadlineExceededError
+from .deadline import check_deadline
+
+# Recompute the latency percentile after this many new samples
+PERCENTILE_REFRESH_INTERVAL = 50
+
+
+class LatencyTracker:
+    """Sliding window of call latencies with a cached percentile."""
+
+    def __init__(self, percentile: float, window: int = 1000, min_samples: int = 100):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._since_refresh = 0
+        self._cached: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._since_refresh += 1
+            if self._since_refresh >= PERCENTILE_REFRESH_INTERVAL:
+                self._refresh()
+
+    def _refresh(self) -> None:
+        self._since_refresh = 0
+        if len(self._samples) < self.min_samples:
+            self._cached = None
+            return
+        ordered = sorted(self._samples)
+        position = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+        self._cached = ordered[position]
+
+    def threshold(self) -> Optional[float]:
+        """Latency above which a call is considered slow, once enough samples exist."""
+        return self._cached
+
+
+class HedgingStats(BaseModel):
+    calls: int
+    hedges: int
+    hedge_wins: int
+    hedge_win_rate: float
+    hedge_rate: float
+    deadline_exceeded: int
+    thresholds_ms: Dict[str, Optional[float]]
+
+
+class HedgedExecutor:
+    """
+    Runs idempotent AWS reads under the request deadline, optionally hedged.
+
+    Without hedging a call runs inline after a deadline check; the botocore
+    deadline handler bounds each attempt by the budget left. With
+    hedging, a second identical attempt is fired when the first is slower
+    than the tracked latency percentile for that operation and whichever
+    finishes first wins. Hedges are capped at budget_percent of all calls.
+    Losing attempts are not cancelled; their results are discarded.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        budget_percent: float = 5.0,
+        min_samples: int = 100,
+        max_workers: int = 32,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget_percent = budget_percent
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._deadline_exceeded = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="aws-hedged"
+                    )
+        return self._executor
+
+    def _tracker(self, operation: str) -> LatencyTracker:
+        tracker = self._trackers.get(operation)
+        if tracker is None:
+            tracker = self._trackers.setdefault(
+                operation,
+                LatencyTracker(self.percentile, min_samples=self.min_samples),
+            )
+        return tracker
+
+    def _submit(
+        self, tracker: LatencyTracker, fn: Callable[..., Any], args: Any, kwargs: Any
+    ) -> Future:
+        # Each attempt gets its own context copy so the deadline follows it
+        context = contextvars.copy_context()
+
+        def attempt() -> Any:
+            started = time.monotonic()
+            result = context.run(fn, *args, **kwargs)
+            tracker.record(time.monotonic() - started)
+            return result
+
+        return self._pool().submit(attempt)
+
+    def _may_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self._calls * self.budget_percent / 100:
+                return False
+            self._hedges += 1
+            return True
+
+    def _timed_out(self) -> DeadlineExceededError:
+        with self._lock:
+            self._deadline_exceeded += 1
+        return DeadlineExceededError()
+
+    def _left(self) -> Optional[float]:
+        try:
+            return check_deadline()
+        except DeadlineExceededError:
+            raise self._timed_out()
+
+    def _await(self, future: Future) -> Any:
+        done, _ = wait([future], timeout=self._left())
+        if not done:
+            raise self._timed_out()
+        return future.result()
+
+    def call(
+        self, operation: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        """
+        Call fn(*args, **kwargs) within the current request deadline.
+
+        Raises:
+            DeadlineExceededError: If the budget is spent before a result arrives
+        """
+        budget = self._left()
+        with self._lock:
+            self._calls += 1
+
+        tracker = self._tracker(operation)
+        if not self.enabled:
+            started = time.monotonic()
+            result = fn(*args, **kwargs)
+            tracker.record(time.monotonic() - started)
+            return result
+
+        first = self._submit(tracker, fn, args, kwargs)
+        threshold = tracker.threshold()
+        if threshold is None or (budget is not None and threshold >= budget):
+            return self._await(first)
+
+        done, _ = wait([first], timeout=threshold)
+        if done or not self._may_hedge():
+            return self._await(first)
+
+        second = self._submit(tracker, fn, args, kwargs)
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(
+                pending, timeout=self._left(), return_when=FIRST_COMPLETED
+            )
+            if not done:
+                raise self._timed_out()
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self._hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error  # type: ignore[misc]
+
+    def stats(self) -> HedgingStats:
+        with self._lock:
+            calls, hedges, wins = self._calls, self._hedges, self._hedge_wins
+            deadline_exceeded = self._deadline_exceeded
+        thresholds = {}
+        for operation, tracker in self._trackers.items():
+            threshold = tracker.threshold()
+            thresholds[operation] = (
+                None if threshold is None else round(threshold * 1000, 3)
+            )
+        return HedgingStats(
+            calls=calls,
+            hedges=hedges,
+            hedge_wins=wins,
+            hedge_win_rate=wins / hedges if hedges else 0.0,
+            hedge_rate=hedges / calls if calls else 0.0,
+            deadline_exceeded=deadline_exceeded,
+            thresholds_ms=thresholds,
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Module-level singleton used for idempotent DynamoDB reads
+dynamodb_read_executor = HedgedExecutor(
+    enabled=settings.DYNAMODB_HEDGING_ENABLED,
+    percentile=settings.DYNAMODB_HEDGING_PERCENTILE,
+    budget_percent=settings.DYNAMODB_HEDGING_BUDGET_PERCENT,
+    min_samples=settings.DYNAMODB_HEDGING_MIN_SAMPLES,
+    max_workers=settings.DYNAMODB_HEDGING_MAX_WORKERS,
+)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from ..admission import AdmissionMiddleware
+
+
+async def _next_tick():
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_release_hands_slot_to_oldest_waiter(admission):
+    """Test a finishing request admits the queued one instead of freeing the slot"""
+    assert await admission.acquire()
+    waiting = asyncio.ensure_future(admission.acquire())
+    await _next_tick()
+    assert admission.stats().queued == 1
+
+    admission.release()
+
+    assert await waiting
+    stats = admission.stats()
+    assert (stats.active, stats.queued, stats.admitted, stats.waited) == (1, 0, 2, 1)
+    assert stats.queue_wait_ms["max"] > 0
+    admission.release()
+    assert admission.stats().active == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_immediately(admission):
+    """Test requests beyond the queue bound are rejected without waiting"""
+    assert await admission.acquire()
+    waiting = asyncio.ensure_future(admission.acquire())
+    await _next_tick()
+
+    assert not await asyncio.wait_for(admission.acquire(), 0.05)
+    assert admission.stats().rejected_full == 1
+    admission.release()
+    assert await waiting
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_rejects_and_leaves_queue(admission):
+    """Test a request that waits too long is rejected and frees its queue place"""
+    admission.queue_timeout = 0.01
+    assert await admission.acquire()
+
+    assert not await admission.acquire()
+
+    stats = admission.stats()
+    assert (stats.queued, stats.rejected_timeout) == (0, 1)
+    admission.release()
+    assert admission.stats().active == 0
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_load_but_not_probes(admission):
+    """Test a saturated worker answers 503 with Retry-After and still serves health"""
+    admission.max_queue = 0
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"] == "/slow":
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    middleware = AdmissionMiddleware(
+        app, controller=admission, bypass_paths=["/healthz"], retry_after=3
+    )
+
+    async def call(path):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": path, "headers": []}
+        await middleware(scope, None, send)
+        return sent[0]
+
+    slow = asyncio.ensure_future(call("/slow"))
+    await _next_tick()
+
+    rejected = await call("/other")
+    assert rejected["status"] == 503
+    assert (b"retry-after", b"3") in rejected["headers"]
+    assert (await call("/healthz"))["status"] == 200
+
+    release.set()
+    assert (await slow)["status"] == 200
+    stats = admission.stats()
+    assert (stats.active, stats.rejected_full, stats.bypassed) == (0, 1, 1)
@@ -0,0 +1,45 @@
+"""
+Test configuration for deadlines, hedged reads and admission control
+"""
+
+import threading
+import pytest
+
+from ..admission import AdmissionController
+from ..deadline import reset_deadline, set_deadline
+from ..hedging import HedgedExecutor
+
+
+@pytest.fixture
+def deadline():
+    """Fixture that sets a request deadline of the given seconds for one test."""
+    tokens = []
+
+    def _set(seconds: float):
+        tokens.append(set_deadline(seconds))
+
+    yield _set
+    for token in reversed(tokens):
+        reset_deadline(token)
+
+
+@pytest.fixture
+def hedged_executor():
+    """Fixture for a hedging executor that hedges after a single sample."""
+    executor = HedgedExecutor(enabled=True, budget_percent=100, min_samples=1)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def release():
+    """Fixture for an event that unblocks slow fake calls at teardown."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+@pytest.fixture
+def admission():
+    """Fixture for an admission controller running one request and queueing one."""
+    return AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=0.2)
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from common.config import settings
+from common.exceptions import DeadlineExceededError
+from ..deadline import (
+    DeadlineMiddleware,
+    check_deadline,
+    register_deadline_handler,
+    remaining,
+)
+from ..hedging import HedgedExecutor, LatencyTracker
+
+
+def test_no_deadline_by_default():
+    assert remaining() is None
+    assert check_deadline() is None
+
+
+def test_check_deadline_raises_when_spent(deadline):
+    deadline(-1)
+
+    with pytest.raises(DeadlineExceededError):
+        check_deadline()
+
+
+def test_deadline_handler_caps_attempt_read_timeout(deadline):
+    client = MagicMock()
+    client.meta.config.read_timeout = 5
+    register_deadline_handler(client)
+    handler = client.meta.events.register.call_args.args[1]
+    request = SimpleNamespace(context={})
+
+    handler(request=request)
+    assert "read_timeout" not in request.context
+
+    deadline(0.5)
+    handler(request=request)
+    assert 0 < request.context["read_timeout"] <= 0.5
+
+    deadline(-1)
+    with pytest.raises(DeadlineExceededError):
+        handler(request=request)
+
+
+@pytest.mark.parametrize("header", [b"nan", b"inf", b"0", b"-3", b"soon"])
+def test_invalid_timeout_header_uses_default(header):
+    budgets = []
+
+    async def app(scope, receive, send):
+        budgets.append(remaining())
+
+    middleware = DeadlineMiddleware(app)
+    scope = {"type": "http", "headers": [(b"x-request-timeout", header)]}
+    asyncio.run(middleware(scope, None, None))
+
+    assert settings.REQUEST_DEADLINE_SECONDS - 1 < budgets[0]
+    assert budgets[0] <= settings.REQUEST_DEADLINE_SECONDS
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(percentile=90, min_samples=10)
+    for ms in range(100):
+        tracker.record(ms / 1000)
+
+    assert tracker.threshold() == pytest.approx(0.09)
+
+
+def test_call_runs_inline_without_deadline():
+    executor = HedgedExecutor()
+
+    assert executor.call("GetItem", lambda: threading.current_thread().name) == (
+        threading.current_thread().name
+    )
+    assert executor.stats().calls == 1
+
+
+def test_call_runs_inline_with_deadline_when_hedging_disabled(deadline):
+    executor = HedgedExecutor()
+    deadline(5)
+
+    assert executor.call("GetItem", lambda: threading.current_thread().name) == (
+        threading.current_thread().name
+    )
+    assert executor._executor is None
+
+
+def test_call_refused_once_deadline_spent(deadline):
+    executor = HedgedExecutor()
+    deadline(-1)
+
+    with pytest.raises(DeadlineExceededError):
+        executor.call("GetItem", lambda: None)
+    assert executor.stats().deadline_exceeded == 1
+
+
+def test_call_times_out_at_deadline(deadline, release):
+    executor = HedgedExecutor(enabled=True)
+    deadline(0.05)
+
+    with pytest.raises(DeadlineExceededError):
+        executor.call("Query", release.wait)
+    assert executor.stats().deadline_exceeded == 1
+    executor.shutdown()
+
+
+def test_deadline_propagates_into_attempt(deadline):
+    executor = HedgedExecutor(enabled=True)
+    deadline(5)
+
+    left = executor.call("Query", remaining)
+
+    assert 0 < left <= 5
+    executor.shutdown()
+
+
+def test_slow_attempt_is_hedged(hedged_executor, release):
+    hedged_executor.call("Query", lambda: None)
+    hedged_executor._tracker("Query")._refresh()
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait()
+            return "slow"
+        return "fast"
+
+    assert hedged_executor.call("Query", flaky) == "fast"
+    stats = hedged_executor.stats()
+    assert stats.hedges == 1
+    assert stats.hedge_wins == 1
+    assert stats.hedge_win_rate == 1.0
+
+
+def test_hedging_respects_budget(release):
+    executor = HedgedExecutor(enabled=True, budget_percent=0, min_samples=1)
+    executor.call("Query", lambda: None)
+    executor._tracker("Query")._refresh()
+
+    def slow():
+        time.sleep(0.02)
+        return "done"
+
+    assert executor.call("Query", slow) == "done"
+    assert executor.stats().hedges == 0
+    executor.shutdown()
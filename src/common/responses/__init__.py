@@ -0,0 +1,10 @@
+from .json_response import FastJSONResponse
+from .etag import cache_headers, etag_matches, make_etag, not_modified
+
+__all__ = [
+    "FastJSONResponse",
+    "cache_headers",
+    "etag_matches",
+    "make_etag",
+    "not_modified",
+]
@@ -0,0 +1,45 @@
+from typing import Dict, Optional
+
+from fastapi import Response, status
+
+# Clients may keep the body but must revalidate before each reuse
+REVALIDATE = "no-cache"
+
+
+def make_etag(version: str) -> str:
+    """
+    Weak ETag for a version marker.
+
+    Weak because the same version may be sent with different
+    Content-Encodings; the payload is still equivalent.
+    """
+    return f'W/"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str, exists: bool = False) -> bool:
+    """
+    Weak comparison of an If-None-Match header against etag (RFC 9110 13.1.2).
+
+    "*" matches only a resource known to exist, so callers pass exists=True
+    once they have read it; before that, "*" never short-circuits a read.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return exists
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": REVALIDATE}
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 carrying the validator the client already holds."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag)
+    )
@@ -0,0 +1,20 @@
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's Rust encoder.
+
+    Used as the app's default response class. Routes whose output is already
+    a typed Pydantic model (or a list of them) should return
+    ``FastJSONResponse(model)`` directly: FastAPI hands Response instances
+    back untouched, so the output is not validated against ``response_model``
+    a second time and is serialised to bytes in a single pass. Keep
+    ``response_model`` on the route for the OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
@@ -0,0 +1,35 @@
+import pytest
+
+from ..etag import etag_matches, make_etag, not_modified
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('"x", W/"abc"', True),
+        ("*", False),
+        ('W/"other"', False),
+        (None, False),
+        ("", False),
+    ],
+)
+def test_etag_matches(header, expected):
+    """Test If-None-Match uses weak comparison and lists"""
+    assert etag_matches(header, make_etag("abc")) is expected
+
+
+@pytest.mark.parametrize("exists", [True, False])
+def test_wildcard_matches_existing_resource(exists):
+    """Test If-None-Match: * only matches a resource that exists"""
+    assert etag_matches("*", make_etag("abc"), exists=exists) is exists
+
+
+def test_not_modified_has_no_body():
+    response = not_modified(make_etag("abc"))
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == 'W/"abc"'
+    assert response.headers["cache-control"] == "no-cache"
@@ -0,0 +1,36 @@
+import json
+from typing import List, Optional
+from pydantic import BaseModel
+
+from ..json_response import FastJSONResponse
+
+
+class Item(BaseModel):
+    name: str
+    note: Optional[str] = None
+
+
+class Page(BaseModel):
+    items: List[Item]
+
+
+def test_render_model():
+    response = FastJSONResponse(Item(name="a"))
+
+    assert response.body == b'{"name":"a","note":null}'
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_render_nested_list_matches_model_dump():
+    page = Page(items=[Item(name=str(i), note="x") for i in range(3)])
+
+    response = FastJSONResponse(page)
+
+    assert json.loads(response.body) == page.model_dump()
+
+
+def test_render_plain_content():
+    response = FastJSONResponse({"status": "OK", "values": [1, 2]}, status_code=201)
+
+    assert json.loads(response.body) == {"status": "OK", "values": [1, 2]}
+    assert response.status_code == 201
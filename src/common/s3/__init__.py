@@ -1,9 +1,12 @@
 from .s3_service import S3Service, get_s3_service
+from .async_s3_service import AsyncS3Service, get_async_s3_service
 from .interfaces import S3ServiceInterface
 
 
 __all__ = [
     "S3Service",
     "get_s3_service",
+    "AsyncS3Service",
+    "get_async_s3_service",
     "S3ServiceInterface",
 ]
@@ -0,0 +1,41 @@
+from common.aws_io import AwsIoExecutor, aws_io_executor
+
+from .interfaces import S3ServiceInterface
+from .s3_service import S3Service
+from .schemas import GeneratePresignedUrlResponse, S3Operation
+
+
+class AsyncS3Service:
+    """Awaitable facade over an S3 service; boto3 calls run on the AWS I/O pool."""
+
+    def __init__(
+        self, s3_service: S3ServiceInterface, executor: AwsIoExecutor = aws_io_executor
+    ):
+        self._s3_service = s3_service
+        self._executor = executor
+
+    async def generate_presigned_url(
+        self,
+        bucket_name: str,
+        file_name: str,
+        expiration: int | None = 180,
+        operation: S3Operation = S3Operation.PUT_OBJECT,
+    ) -> GeneratePresignedUrlResponse:
+        return await self._executor.run(
+            self._s3_service.generate_presigned_url,
+            bucket_name=bucket_name,
+            file_name=file_name,
+            expiration=expiration,
+            operation=operation,
+        )
+
+    async def read_file_from_s3(self, bucket_name: str, file_name: str) -> bytes:
+        return await self._executor.run(
+            self._s3_service.read_file_from_s3, bucket_name, file_name
+        )
+
+
+async def get_async_s3_service() -> AsyncS3Service:
+    # Building a boto3 Session reads config files, so keep it off the event loop too
+    s3_service = await aws_io_executor.run(S3Service)
+    return AsyncS3Service(s3_service)
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, status, Depends
+
+from common.responses import FastJSONResponse
 from .schemas import GeneratePresignedUrlRequest, GeneratePresignedUrlResponse
-from .s3_service import S3Service, get_s3_service
+from .async_s3_service import AsyncS3Service, get_async_s3_service
 
 router = APIRouter(
     prefix="/s3",
@@ -15,13 +17,13 @@ router = APIRouter(
     status_code=status.HTTP_200_OK,
     response_model=GeneratePresignedUrlResponse,
 )
-def generate_s3_file_upload_url(
+async def generate_s3_file_upload_url(
     request: GeneratePresignedUrlRequest,
-    s3_service: S3Service = Depends(get_s3_service),
+    s3_service: AsyncS3Service = Depends(get_async_s3_service),
 ):
-    response = s3_service.generate_presigned_url(
+    response = await s3_service.generate_presigned_url(
         bucket_name=request.bucket_name,
         file_name=request.file_name,
         expiration=request.expiration,
     )
-    return response
+    return FastJSONResponse(response)
@@ -4,6 +4,7 @@ from botocore import client
 from common.config import settings
 from common.loggers import logger
 from common.exceptions import InternalServiceError, ValidationError
+from common.tracing import register_tracing_handlers, traced
 
 from .interfaces import S3ServiceInterface
 from .schemas import GeneratePresignedUrlResponse, S3Operation
@@ -20,12 +21,14 @@ class S3Service(S3ServiceInterface):
             self.s3_client = self.session.client(
                 "s3", config=client.Config(signature_version="s3v4")
             )
+            register_tracing_handlers(self.s3_client)
             logger.info("S3 Client initialized")
         except Exception as e:
             message = f"Failed to create s3 Client : {str(e)}"
             logger.error(message)
             raise InternalServiceError("Failed to create s3 Client ") from e
 
+    @traced("S3Service.generate_presigned_url")
     def generate_presigned_url(
         self,
         bucket_name: str,
@@ -59,10 +62,13 @@ class S3Service(S3ServiceInterface):
                 },
                 ExpiresIn=expiration,
             )
-            logger.info({url})
-
-            message = f"Generated pre-signed URL for {operation.action_name} of file {file_name} in bucket {bucket_name}"
-            logger.info(message)
+            logger.info(
+                "Generated pre-signed URL for %s of file %s in bucket %s",
+                operation.action_name,
+                file_name,
+                bucket_name,
+                extra={"log_key": "s3.presigned_url"},
+            )
 
             return GeneratePresignedUrlResponse(presigned_url=url)
         except Exception as e:
@@ -70,6 +76,7 @@ class S3Service(S3ServiceInterface):
             logger.error(f"{message}: {e}")
             raise InternalServiceError(message) from e
 
+    @traced("S3Service.read_file_from_s3")
     def read_file_from_s3(self, bucket_name: str, file_name: str) -> bytes:  # type: ignore
         """
         Read the file bytes from an S3 bucket.
@@ -89,7 +96,12 @@ class S3Service(S3ServiceInterface):
         try:
             response = self.s3_client.get_object(Bucket=bucket_name, Key=file_name)
             file_bytes = response["Body"].read()
-            logger.info(f"Successfully read file {file_name} from bucket {bucket_name}")
+            logger.info(
+                "Successfully read file %s from bucket %s",
+                file_name,
+                bucket_name,
+                extra={"log_key": "s3.read_file"},
+            )
             return file_bytes
 
         except Exception as e:
@@ -0,0 +1,38 @@
+from .context import (
+    SpanContext,
+    current_span,
+    current_trace_ids,
+    inject_traceparent,
+    parse_traceparent,
+)
+from .exporters import (
+    FileSpanExporter,
+    InMemorySpanExporter,
+    LogSpanExporter,
+    NoOpSpanExporter,
+    SpanExporter,
+    create_exporter,
+)
+from .tracer import Span, Tracer, traced, tracer
+from .middleware import TracingMiddleware
+from .botocore_hooks import register_tracing_handlers
+
+__all__ = [
+    "SpanContext",
+    "current_span",
+    "current_trace_ids",
+    "inject_traceparent",
+    "parse_traceparent",
+    "FileSpanExporter",
+    "InMemorySpanExporter",
+    "LogSpanExporter",
+    "NoOpSpanExporter",
+    "SpanExporter",
+    "create_exporter",
+    "Span",
+    "Tracer",
+    "traced",
+    "tracer",
+    "TracingMiddleware",
+    "register_tracing_handlers",
+]
@@ -0,0 +1,63 @@
+from typing import Any
+
+from common.config import settings
+from .context import inject_traceparent
+from .tracer import tracer
+
+SPAN_CONTEXT_KEY = "trace_span"
+
+
+def _start_aws_span(model: Any, context: Any, **kwargs: Any) -> None:
+    service = model.service_model.service_id.hyphenize()
+    span = tracer.start_span(
+        f"{service}.{model.name}", {"aws.service": service, "aws.operation": model.name}
+    )
+    if span is not None:
+        context[SPAN_CONTEXT_KEY] = span
+
+
+def _end_aws_span(http_response: Any, parsed: Any, context: Any, **kwargs: Any) -> None:
+    span = context.pop(SPAN_CONTEXT_KEY, None)
+    if span is None:
+        return
+    metadata = parsed.get("ResponseMetadata", {})
+    span.set_attribute("http.status_code", http_response.status_code)
+    span.set_attribute("aws.request_id", metadata.get("RequestId"))
+    span.set_attribute("aws.retries", metadata.get("RetryAttempts", 0))
+    if http_response.status_code >= 300:
+        span.status = "error"
+        span.set_attribute("error.type", parsed.get("Error", {}).get("Code"))
+    tracer.end(span)
+
+
+def _propagate_trace(request: Any = None, **kwargs: Any) -> None:
+    # Sent after signing, so the header is not part of the signature
+    span = (getattr(request, "context", None) or {}).get(SPAN_CONTEXT_KEY)
+    if span is not None:
+        request.headers["traceparent"] = span.traceparent()
+    elif request is not None:
+        inject_traceparent(request.headers)
+
+
+def _fail_aws_span(exception: Exception, context: Any, **kwargs: Any) -> None:
+    span = context.pop(SPAN_CONTEXT_KEY, None)
+    if span is not None:
+        span.record_error(exception)
+        tracer.end(span)
+
+
+def register_tracing_handlers(client: Any) -> None:
+    """
+    Give every API call of a botocore client its own span, including retries,
+    and send its traceparent on every HTTP attempt.
+
+    Does nothing while tracing is disabled, so untraced deployments pay
+    nothing per call.
+    """
+    if not settings.TRACING_ENABLED:
+        return
+    events = client.meta.events
+    events.register("provide-client-params", _start_aws_span)
+    events.register("before-send", _propagate_trace)
+    events.register("after-call", _end_aws_span)
+    events.register("after-call-error", _fail_aws_span)
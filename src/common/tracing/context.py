@@ -0,0 +1,66 @@
+import random
+import re
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+# version-traceid-parentid-flags, lowercase hex (W3C Trace Context level 1)
+TRACEPARENT_PATTERN = re.compile(
+    r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$"
+)
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+SAMPLED_FLAG = 0x01
+
+# Innermost active span of the current request; None outside any trace
+current_span: ContextVar[Optional["SpanContext"]] = ContextVar(
+    "current_span", default=None
+)
+
+
+class SpanContext:
+    """Identifiers shared with children and downstream services."""
+
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """Return (trace_id, parent_span_id, sampled), or None if header is absent or invalid."""
+    if not header:
+        return None
+    match = TRACEPARENT_PATTERN.match(header.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None
+    return trace_id, span_id, bool(int(flags, 16) & SAMPLED_FLAG)
+
+
+def current_trace_ids() -> Optional[Tuple[str, str]]:
+    """(trace_id, span_id) of the active span, for log correlation."""
+    span = current_span.get()
+    return None if span is None else (span.trace_id, span.span_id)
+
+
+def inject_traceparent(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add the active span's traceparent to outgoing HTTP headers."""
+    span = current_span.get()
+    if span is not None:
+        headers["traceparent"] = span.traceparent()
+    return headers
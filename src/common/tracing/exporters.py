@@ -0,0 +1,100 @@
+import json
+import logging
+import sys
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, TextIO
+
+from common.config import settings
+
+
+class SpanExporter:
+    """Receives every finished, sampled span."""
+
+    def export(self, span: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class NoOpSpanExporter(SpanExporter):
+    def export(self, span: Dict[str, Any]) -> None:
+        pass
+
+
+class LogSpanExporter(SpanExporter):
+    """Writes each span as a JSON line to stderr, alongside the application logs."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        # Not the "app" logger: its level follows DEBUG and would drop spans
+        self._logger = logging.Logger("spans", logging.INFO)
+        handler = logging.StreamHandler(stream or sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._logger.addHandler(handler)
+
+    def export(self, span: Dict[str, Any]) -> None:
+        self._logger.info(json.dumps({"span": span}, default=str))
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the most recent max_spans spans in process; nothing else reads them."""
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            spans = list(self._spans)
+        return (
+            spans
+            if trace_id is None
+            else [s for s in spans if s["trace_id"] == trace_id]
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans as JSON lines; writes are buffered and flushed on shutdown."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict[str, Any]) -> None:
+        line = json.dumps(span, default=str) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._file = open(self.path, "a", buffering=64 * 1024)
+                self._file.write(line)
+            except OSError as e:
+                logging.getLogger("app").error(
+                    f"Failed to export span to {self.path}: {e}"
+                )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def create_exporter() -> SpanExporter:
+    """Build the exporter selected by settings.TRACING_EXPORTER"""
+    if not settings.TRACING_ENABLED or settings.TRACING_EXPORTER == "none":
+        return NoOpSpanExporter()
+    if settings.TRACING_EXPORTER == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if settings.TRACING_EXPORTER == "memory":
+        return InMemorySpanExporter(max_spans=settings.TRACING_MEMORY_MAX_SPANS)
+    return LogSpanExporter()
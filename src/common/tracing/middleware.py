@@ -0,0 +1,55 @@
+from typing import Any, Dict
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from .context import current_span, parse_traceparent
+from .tracer import Tracer, tracer as default_tracer
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening the root span of every HTTP request.
+
+    Continues the caller's trace when a valid traceparent header is sent,
+    otherwise starts a new one. The span is named after the matched route
+    template once routing has run, e.g. "GET /v1/relationships/students/{student_id}".
+    The response carries a traceresponse header so callers can find the trace.
+    """
+
+    def __init__(self, app: Any, tracer: Tracer = default_tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = parse_traceparent(Headers(scope=scope).get("traceparent"))
+        span = self.tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            parent=parent,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        )
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                MutableHeaders(scope=message)["traceresponse"] = span.traceparent()
+                if message["status"] >= 500:
+                    span.status = "error"
+            await send(message)
+
+        token = current_span.set(span)
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            current_span.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                span.name = f"{scope['method']} {route}"
+                span.set_attribute("http.route", route)
+            self.tracer.end(span)
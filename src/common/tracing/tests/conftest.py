@@ -0,0 +1,46 @@
+"""
+Test configuration for tracing
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.config import settings
+from ..exporters import InMemorySpanExporter
+from ..middleware import TracingMiddleware
+from ..tracer import traced, tracer
+
+
+@pytest.fixture
+def span_exporter():
+    """Fixture installing an in-memory exporter that samples every new trace."""
+    exporter = InMemorySpanExporter()
+    previous = tracer.exporter, tracer.sample_rate
+    tracer.exporter, tracer.sample_rate = exporter, 1.0
+    yield exporter
+    tracer.exporter, tracer.sample_rate = previous
+
+
+@pytest.fixture
+def tracing_enabled(monkeypatch):
+    """Fixture turning on settings.TRACING_ENABLED for handler registration."""
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+
+
+@traced("Service.load")
+def load(student_id: str) -> dict:
+    return {"StudentId": student_id}
+
+
+@pytest.fixture
+def traced_client():
+    """Fixture for an app with one route calling a traced service method."""
+    app = FastAPI()
+
+    @app.get("/students/{student_id}")
+    def get_student(student_id: str):
+        return load(student_id)
+
+    app.add_middleware(TracingMiddleware)
+    return TestClient(app)
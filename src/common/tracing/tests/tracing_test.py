@@ -0,0 +1,150 @@
+import io
+import json
+import logging
+
+import boto3
+import pytest
+from botocore.awsrequest import AWSResponse
+from botocore.stub import Stubber
+
+from common.loggers.logging_config import JsonFormatter
+from ..botocore_hooks import register_tracing_handlers
+from ..context import current_span, parse_traceparent
+from ..exporters import FileSpanExporter, LogSpanExporter
+from ..tracer import tracer
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (f"00-{TRACE_ID}-{PARENT_ID}-01", (TRACE_ID, PARENT_ID, True)),
+        (f"00-{TRACE_ID}-{PARENT_ID}-00", (TRACE_ID, PARENT_ID, False)),
+        (f"00-{'0' * 32}-{PARENT_ID}-01", None),
+        (f"ff-{TRACE_ID}-{PARENT_ID}-01", None),
+        ("garbage", None),
+        (None, None),
+    ],
+)
+def test_parse_traceparent(header, expected):
+    assert parse_traceparent(header) == expected
+
+
+def test_request_continues_incoming_trace(traced_client, span_exporter):
+    """Test the route and service spans join the caller's sampled trace"""
+    response = traced_client.get(
+        "/students/S001", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+    )
+
+    spans = {span["name"]: span for span in span_exporter.spans(TRACE_ID)}
+    root = spans["GET /students/{student_id}"]
+    assert root["parent_id"] == PARENT_ID
+    assert root["attributes"]["http.status_code"] == 200
+    assert spans["Service.load"]["parent_id"] == root["span_id"]
+    assert response.headers["traceresponse"] == f"00-{TRACE_ID}-{root['span_id']}-01"
+
+
+def test_unsampled_request_exports_nothing(traced_client, span_exporter):
+    """Test a caller's sampled=0 decision is honoured"""
+    traced_client.get(
+        "/students/S001", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-00"}
+    )
+
+    assert span_exporter.spans() == []
+
+
+def test_log_records_carry_trace_ids(span_exporter):
+    """Test JsonFormatter adds the active trace and span ids"""
+    span = tracer.start_trace("test", parent=(TRACE_ID, PARENT_ID, False))
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello", None, None)
+    token = current_span.set(span)
+    try:
+        entry = json.loads(
+            JsonFormatter().format(record)[len("\x1b[34;20m") : -len("\x1b[0m")]
+        )
+    finally:
+        current_span.reset(token)
+
+    assert entry["trace_id"] == TRACE_ID
+    assert entry["span_id"] == span.span_id
+
+
+def test_botocore_calls_get_spans(span_exporter, tracing_enabled):
+    """Test each AWS API call becomes a child span with its request id"""
+    client = boto3.client(
+        "dynamodb",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    register_tracing_handlers(client)
+    root = tracer.start_trace("test", parent=(TRACE_ID, PARENT_ID, True))
+    token = current_span.set(root)
+    try:
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                "list_tables",
+                {"TableNames": [], "ResponseMetadata": {"RequestId": "R1"}},
+            )
+            client.list_tables()
+    finally:
+        current_span.reset(token)
+
+    (span,) = span_exporter.spans(TRACE_ID)
+    assert span["name"] == "dynamodb.ListTables"
+    assert span["parent_id"] == root.span_id
+    assert span["attributes"]["aws.request_id"] == "R1"
+
+
+class _RawBody:
+    def stream(self, **kwargs):
+        yield b'{"TableNames": []}'
+
+
+@pytest.mark.parametrize("sampled", [True, False])
+def test_botocore_requests_carry_traceparent(span_exporter, tracing_enabled, sampled):
+    """Test each HTTP attempt sends the AWS span, or the unsampled parent, downstream"""
+    client = boto3.client(
+        "dynamodb",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    register_tracing_handlers(client)
+    sent = []
+
+    def respond(request, **kwargs):
+        sent.append(request.headers.get("traceparent"))
+        return AWSResponse(request.url, 200, {}, _RawBody())
+
+    client.meta.events.register("before-send", respond)
+    root = tracer.start_trace("test", parent=(TRACE_ID, PARENT_ID, sampled))
+    token = current_span.set(root)
+    try:
+        client.list_tables()
+    finally:
+        current_span.reset(token)
+
+    if sampled:
+        (span,) = span_exporter.spans(TRACE_ID)
+        assert sent == [f"00-{TRACE_ID}-{span['span_id']}-01"]
+    else:
+        assert sent == [root.traceparent()]
+
+
+def test_log_exporter_writes_json_lines():
+    stream = io.StringIO()
+    LogSpanExporter(stream).export({"name": "a", "trace_id": TRACE_ID})
+
+    assert json.loads(stream.getvalue())["span"]["name"] == "a"
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    exporter = FileSpanExporter(str(tmp_path / "spans.jsonl"))
+    exporter.export({"name": "a", "trace_id": TRACE_ID})
+    exporter.shutdown()
+
+    lines = (tmp_path / "spans.jsonl").read_text().splitlines()
+    assert json.loads(lines[0])["name"] == "a"
@@ -0,0 +1,166 @@
+import functools
+import inspect
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from common.config import settings
+from .context import SpanContext, current_span, new_span_id, new_trace_id
+from .exporters import NoOpSpanExporter, SpanExporter, create_exporter
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span(SpanContext):
+    """A timed operation within a trace. Only sampled spans are exported."""
+
+    __slots__ = (
+        "name",
+        "parent_id",
+        "attributes",
+        "status",
+        "start_ns",
+        "duration_ns",
+        "_started",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        sampled: bool,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(trace_id, new_span_id(), sampled)
+        self.name = name
+        self.parent_id = parent_id
+        self.attributes = attributes or {}
+        self.status = "ok"
+        self.start_ns = time.time_ns()
+        self.duration_ns: Optional[int] = None
+        self._started = time.perf_counter_ns()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.attributes["error.type"] = type(error).__name__
+        self.attributes["error.message"] = str(error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": None if self.duration_ns is None else self.duration_ns / 1e6,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to an exporter.
+
+    The sampling decision is made once per trace, at the root: an incoming
+    traceparent's sampled flag is honoured, otherwise sample_rate applies.
+    Unsampled requests still get a trace id for log correlation, but child
+    spans are not created, so instrumented code costs one contextvar lookup.
+    """
+
+    def __init__(
+        self, exporter: Optional[SpanExporter] = None, sample_rate: float = 0.0
+    ):
+        self.exporter = exporter or NoOpSpanExporter()
+        self.sample_rate = sample_rate
+
+    def start_trace(
+        self,
+        name: str,
+        parent: Optional[Tuple[str, str, bool]] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> Span:
+        """Root span of a request, continuing parent (from parse_traceparent) if given."""
+        if parent is None:
+            trace_id, parent_id = new_trace_id(), None
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        else:
+            trace_id, parent_id, sampled = parent
+        return Span(name, trace_id, parent_id, sampled, attributes)
+
+    def start_span(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None
+    ) -> Optional[Span]:
+        """Child of the active span, or None when the active trace is not sampled."""
+        parent = current_span.get()
+        if parent is None or not parent.sampled:
+            return None
+        return Span(name, parent.trace_id, parent.span_id, True, attributes)
+
+    def end(self, span: Span) -> None:
+        span.duration_ns = time.perf_counter_ns() - span._started
+        if span.sampled:
+            self.exporter.export(span.to_dict())
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Run a block inside a child span that becomes the active span."""
+        span = self.start_span(name, attributes)
+        if span is None:
+            yield None
+            return
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            current_span.reset(token)
+            self.end(span)
+
+    def shutdown(self) -> None:
+        self.exporter.shutdown()
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator wrapping each call in a span named name (default: qualified name)."""
+
+    def decorate(fn: F) -> F:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                parent = current_span.get()
+                if parent is None or not parent.sampled:
+                    return await fn(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            parent = current_span.get()
+            if parent is None or not parent.sampled:
+                return fn(*args, **kwargs)
+            with tracer.span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+# Module-level singleton instance
+tracer = Tracer(
+    exporter=create_exporter(),
+    sample_rate=settings.TRACING_SAMPLE_RATE if settings.TRACING_ENABLED else 0.0,
+)
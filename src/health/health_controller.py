@@ -1,5 +1,6 @@
 from fastapi import APIRouter, status, Depends
 
+from common.responses import FastJSONResponse
 from .schemas import HealthCheckResponse
 from .health_service import HealthService, get_health_service
 
@@ -16,6 +17,6 @@ router = APIRouter()
 )
 async def get_health(
     health_service: HealthService = Depends(get_health_service),
-) -> HealthCheckResponse:
+) -> FastJSONResponse:
     health_status = await health_service.check_health()
-    return HealthCheckResponse(status=health_status["status"])
+    return FastJSONResponse(HealthCheckResponse(status=health_status["status"]))
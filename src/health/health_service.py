@@ -1,25 +1,42 @@
 from fastapi import Depends
+from common.aws_io import AwsIoExecutor, health_io_executor
 from common.loggers import logger
+from common.tracing import traced
 from .interfaces import HealthServiceInterface
 
 from common.exceptions import InternalServiceError
 from common.databases.dynamoDB import (
+    AsyncDynamoDBClientService,
     DynamoDBClientServiceInterface,
     get_dynamodb_client_service,
 )
 
 
 class HealthService(HealthServiceInterface):
-    def __init__(self, dynamodb_client_service: DynamoDBClientServiceInterface):
+    def __init__(
+        self,
+        dynamodb_client_service: DynamoDBClientServiceInterface,
+        executor: AwsIoExecutor = health_io_executor,
+    ):
         self.dynamodb_client = dynamodb_client_service.get_client()
+        # Not aws_io_executor: /healthz bypasses admission, so the probe must
+        # not queue behind request traffic for the shared pool's threads
+        self.async_dynamodb = AsyncDynamoDBClientService(
+            dynamodb_client_service, executor=executor
+        )
 
+    @traced("HealthService.check_health")
     async def check_health(self) -> dict:
-        logger.info("Perform health check")
+        logger.info("Perform health check", extra={"log_key": "health.check"})
 
         try:
             # Lightweight operation to verify connection
-            response = self.dynamodb_client.meta.client.list_tables(Limit=1)
-            logger.info({"dynamodb_list_table_response": response})
+            response = await self.async_dynamodb.list_tables(Limit=1)
+            logger.debug(
+                "Health check listed %d tables",
+                len(response.get("TableNames", [])),
+                extra={"log_key": "health.tables"},
+            )
             if "TableNames" in response:
                 return {"status": "OK"}
             else:
@@ -1,5 +1,13 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
 import pytest
+
+from common.aws_io import AwsIoExecutor
+from common.config import settings
 from common.exceptions import InternalServiceError
+from ..health_service import HealthService
 
 
 @pytest.mark.asyncio
@@ -48,3 +56,46 @@ async def test_check_health_verifies_table_names(health_service, mock_dynamodb_c
 
     assert result == {"status": "OK"}
     mock_dynamodb_client.meta.client.list_tables.assert_called_once_with(Limit=1)
+
+
+@pytest.mark.asyncio
+async def test_check_health_log_lines_have_own_keys(health_service):
+    """Test the debug line is not rate limited together with the info line"""
+    with patch("health.health_service.logger") as logger:
+        await health_service.check_health()
+
+    info_key = logger.info.call_args.kwargs["extra"]["log_key"]
+    debug_key = logger.debug.call_args.kwargs["extra"]["log_key"]
+    assert info_key == "health.check"
+    assert debug_key == "health.tables"
+    assert debug_key in settings.LOG_RATE_LIMITS
+
+
+@pytest.mark.asyncio
+async def test_check_health_with_saturated_aws_io_pool(
+    mock_dynamodb_client_service, mock_dynamodb_client
+):
+    """Test the probe answers while every shared AWS I/O thread is busy"""
+    shared = AwsIoExecutor(max_workers=1)
+    own = AwsIoExecutor(max_workers=1, thread_name_prefix="health-io")
+    release = threading.Event()
+    threads = []
+    mock_dynamodb_client.meta.client.list_tables.side_effect = lambda **kwargs: (
+        threads.append(threading.current_thread().name) or {"TableNames": []}
+    )
+    busy = asyncio.ensure_future(shared.run(release.wait))
+    try:
+        healthy = HealthService(mock_dynamodb_client_service, executor=own)
+        result = await asyncio.wait_for(healthy.check_health(), timeout=1)
+
+        starved = HealthService(mock_dynamodb_client_service, executor=shared)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(starved.check_health(), timeout=0.2)
+    finally:
+        release.set()
+        await busy
+        shared.shutdown()
+        own.shutdown()
+
+    assert result == {"status": "OK"}
+    assert threads[0].startswith("health-io")
@@ -1,12 +1,35 @@
+import asyncio
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
 from health import health_controller
+from relationships import relationships_controller
 from common.s3 import s3_controller
 from common.config import settings
-from common.loggers import logger
+from common.loggers import flush_logs, log_limiter, logger
+from common.aws_io import (
+    aws_io_executor,
+    health_io_executor,
+    install_blocking_call_detector,
+)
+from common.responses import FastJSONResponse
+from common.compression import CompressionMiddleware, compression_executor
+from common.profiling import ProfilingMiddleware
+from common.tracing import TracingMiddleware, tracer
+from common.metrics import metrics_controller, metrics_registry
+from common.diagnostics import MemoryAccountingMiddleware, diagnostics_controller
+from common.resilience import (
+    AdmissionMiddleware,
+    DeadlineMiddleware,
+    admission_controller,
+    dynamodb_read_executor,
+)
 from common.databases.dynamoDB import (
     dynamodb_client_service,
+    relationship_archive,
+    relationship_table,
+    student_teacher_relationship_planner,
+    student_teacher_relationship_replica,
 )
 
 
@@ -17,13 +40,32 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Initialize DynamoDB client once
     logger.info("Starting application...")
+    detect_blocking = settings.BLOCKING_CALL_DETECTOR
+    if detect_blocking if detect_blocking is not None else settings.DEBUG:
+        install_blocking_call_detector(
+            asyncio.get_running_loop(), settings.EVENT_LOOP_SLOW_CALLBACK_SECONDS
+        )
     dynamodb_client_service.initialize()
+    if settings.RELATIONSHIP_REPLICA_ENABLED:
+        student_teacher_relationship_replica.start(
+            relationship_table(dynamodb_client_service.get_client())
+        )
 
     yield  # Application runs here
 
     # Shutdown: Clean up resources
     logger.info("Shutting down application...")
+    student_teacher_relationship_replica.stop()
+    student_teacher_relationship_planner.shutdown()
+    if relationship_archive is not None:
+        relationship_archive.shutdown()
+    dynamodb_read_executor.shutdown()
+    aws_io_executor.shutdown()
+    health_io_executor.shutdown()
+    compression_executor.shutdown()
+    tracer.shutdown()
     dynamodb_client_service.close()
+    flush_logs()
 
 
 DOCS = f"""
@@ -32,9 +74,34 @@ This project is a fastAPI + uv + AWS boto3 backend python project.
 """
 
 app = FastAPI(
-    title="Python FastAPI Service", description=DOCS, version="1.0.0", lifespan=lifespan
+    title="Python FastAPI Service",
+    description=DOCS,
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+app.add_middleware(DeadlineMiddleware)
+if settings.DIAGNOSTICS_ENABLED or settings.DEBUG:
+    app.add_middleware(MemoryAccountingMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+# Outside the rest so shed requests cost no tracing, compression or accounting
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+# Outermost so profiles include compression and every other middleware
+if settings.DEBUG or settings.PROFILING_SECRET or settings.PROFILING_SAMPLE_ONE_IN:
+    app.add_middleware(ProfilingMiddleware)
+
+metrics_registry.register("dynamodb_hedging", dynamodb_read_executor.stats)
+metrics_registry.register("aws_io_executor", aws_io_executor.stats)
+metrics_registry.register("health_io_executor", health_io_executor.stats)
+metrics_registry.register("compression", compression_executor.stats)
+metrics_registry.register("logging", log_limiter.stats)
+metrics_registry.register("admission", admission_controller.stats)
+
 app.include_router(
     health_controller.router,
     prefix=f"/v{settings.API_VERSION}",
@@ -44,3 +111,19 @@ app.include_router(
     s3_controller.router,
     prefix=f"/v{settings.API_VERSION}",
 )
+
+app.include_router(
+    relationships_controller.router,
+    prefix=f"/v{settings.API_VERSION}",
+)
+
+app.include_router(
+    metrics_controller.router,
+    prefix=f"/v{settings.API_VERSION}",
+)
+
+if settings.DIAGNOSTICS_ENABLED or settings.DEBUG:
+    app.include_router(
+        diagnostics_controller.router,
+        prefix=f"/v{settings.API_VERSION}",
+    )
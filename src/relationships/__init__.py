@@ -0,0 +1,3 @@
+from .relationships_service import RelationshipsService
+
+__all__ = ["RelationshipsService"]
@@ -0,0 +1,3 @@
+from .relationships_service_interface import RelationshipsServiceInterface
+
+__all__ = ["RelationshipsServiceInterface"]
@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from common.databases.dynamoDB import ReplicaStatus, SearchExplain
+from common.databases.dynamoDB.models import StudentTeacherRelationship
+from ..schemas import (
+    RelationshipListResponse,
+    RelationshipSearchRequest,
+    RelationshipSearchResponse,
+    StudentsPerTeacherResponse,
+    SubjectEnrollmentsResponse,
+)
+
+
+class RelationshipsServiceInterface(ABC):
+    @abstractmethod
+    def student_version(self, student_id: str) -> str:
+        """Return the version marker of a student's relationships, used as ETag."""
+        pass
+
+    @abstractmethod
+    def list_for_student(self, student_id: str) -> RelationshipListResponse:
+        """List all relationships of a student, oldest first."""
+        pass
+
+    @abstractmethod
+    def get(self, student_id: str, created_at: str) -> StudentTeacherRelationship:
+        """Get a single relationship by its primary key."""
+        pass
+
+    @abstractmethod
+    def create(
+        self, relationship: StudentTeacherRelationship
+    ) -> StudentTeacherRelationship:
+        """Store a new relationship and bump the student's version."""
+        pass
+
+    @abstractmethod
+    def delete(self, student_id: str, created_at: str) -> None:
+        """Delete a relationship and bump the student's version."""
+        pass
+
+    @abstractmethod
+    def students_per_teacher(
+        self, teacher_id: Optional[str] = None
+    ) -> StudentsPerTeacherResponse:
+        """Return distinct students per teacher from the maintained counters."""
+        pass
+
+    @abstractmethod
+    def enrollments_per_subject_month(
+        self, month: Optional[str] = None
+    ) -> SubjectEnrollmentsResponse:
+        """Return relationships created per subject and month from the maintained counters."""
+        pass
+
+    @abstractmethod
+    def search(self, request: RelationshipSearchRequest) -> RelationshipSearchResponse:
+        """Search relationships using the cheapest key or index for each filter."""
+        pass
+
+    @abstractmethod
+    def explain(self, request: RelationshipSearchRequest) -> SearchExplain:
+        """Return the query plan and estimated read cost without executing it."""
+        pass
+
+    @abstractmethod
+    def replica_status(self) -> Optional[ReplicaStatus]:
+        """Return freshness and memory footprint of the read replica, if enabled."""
+        pass
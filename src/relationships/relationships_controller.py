@@ -0,0 +1,224 @@
+from fastapi import APIRouter, Header, Query, Response, status, Depends
+from typing import Optional
+
+from common.aws_io import aws_io_executor
+from common.responses import (
+    FastJSONResponse,
+    cache_headers,
+    etag_matches,
+    make_etag,
+    not_modified,
+)
+from common.databases.dynamoDB import ReplicaStatus, SearchExplain
+from common.databases.dynamoDB.models import StudentTeacherRelationship
+from .schemas import (
+    RelationshipListResponse,
+    RelationshipSearchRequest,
+    RelationshipSearchResponse,
+    StudentsPerTeacherResponse,
+    SubjectEnrollmentsResponse,
+)
+from .relationships_service import RelationshipsService, get_relationships_service
+
+router = APIRouter(
+    prefix="/relationships",
+    tags=["relationships"],
+)
+
+
+NOT_MODIFIED_RESPONSE = {
+    status.HTTP_304_NOT_MODIFIED: {
+        "description": "The student's relationships are unchanged since the If-None-Match ETag"
+    }
+}
+
+
+@router.get(
+    "/students/{student_id}",
+    summary="List a student's relationships; supports If-None-Match",
+    response_description="Return the student's relationships with an ETag",
+    status_code=status.HTTP_200_OK,
+    response_model=RelationshipListResponse,
+    responses=NOT_MODIFIED_RESPONSE,
+)
+async def list_student_relationships(
+    student_id: str,
+    if_none_match: Optional[str] = Header(default=None),
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    # A cached version answers an unchanged poll without reading the relationships
+    version = await aws_io_executor.run(
+        relationships_service.student_version, student_id
+    )
+    etag = make_etag(version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    response = await aws_io_executor.run(
+        relationships_service.list_for_student, student_id
+    )
+    if etag_matches(if_none_match, etag, exists=bool(response.items)):
+        return not_modified(etag)
+    return FastJSONResponse(response, headers=cache_headers(etag))
+
+
+@router.get(
+    "/students/{student_id}/{created_at}",
+    summary="Get a single relationship; supports If-None-Match",
+    response_description="Return the relationship with an ETag",
+    status_code=status.HTTP_200_OK,
+    response_model=StudentTeacherRelationship,
+    responses=NOT_MODIFIED_RESPONSE,
+)
+async def get_relationship(
+    student_id: str,
+    created_at: str,
+    if_none_match: Optional[str] = Header(default=None),
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    version = await aws_io_executor.run(
+        relationships_service.student_version, student_id
+    )
+    etag = make_etag(version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    relationship = await aws_io_executor.run(
+        relationships_service.get, student_id, created_at
+    )
+    if etag_matches(if_none_match, etag, exists=True):
+        return not_modified(etag)
+    return FastJSONResponse(relationship, headers=cache_headers(etag))
+
+
+@router.post(
+    "",
+    summary="Create a student teacher relationship",
+    response_description="Return the stored relationship with the student's new ETag",
+    status_code=status.HTTP_201_CREATED,
+    response_model=StudentTeacherRelationship,
+)
+async def create_relationship(
+    relationship: StudentTeacherRelationship,
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    created = await aws_io_executor.run(relationships_service.create, relationship)
+    version = await aws_io_executor.run(
+        relationships_service.student_version, created.StudentId
+    )
+    return FastJSONResponse(
+        created,
+        status_code=status.HTTP_201_CREATED,
+        headers=cache_headers(make_etag(version)),
+    )
+
+
+@router.delete(
+    "/students/{student_id}/{created_at}",
+    summary="Delete a student teacher relationship",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        status.HTTP_409_CONFLICT: {
+            "description": "The relationship is archived, and archived data is read-only"
+        }
+    },
+)
+async def delete_relationship(
+    student_id: str,
+    created_at: str,
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    await aws_io_executor.run(relationships_service.delete, student_id, created_at)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/aggregates/teachers",
+    summary="Count distinct students per teacher from maintained counters",
+    response_description="Return the student count of every teacher",
+    status_code=status.HTTP_200_OK,
+    response_model=StudentsPerTeacherResponse,
+)
+async def get_students_per_teacher(
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    response = await aws_io_executor.run(relationships_service.students_per_teacher)
+    return FastJSONResponse(response)
+
+
+@router.get(
+    "/aggregates/teachers/{teacher_id}",
+    summary="Count distinct students of one teacher from maintained counters",
+    response_description="Return the teacher's student count",
+    status_code=status.HTTP_200_OK,
+    response_model=StudentsPerTeacherResponse,
+)
+async def get_teacher_student_count(
+    teacher_id: str,
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    response = await aws_io_executor.run(
+        relationships_service.students_per_teacher, teacher_id
+    )
+    return FastJSONResponse(response)
+
+
+@router.get(
+    "/aggregates/subjects",
+    summary="Count enrollments per subject and month from maintained counters",
+    response_description="Return enrollments per subject for every month, or one month",
+    status_code=status.HTTP_200_OK,
+    response_model=SubjectEnrollmentsResponse,
+)
+async def get_enrollments_per_subject(
+    month: Optional[str] = Query(
+        default=None, pattern=r"^\d{4}-\d{2}$", description="Month as YYYY-MM"
+    ),
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    response = await aws_io_executor.run(
+        relationships_service.enrollments_per_subject_month, month
+    )
+    return FastJSONResponse(response)
+
+
+@router.post(
+    "/search",
+    summary="Search student teacher relationships; filters are OR-ed and each uses the cheapest key or index",
+    response_description="Return the matching relationships and the executed query plan",
+    status_code=status.HTTP_200_OK,
+    response_model=RelationshipSearchResponse,
+)
+async def search_relationships(
+    request: RelationshipSearchRequest,
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    response = await aws_io_executor.run(relationships_service.search, request)
+    return FastJSONResponse(response)
+
+
+@router.post(
+    "/search/explain",
+    summary="Explain how a relationship search would be executed without running it",
+    response_description="Return the chosen key condition, index and estimated read cost",
+    status_code=status.HTTP_200_OK,
+    response_model=SearchExplain,
+)
+def explain_relationship_search(
+    request: RelationshipSearchRequest,
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    return FastJSONResponse(relationships_service.explain(request))
+
+
+@router.get(
+    "/replica",
+    summary="Report staleness and memory footprint of the in-process read replica",
+    response_description="Return the replica status, or null when the replica is disabled",
+    status_code=status.HTTP_200_OK,
+    response_model=Optional[ReplicaStatus],
+)
+def get_replica_status(
+    relationships_service: RelationshipsService = Depends(get_relationships_service),
+):
+    return relationships_service.replica_status()
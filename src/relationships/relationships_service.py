@@ -0,0 +1,385 @@
+from typing import Any, Callable, Dict, List, Optional
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+from fastapi import Depends
+
+from common.config import settings
+from common.loggers import logger
+from common.exceptions import (
+    ArchivedError,
+    ConflictError,
+    CustomError,
+    InternalServiceError,
+    NotFoundError,
+)
+from common.resilience import dynamodb_read_executor
+from common.tracing import traced
+from common.databases.dynamoDB import (
+    DynamoDBClientServiceInterface,
+    FilterSpec,
+    QueryPlanner,
+    RelationshipAggregates,
+    RelationshipArchive,
+    ReplicaStatus,
+    SearchExplain,
+    TableReplica,
+    VersionStore,
+    get_dynamodb_client_service,
+    relationship_aggregates,
+    relationship_archive,
+    relationship_table,
+    relationship_version_store,
+    student_teacher_relationship_planner,
+    student_teacher_relationship_replica,
+)
+from common.databases.dynamoDB.models import (
+    StudentTeacherRelationship,
+    RELATIONSHIP_AGGREGATE_TABLE_NAME,
+    RELATIONSHIP_VERSION_TABLE_NAME,
+)
+
+from .interfaces import RelationshipsServiceInterface
+from .schemas import (
+    RelationshipListResponse,
+    RelationshipSearchRequest,
+    RelationshipSearchResponse,
+    StudentsPerTeacherResponse,
+    SubjectEnrollmentsResponse,
+)
+
+
+def _to_models(items: List[Dict[str, Any]]) -> List[StudentTeacherRelationship]:
+    # Items were validated when written; skip re-validating every read
+    return [StudentTeacherRelationship.model_construct(**item) for item in items]
+
+
+class RelationshipsService(RelationshipsServiceInterface):
+    def __init__(
+        self,
+        dynamodb_client_service: DynamoDBClientServiceInterface,
+        planner: QueryPlanner = student_teacher_relationship_planner,
+        replica: Optional[TableReplica] = None,
+        versions: VersionStore = relationship_version_store,
+        aggregates: Optional[RelationshipAggregates] = None,
+        archive: Optional[RelationshipArchive] = None,
+    ):
+        client = dynamodb_client_service.get_client()
+        # Speaks the model's attribute names whatever the storage layout
+        self.table = relationship_table(client)
+        self.versions_table = client.Table(RELATIONSHIP_VERSION_TABLE_NAME)
+        self.aggregates_table = client.Table(RELATIONSHIP_AGGREGATE_TABLE_NAME)
+        self.planner = planner
+        self.replica = replica
+        self.versions = versions
+        self.aggregates = aggregates
+        self.archive = archive
+
+    @traced("RelationshipsService.student_version")
+    def student_version(self, student_id: str) -> str:
+        """
+        Return the version marker of a student's relationships.
+
+        Read before the data it describes, so a concurrent write can only
+        make the returned ETag older than the body, never newer.
+
+        Raises:
+            InternalServiceError: If the marker cannot be read
+        """
+        try:
+            return self.versions.current(self.versions_table, student_id)
+        except CustomError:
+            raise
+        except Exception as e:
+            message = "Failed to read relationship version"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+
+    @traced("RelationshipsService.list_for_student")
+    def list_for_student(self, student_id: str) -> RelationshipListResponse:
+        """
+        List all relationships of a student, oldest first.
+
+        Raises:
+            InternalServiceError: If DynamoDB query fails
+        """
+        plan = self.planner.plan(FilterSpec(equals={"StudentId": student_id}))
+        try:
+            items = self.planner.execute(self.table, plan)
+        except CustomError:
+            raise
+        except Exception as e:
+            message = "Failed to list student teacher relationships"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+        return RelationshipListResponse(items=_to_models(items))
+
+    @traced("RelationshipsService.get")
+    def get(self, student_id: str, created_at: str) -> StudentTeacherRelationship:
+        """
+        Get a single relationship by its primary key, from the archive if
+        it was moved there.
+
+        Raises:
+            NotFoundError: If the relationship does not exist
+            InternalServiceError: If DynamoDB or archive read fails
+        """
+        try:
+            response = dynamodb_read_executor.call(
+                "GetItem",
+                self.table.get_item,
+                Key={"StudentId": student_id, "CreatedAt": created_at},
+            )
+        except CustomError:
+            raise
+        except Exception as e:
+            message = "Failed to get student teacher relationship"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+
+        item = response.get("Item")
+        if item is None and self.archive is not None:
+            item = self._read_archive(self.archive.get, student_id, created_at)
+        if item is None:
+            raise NotFoundError("Relationship")
+        return StudentTeacherRelationship.model_construct(**item)
+
+    @traced("RelationshipsService.create")
+    def create(
+        self, relationship: StudentTeacherRelationship
+    ) -> StudentTeacherRelationship:
+        """
+        Store a new relationship and bump the student's version. A key that
+        was moved to the archive stays taken.
+
+        Raises:
+            ConflictError: If a relationship with the same key already exists
+            ArchivedError: If a relationship with the same key was archived
+            InternalServiceError: If DynamoDB write or archive read fails
+        """
+        if self.archive is not None and self._read_archive(
+            self.archive.get, relationship.StudentId, relationship.CreatedAt
+        ):
+            raise ArchivedError("Relationship")
+        try:
+            self.table.put_item(
+                Item=relationship.model_dump(exclude_none=True),
+                ConditionExpression=Attr("StudentId").not_exists(),
+            )
+        except CustomError:
+            raise
+        except Exception as e:
+            if (
+                isinstance(e, ClientError)
+                and e.response["Error"]["Code"] == "ConditionalCheckFailedException"
+            ):
+                raise ConflictError("Relationship") from e
+            message = "Failed to create student teacher relationship"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+        self._bump(relationship.StudentId)
+        item = relationship.model_dump(exclude_none=True)
+        if self.replica is not None:
+            self.replica.apply(item)
+        self._count("record_created", item)
+        return relationship
+
+    @traced("RelationshipsService.delete")
+    def delete(self, student_id: str, created_at: str) -> None:
+        """
+        Delete a relationship and bump the student's version. Archived
+        relationships are read-only.
+
+        Raises:
+            NotFoundError: If the relationship does not exist
+            ArchivedError: If the relationship was moved to the archive
+            InternalServiceError: If DynamoDB delete or archive read fails
+        """
+        try:
+            response = self.table.delete_item(
+                Key={"StudentId": student_id, "CreatedAt": created_at},
+                ReturnValues="ALL_OLD",
+            )
+        except CustomError:
+            raise
+        except Exception as e:
+            message = "Failed to delete student teacher relationship"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+
+        if "Attributes" not in response:
+            if self.archive is not None and self._read_archive(
+                self.archive.get, student_id, created_at
+            ):
+                raise ArchivedError("Relationship")
+            raise NotFoundError("Relationship")
+        self._bump(student_id)
+        if self.replica is not None:
+            self.replica.discard(student_id, created_at)
+        self._count("record_deleted", response["Attributes"])
+
+    def _bump(self, student_id: str) -> None:
+        # The relationship write already succeeded, so it is not reported as
+        # failed; the student's ETag stays stale until its next successful bump
+        try:
+            self.versions.bump(self.versions_table, student_id)
+        except Exception as e:
+            logger.error(f"Failed to bump version of student {student_id}: {e}")
+
+    def _count(self, action: str, item: Dict[str, Any]) -> None:
+        # The relationship write already succeeded; a failed counter update is
+        # logged and left for the aggregates rebuild to reconcile
+        if self.aggregates is None:
+            return
+        try:
+            getattr(self.aggregates, action)(self.aggregates_table, item)
+        except Exception as e:
+            logger.error(f"Failed to update relationship aggregates: {e}")
+
+    def _require_aggregates(self) -> RelationshipAggregates:
+        if self.aggregates is None:
+            raise NotFoundError("Relationship aggregates")
+        return self.aggregates
+
+    @traced("RelationshipsService.students_per_teacher")
+    def students_per_teacher(
+        self, teacher_id: Optional[str] = None
+    ) -> StudentsPerTeacherResponse:
+        """
+        Distinct students per teacher, read from the aggregates table.
+
+        Raises:
+            NotFoundError: If relationship aggregates are disabled
+            InternalServiceError: If DynamoDB read fails
+        """
+        aggregates = self._require_aggregates()
+        try:
+            items = aggregates.students_per_teacher(self.aggregates_table, teacher_id)
+        except CustomError:
+            raise
+        except Exception as e:
+            message = "Failed to read students per teacher"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+        return StudentsPerTeacherResponse(items=items)
+
+    @traced("RelationshipsService.enrollments_per_subject_month")
+    def enrollments_per_subject_month(
+        self, month: Optional[str] = None
+    ) -> SubjectEnrollmentsResponse:
+        """
+        Relationships created per subject and month, read from the aggregates table.
+
+        Raises:
+            NotFoundError: If relationship aggregates are disabled
+            InternalServiceError: If DynamoDB query fails
+        """
+        aggregates = self._require_aggregates()
+        try:
+            items = aggregates.enrollments_per_subject_month(
+                self.aggregates_table, month
+            )
+        except CustomError:
+            raise
+        except Exception as e:
+            message = "Failed to read enrollments per subject"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+        return SubjectEnrollmentsResponse(items=items)
+
+    @traced("RelationshipsService.explain")
+    def explain(self, request: RelationshipSearchRequest) -> SearchExplain:
+        specs = [f.to_filter_spec() for f in request.filters]
+        return self.planner.explain(specs, allow_scan=request.allow_scan)
+
+    @traced("RelationshipsService.search")
+    def search(self, request: RelationshipSearchRequest) -> RelationshipSearchResponse:
+        """
+        Search relationships matching any of the requested filters.
+
+        Served from the in-process replica when it is enabled and fresh,
+        otherwise from DynamoDB. Filters whose CreatedAt range reaches back
+        past the archive cutoff also read the matching archived months;
+        filters without a CreatedAt range only see the table.
+
+        Raises:
+            ValidationError: If a filter would need a full scan and allow_scan is False
+            InternalServiceError: If DynamoDB query or archive read fails
+        """
+        specs = [f.to_filter_spec() for f in request.filters]
+        if self.replica is not None and self.replica.is_fresh():
+            # Planning still enforces the scan guard and reports the DynamoDB cost saved
+            explain = self.explain(request)
+            return self._with_archive(
+                specs, self.replica.search(specs), explain, source="replica"
+            )
+
+        try:
+            items, explain = self.planner.search(
+                self.table, specs, allow_scan=request.allow_scan
+            )
+        except CustomError:
+            raise
+        except Exception as e:
+            message = "Failed to search student teacher relationships"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+
+        return self._with_archive(specs, items, explain, source="dynamodb")
+
+    def _read_archive(self, read: Callable[..., Any], *args: Any) -> Any:
+        try:
+            return read(*args)
+        except Exception as e:
+            message = "Failed to read relationship archive"
+            logger.error(f"{message}: {e}")
+            raise InternalServiceError(message) from e
+
+    def _with_archive(
+        self,
+        specs: List[FilterSpec],
+        items: List[Dict[str, Any]],
+        explain: SearchExplain,
+        source: str,
+    ) -> RelationshipSearchResponse:
+        archived: List[Dict[str, Any]] = []
+        archive = self.archive
+        if archive is not None and self._read_archive(
+            lambda: any(map(archive.covers, specs))
+        ):
+            # Items mid-archive can be in both places; the table copy wins
+            keys = {(item["StudentId"], item["CreatedAt"]) for item in items}
+            archived = [
+                item
+                for item in self._read_archive(archive.search, specs)
+                if (item["StudentId"], item["CreatedAt"]) not in keys
+            ]
+        return RelationshipSearchResponse(
+            items=_to_models(items + archived),
+            explain=explain,
+            source=source,
+            archived_items=len(archived),
+        )
+
+    def replica_status(self) -> Optional[ReplicaStatus]:
+        return None if self.replica is None else self.replica.status()
+
+
+def get_relationships_service(
+    dynamodb_client_service: DynamoDBClientServiceInterface = Depends(
+        get_dynamodb_client_service
+    ),
+) -> RelationshipsService:
+    replica = (
+        student_teacher_relationship_replica
+        if settings.RELATIONSHIP_REPLICA_ENABLED
+        else None
+    )
+    aggregates = (
+        relationship_aggregates if settings.RELATIONSHIP_AGGREGATES_ENABLED else None
+    )
+    return RelationshipsService(
+        dynamodb_client_service,
+        replica=replica,
+        aggregates=aggregates,
+        archive=relationship_archive,
+    )
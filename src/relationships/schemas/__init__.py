@@ -0,0 +1,17 @@
+from .relationships_schemas import (
+    RelationshipFilter,
+    RelationshipListResponse,
+    RelationshipSearchRequest,
+    RelationshipSearchResponse,
+    StudentsPerTeacherResponse,
+    SubjectEnrollmentsResponse,
+)
+
+__all__ = [
+    "RelationshipFilter",
+    "RelationshipListResponse",
+    "RelationshipSearchRequest",
+    "RelationshipSearchResponse",
+    "StudentsPerTeacherResponse",
+    "SubjectEnrollmentsResponse",
+]
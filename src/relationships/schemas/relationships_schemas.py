@@ -0,0 +1,77 @@
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from common.databases.dynamoDB import (
+    FilterSpec,
+    RangeCondition,
+    SearchExplain,
+    SubjectMonthCount,
+    TeacherStudentCount,
+)
+from common.databases.dynamoDB.models import StudentTeacherRelationship
+
+
+class RelationshipFilter(BaseModel):
+    """Predicates on a single relationship; all provided fields must match."""
+
+    StudentId: Optional[str] = None
+    TeacherId: Optional[str] = None
+    Subject: Optional[str] = None
+    CreatedFrom: Optional[str] = Field(
+        default=None, description="Inclusive lower bound on CreatedAt (ISO format)"
+    )
+    CreatedTo: Optional[str] = Field(
+        default=None, description="Inclusive upper bound on CreatedAt (ISO format)"
+    )
+
+    def to_filter_spec(self) -> FilterSpec:
+        equals = {
+            name: value
+            for name, value in (
+                ("StudentId", self.StudentId),
+                ("TeacherId", self.TeacherId),
+                ("Subject", self.Subject),
+            )
+            if value is not None
+        }
+        ranges = {}
+        if self.CreatedFrom is not None or self.CreatedTo is not None:
+            ranges["CreatedAt"] = RangeCondition(
+                gte=self.CreatedFrom, lte=self.CreatedTo
+            )
+        return FilterSpec(equals=equals, ranges=ranges)
+
+
+class RelationshipSearchRequest(BaseModel):
+    filters: List[RelationshipFilter] = Field(
+        ...,
+        min_length=1,
+        description="Filters are OR-ed together; fields within a filter are AND-ed",
+    )
+    allow_scan: bool = Field(
+        default=False,
+        description="Allow a full table scan when no key or index matches a filter",
+    )
+
+
+class RelationshipSearchResponse(BaseModel):
+    items: List[StudentTeacherRelationship]
+    explain: SearchExplain
+    source: Literal["dynamodb", "replica"] = Field(
+        default="dynamodb", description="Where the items were read from"
+    )
+    archived_items: int = Field(
+        default=0, description="How many of the items were read from the cold archive"
+    )
+
+
+class RelationshipListResponse(BaseModel):
+    items: List[StudentTeacherRelationship]
+
+
+class StudentsPerTeacherResponse(BaseModel):
+    items: List[TeacherStudentCount]
+
+
+class SubjectEnrollmentsResponse(BaseModel):
+    items: List[SubjectMonthCount]
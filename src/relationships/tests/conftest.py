@@ -0,0 +1,81 @@
+"""
+Test configuration for Relationships Service
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from common.config import settings
+from common.resilience import HedgedExecutor
+from common.databases.dynamoDB import (
+    InMemoryDynamoDBClientService,
+    RelationshipAggregates,
+    VersionStore,
+)
+from common.databases.dynamoDB.interfaces import DynamoDBClientServiceInterface
+from .. import relationships_controller
+from ..relationships_service import RelationshipsService, get_relationships_service
+
+
+@pytest.fixture
+def relationship_item():
+    """Fixture for a stored relationship item."""
+    return {
+        "StudentId": "S001",
+        "CreatedAt": "2024-10-08T10:30:00+00:00",
+        "TeacherId": "T001",
+        "Subject": "Mathematics",
+        "StudentName": "Jane Doe",
+        "TeacherName": "Mr. John Smith",
+    }
+
+
+@pytest.fixture
+def mock_table(relationship_item):
+    """Fixture for mocked relationships table."""
+    table = MagicMock()
+    table.query.return_value = {"Items": [relationship_item]}
+    return table
+
+
+@pytest.fixture
+def mock_dynamodb_client_service(mock_table):
+    """Fixture for mocked DynamoDB client service."""
+    mock_service = MagicMock(spec=DynamoDBClientServiceInterface)
+    mock_service.get_client.return_value.Table.return_value = mock_table
+    return mock_service
+
+
+@pytest.fixture
+def relationships_service(mock_dynamodb_client_service):
+    """Fixture for RelationshipsService with mocked DynamoDB client service."""
+    return RelationshipsService(dynamodb_client_service=mock_dynamodb_client_service)
+
+
+@pytest.fixture
+def memory_relationships_service():
+    """Fixture for RelationshipsService over the in-memory backend."""
+    versions = VersionStore(
+        hash_key="StudentId", cache_seconds=60, executor=HedgedExecutor()
+    )
+    aggregates = RelationshipAggregates(scan_segments=1, executor=HedgedExecutor())
+    return RelationshipsService(
+        dynamodb_client_service=InMemoryDynamoDBClientService(),
+        versions=versions,
+        aggregates=aggregates,
+    )
+
+
+@pytest.fixture
+def relationships_client(memory_relationships_service):
+    """Fixture for a test client over the relationships routes."""
+    app = FastAPI()
+    app.include_router(
+        relationships_controller.router, prefix=f"/v{settings.API_VERSION}"
+    )
+    app.dependency_overrides[get_relationships_service] = lambda: (
+        memory_relationships_service
+    )
+    return TestClient(app)
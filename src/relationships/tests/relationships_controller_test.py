@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+from common.config import settings
+
+PREFIX = f"/v{settings.API_VERSION}/relationships"
+
+
+def test_conditional_get_returns_304(relationships_client, relationship_item):
+    """Test an unchanged student list is answered with 304 and no query"""
+    created = relationships_client.post(PREFIX, json=relationship_item)
+    etag = created.headers["etag"]
+
+    listed = relationships_client.get(f"{PREFIX}/students/S001")
+    assert listed.headers["etag"] == etag
+    assert len(listed.json()["items"]) == 1
+
+    with patch(
+        "relationships.relationships_service.RelationshipsService.list_for_student"
+    ) as list_for_student:
+        response = relationships_client.get(
+            f"{PREFIX}/students/S001", headers={"If-None-Match": etag}
+        )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    list_for_student.assert_not_called()
+
+
+def test_write_changes_etag(relationships_client, relationship_item):
+    """Test a delete invalidates the ETag held by polling clients"""
+    etag = relationships_client.post(PREFIX, json=relationship_item).headers["etag"]
+    item_path = f"{PREFIX}/students/S001/{relationship_item['CreatedAt']}"
+
+    assert (
+        relationships_client.get(item_path, headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+    assert relationships_client.delete(item_path).status_code == 204
+
+    response = relationships_client.get(
+        f"{PREFIX}/students/S001", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["items"] == []
+
+
+def test_wildcard_matches_only_existing_relationships(
+    relationships_client, relationship_item
+):
+    """Test If-None-Match: * is 304 for stored data and never for unknown students"""
+    wildcard = {"If-None-Match": "*"}
+    item_path = f"{PREFIX}/students/S001/{relationship_item['CreatedAt']}"
+
+    assert (
+        relationships_client.get(
+            f"{PREFIX}/students/S001", headers=wildcard
+        ).status_code
+        == 200
+    )
+    assert relationships_client.get(item_path, headers=wildcard).status_code == 404
+
+    relationships_client.post(PREFIX, json=relationship_item)
+
+    assert (
+        relationships_client.get(
+            f"{PREFIX}/students/S001", headers=wildcard
+        ).status_code
+        == 304
+    )
+    assert relationships_client.get(item_path, headers=wildcard).status_code == 304
+
+
+def test_aggregate_routes(relationships_client, relationship_item):
+    relationships_client.post(PREFIX, json=relationship_item)
+    relationships_client.post(PREFIX, json={**relationship_item, "StudentId": "S002"})
+
+    teachers = relationships_client.get(f"{PREFIX}/aggregates/teachers")
+    teacher = relationships_client.get(f"{PREFIX}/aggregates/teachers/T001")
+    subjects = relationships_client.get(
+        f"{PREFIX}/aggregates/subjects", params={"month": "2024-10"}
+    )
+
+    assert teachers.json() == {"items": [{"TeacherId": "T001", "Students": 2}]}
+    assert teacher.json() == teachers.json()
+    assert subjects.json() == {
+        "items": [{"Subject": "Mathematics", "Month": "2024-10", "Enrollments": 2}]
+    }
+    invalid = relationships_client.get(
+        f"{PREFIX}/aggregates/subjects", params={"month": "10"}
+    )
+    assert invalid.status_code == 422
@@ -0,0 +1,304 @@
+import pytest
+from unittest.mock import MagicMock
+from common.exceptions import (
+    ArchivedError,
+    ConflictError,
+    InternalServiceError,
+    NotFoundError,
+    ValidationError,
+)
+from common.config import settings
+from common.databases.dynamoDB import InMemoryDynamoDBClientService
+from common.databases.dynamoDB.models import (
+    StudentTeacherRelationship,
+    STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME,
+)
+from ..relationships_service import RelationshipsService
+from ..schemas import RelationshipFilter, RelationshipSearchRequest
+
+
+def test_search_success(relationships_service, mock_table, relationship_item):
+    """Test search returns typed relationships and the executed plan"""
+    request = RelationshipSearchRequest(
+        filters=[RelationshipFilter(StudentId="S001", Subject="Mathematics")]
+    )
+
+    response = relationships_service.search(request)
+
+    assert [r.StudentId for r in response.items] == [relationship_item["StudentId"]]
+    assert response.explain.plans[0].index_name == "SubjectIndex"
+    assert mock_table.query.call_args.kwargs["IndexName"] == "SubjectIndex"
+
+
+def test_search_refuses_scan(relationships_service, mock_table):
+    """Test search without a key attribute is rejected unless scans are allowed"""
+    request = RelationshipSearchRequest(filters=[RelationshipFilter(Subject="Art")])
+
+    with pytest.raises(ValidationError):
+        relationships_service.search(request)
+    mock_table.scan.assert_not_called()
+
+
+def test_search_failure(relationships_service, mock_table):
+    """Test DynamoDB errors surface as InternalServiceError"""
+    mock_table.query.side_effect = Exception("Connection failed")
+    request = RelationshipSearchRequest(filters=[RelationshipFilter(StudentId="S001")])
+
+    with pytest.raises(InternalServiceError):
+        relationships_service.search(request)
+
+
+def test_explain_does_not_query(relationships_service, mock_table):
+    """Test explain only plans the search"""
+    request = RelationshipSearchRequest(
+        filters=[
+            RelationshipFilter(TeacherId="T001", CreatedFrom="2024-01-01T00:00:00"),
+            RelationshipFilter(StudentId="S001"),
+        ]
+    )
+
+    explain = relationships_service.explain(request)
+
+    assert [p.index_name for p in explain.plans] == ["TeacherIdIndex", None]
+    mock_table.query.assert_not_called()
+
+
+def test_search_served_from_fresh_replica(
+    mock_dynamodb_client_service, mock_table, relationship_item
+):
+    """Test a fresh replica answers searches without querying DynamoDB"""
+    replica = MagicMock()
+    replica.is_fresh.return_value = True
+    replica.search.return_value = [relationship_item]
+    service = RelationshipsService(mock_dynamodb_client_service, replica=replica)
+
+    response = service.search(
+        RelationshipSearchRequest(filters=[RelationshipFilter(StudentId="S001")])
+    )
+
+    assert response.source == "replica"
+    assert len(response.items) == 1
+    mock_table.query.assert_not_called()
+
+
+def test_search_falls_back_when_replica_stale(mock_dynamodb_client_service, mock_table):
+    """Test a stale replica is bypassed"""
+    replica = MagicMock()
+    replica.is_fresh.return_value = False
+    service = RelationshipsService(mock_dynamodb_client_service, replica=replica)
+
+    response = service.search(
+        RelationshipSearchRequest(filters=[RelationshipFilter(StudentId="S001")])
+    )
+
+    assert response.source == "dynamodb"
+    replica.search.assert_not_called()
+    mock_table.query.assert_called_once()
+
+
+def test_writes_update_replica(memory_relationships_service, relationship_item):
+    """Test creates and deletes reach this worker's replica without a reload"""
+    service = memory_relationships_service
+    service.replica = MagicMock()
+
+    service.create(StudentTeacherRelationship(**relationship_item))
+    service.delete("S001", relationship_item["CreatedAt"])
+
+    service.replica.apply.assert_called_once_with(relationship_item)
+    service.replica.discard.assert_called_once_with(
+        "S001", relationship_item["CreatedAt"]
+    )
+
+
+def test_create_get_list(memory_relationships_service, relationship_item):
+    """Test a created relationship is readable by key and by student"""
+    service = memory_relationships_service
+    before = service.student_version("S001")
+
+    service.create(StudentTeacherRelationship(**relationship_item))
+
+    assert service.student_version("S001") != before
+    assert service.get("S001", relationship_item["CreatedAt"]).Subject == "Mathematics"
+    assert [r.TeacherId for r in service.list_for_student("S001").items] == ["T001"]
+
+
+def test_create_duplicate_conflicts(memory_relationships_service, relationship_item):
+    """Test creating the same relationship twice is rejected"""
+    relationship = StudentTeacherRelationship(**relationship_item)
+    memory_relationships_service.create(relationship)
+
+    with pytest.raises(ConflictError):
+        memory_relationships_service.create(relationship)
+
+
+def test_delete_missing_relationship(memory_relationships_service):
+    """Test deleting an unknown relationship raises NotFoundError and keeps the version"""
+    service = memory_relationships_service
+    version = service.student_version("S001")
+
+    with pytest.raises(NotFoundError):
+        service.delete("S001", "2024-01-01T00:00:00+00:00")
+    assert service.student_version("S001") == version
+
+
+def test_writes_maintain_aggregates(memory_relationships_service, relationship_item):
+    """Test creates and deletes keep the dashboard counters in step"""
+    service = memory_relationships_service
+    service.create(StudentTeacherRelationship(**relationship_item))
+    later = {**relationship_item, "CreatedAt": "2024-11-02T09:00:00+00:00"}
+    service.create(StudentTeacherRelationship(**later))
+    with pytest.raises(ConflictError):
+        service.create(StudentTeacherRelationship(**later))
+
+    assert [
+        (c.TeacherId, c.Students) for c in service.students_per_teacher().items
+    ] == [("T001", 1)]
+    assert [
+        (c.Month, c.Enrollments) for c in service.enrollments_per_subject_month().items
+    ] == [("2024-10", 1), ("2024-11", 1)]
+
+    service.delete("S001", relationship_item["CreatedAt"])
+    service.delete("S001", later["CreatedAt"])
+
+    assert service.students_per_teacher("T001").items[0].Students == 0
+    assert service.enrollments_per_subject_month().items == []
+
+
+def test_aggregate_failure_does_not_fail_write(
+    memory_relationships_service, relationship_item
+):
+    """Test a failed counter update is left for the rebuild instead of failing the create"""
+    service = memory_relationships_service
+    service.aggregates = MagicMock()
+    service.aggregates.record_created.side_effect = Exception("throttled")
+
+    created = service.create(StudentTeacherRelationship(**relationship_item))
+
+    assert service.get("S001", created.CreatedAt).TeacherId == "T001"
+
+
+def test_version_bump_failure_does_not_fail_write(
+    memory_relationships_service, relationship_item
+):
+    """Test a failed version bump is logged instead of failing a stored write"""
+    service = memory_relationships_service
+    service.versions = MagicMock()
+    service.versions.bump.side_effect = Exception("throttled")
+
+    created = service.create(StudentTeacherRelationship(**relationship_item))
+    service.delete("S001", created.CreatedAt)
+
+    assert service.versions.bump.call_count == 2
+
+
+def test_aggregates_disabled(relationships_service):
+    with pytest.raises(NotFoundError):
+        relationships_service.students_per_teacher()
+
+
+def test_compact_storage_keeps_public_model(monkeypatch, relationship_item):
+    """Test the service reads and writes the compact layout with unchanged models"""
+    monkeypatch.setattr(settings, "RELATIONSHIP_STORAGE_FORMAT", "compact")
+    client_service = InMemoryDynamoDBClientService()
+    service = RelationshipsService(dynamodb_client_service=client_service)
+
+    service.create(StudentTeacherRelationship(**relationship_item))
+
+    stored = client_service.get_client().Table(
+        STUDENT_TEACHER_RELATIONSHIP_COMPACT_TABLE_NAME
+    )
+    assert stored.scan()["Items"][0]["c"] == "20241008103000000000/0"
+    listed = service.list_for_student("S001").items
+    assert [r.model_dump(exclude_none=True) for r in listed] == [relationship_item]
+
+
+def test_search_merges_archived_items(
+    mock_dynamodb_client_service, mock_table, relationship_item
+):
+    """Test a CreatedAt range past the archive cutoff also reads the archive"""
+    archived = {**relationship_item, "CreatedAt": "2020-01-01T00:00:00+00:00"}
+    archive = MagicMock()
+    archive.covers.return_value = True
+    archive.search.return_value = [archived, relationship_item]
+    service = RelationshipsService(mock_dynamodb_client_service, archive=archive)
+
+    response = service.search(
+        RelationshipSearchRequest(
+            filters=[RelationshipFilter(StudentId="S001", CreatedFrom="2019-01-01")]
+        )
+    )
+
+    # The item still in the table is not repeated
+    assert [r.CreatedAt for r in response.items] == [
+        relationship_item["CreatedAt"],
+        archived["CreatedAt"],
+    ]
+    assert response.archived_items == 1
+
+
+def test_search_without_archive_range_skips_archive(
+    mock_dynamodb_client_service, mock_table
+):
+    """Test filters the archive does not cover never read it"""
+    archive = MagicMock()
+    archive.covers.return_value = False
+    service = RelationshipsService(mock_dynamodb_client_service, archive=archive)
+
+    response = service.search(
+        RelationshipSearchRequest(filters=[RelationshipFilter(StudentId="S001")])
+    )
+
+    assert response.archived_items == 0
+    archive.search.assert_not_called()
+
+
+def test_delete_archived_relationship_is_refused(
+    mock_dynamodb_client_service, mock_table, relationship_item
+):
+    """Test deleting an archived relationship is a 409, and a missing one a 404"""
+    mock_table.delete_item.return_value = {}
+    archive = MagicMock()
+    archive.get.return_value = relationship_item
+    service = RelationshipsService(mock_dynamodb_client_service, archive=archive)
+
+    with pytest.raises(ArchivedError) as exc_info:
+        service.delete("S001", relationship_item["CreatedAt"])
+
+    assert exc_info.value.status_code == 409
+    archive.get.return_value = None
+    with pytest.raises(NotFoundError):
+        service.delete("S001", relationship_item["CreatedAt"])
+
+
+def test_create_archived_relationship_is_refused(
+    mock_dynamodb_client_service, mock_table, relationship_item
+):
+    """Test a key that was moved to the archive cannot be created again"""
+    archive = MagicMock()
+    archive.get.return_value = relationship_item
+    service = RelationshipsService(mock_dynamodb_client_service, archive=archive)
+
+    with pytest.raises(ArchivedError):
+        service.create(StudentTeacherRelationship(**relationship_item))
+
+    mock_table.put_item.assert_not_called()
+    archive.get.return_value = None
+    service.create(StudentTeacherRelationship(**relationship_item))
+    assert mock_table.put_item.call_args_list[0].kwargs["Item"] == relationship_item
+
+
+def test_get_falls_back_to_archive(
+    mock_dynamodb_client_service, mock_table, relationship_item
+):
+    """Test a relationship moved to the archive is still found by key"""
+    mock_table.get_item.return_value = {}
+    archive = MagicMock()
+    archive.get.return_value = relationship_item
+    service = RelationshipsService(mock_dynamodb_client_service, archive=archive)
+
+    result = service.get("S001", relationship_item["CreatedAt"])
+
+    assert result.TeacherId == relationship_item["TeacherId"]
+    archive.get.side_effect = Exception("S3 unavailable")
+    with pytest.raises(InternalServiceError):
+        service.get("S001", relationship_item["CreatedAt"])
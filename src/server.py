@@ -0,0 +1,110 @@
+"""
+Production entry point.
+
+Runs the FastAPI app under uvicorn's process supervisor with one worker per
+available CPU, uvloop and httptools when installed, worker recycling after
+SERVER_MAX_REQUESTS requests, and graceful drain on SIGTERM: in-flight
+requests get SERVER_GRACEFUL_TIMEOUT_SECONDS to finish, then the lifespan
+shutdown stops background work and flushes logs. Each worker runs
+the app lifespan, so AWS clients, executors and caches are created per
+process after the worker starts.
+
+    python src/server.py
+"""
+
+import inspect
+import math
+import os
+from importlib.util import find_spec
+from typing import Any, Dict, Optional
+
+import uvicorn
+
+from common.config import settings
+from common.loggers import logger
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_quota() -> float:
+    """CPUs available to this container: cgroup quota, else scheduler affinity."""
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max is not None:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+    else:
+        quota_v1, period_v1 = _read(CGROUP_V1_CPU_QUOTA), _read(CGROUP_V1_CPU_PERIOD)
+        if quota_v1 and period_v1 and int(quota_v1) > 0:
+            return int(quota_v1) / int(period_v1)
+
+    if hasattr(os, "sched_getaffinity"):
+        return float(len(os.sched_getaffinity(0)))
+    return float(os.cpu_count() or 1)
+
+
+def worker_count() -> int:
+    if settings.SERVER_WORKERS:
+        return settings.SERVER_WORKERS
+    # Round down so workers never exceed the quota and get CFS-throttled
+    return max(1, math.floor(cpu_quota()))
+
+
+def _event_loop() -> str:
+    return "uvloop" if find_spec("uvloop") else "asyncio"
+
+
+def _http_protocol() -> str:
+    return "httptools" if find_spec("httptools") else "h11"
+
+
+def _recycling_options(workers: int) -> Dict[str, Any]:
+    if not settings.SERVER_MAX_REQUESTS:
+        return {}
+    if workers == 1:
+        # Without a supervisor the whole server would exit; let k8s restart instead
+        logger.warning("Worker recycling disabled: it needs at least two workers")
+        return {}
+    options: Dict[str, Any] = {"limit_max_requests": settings.SERVER_MAX_REQUESTS}
+    # Jitter spreads recycling out so workers do not all restart together
+    if "limit_max_requests_jitter" in inspect.signature(uvicorn.Config).parameters:
+        options["limit_max_requests_jitter"] = settings.SERVER_MAX_REQUESTS_JITTER
+    return options
+
+
+def main() -> None:
+    workers = worker_count()
+    loop, http = _event_loop(), _http_protocol()
+    recycling = _recycling_options(workers)
+    logger.warning(
+        f"Starting {workers} worker(s) on {settings.SERVER_HOST}:{settings.SERVER_PORT} "
+        f"(loop={loop}, http={http}, "
+        f"max_requests={recycling.get('limit_max_requests')})"
+    )
+    uvicorn.run(
+        "main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        timeout_keep_alive=settings.SERVER_KEEP_ALIVE_SECONDS,
+        proxy_headers=True,
+        access_log=bool(settings.DEBUG),
+        **recycling,
+    )
+
+
+if __name__ == "__main__":
+    main()